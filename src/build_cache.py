@@ -0,0 +1,55 @@
+import json
+import os
+
+# Directory (relative to the project root) where persisted build state lives
+CACHE_DIR = ".ssg_cache"
+
+
+def cache_path(name, cache_dir=CACHE_DIR):
+    """
+    Build the path of a named cache file inside the cache directory.
+
+    Args:
+        name (str): File name of the cache (e.g., "content_index.json")
+        cache_dir (str): Directory holding the build caches
+
+    Returns:
+        str: Path to the cache file
+    """
+    return os.path.join(cache_dir, name)
+
+
+def load_cache(path, default=None):
+    """
+    Load a JSON cache file, falling back to a default when it is missing or corrupt.
+
+    Args:
+        path (str): Path to the cache file
+        default: Value returned when the cache cannot be read
+
+    Returns:
+        The decoded cache contents, or the default value
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def save_cache(path, data):
+    """
+    Atomically write a JSON cache file (write to a temp file, then rename).
+
+    Args:
+        path (str): Path to the cache file
+        data: JSON-serializable cache contents
+    """
+    cache_dir = os.path.dirname(path)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
@@ -0,0 +1,941 @@
+import hashlib
+import json
+import os
+from dependency_graph import DependencyGraph
+from build_cache import load_cache, save_cache
+from build_summary import BuildSummary
+from write_if_changed import write_if_changed
+from compress_assets import compress_assets, DEFAULT_MIN_SIZE
+from fingerprint_assets import build_asset_manifest, asset_url_map
+from template_engine import compile_template
+from metadata_index import MetadataIndex, page_url
+from search_index import SearchIndex
+from minify_css import cached_minify_css, critical_css, DEFAULT_CRITICAL_CSS_BYTES
+from service_worker import precache_entries, DEFAULT_PRECACHE_MAX_FILE_BYTES, DEFAULT_PRECACHE_BUDGET
+from highlight import Highlighter
+from markdown_include import FragmentCache
+from page_index import PageIndex, name_key
+from extract_title import read_title
+
+# File name of a per-directory layout inside the content tree
+LAYOUT_NAME = "_layout.html"
+
+# Pages linking to each page through [[wiki links]], written next to the site
+BACKLINKS_NAME = "backlinks.json"
+
+
+class BuildContext:
+    """
+    State shared by every page of a single build (or of a whole watch session).
+
+    Args:
+        content_dir (str): Directory holding the markdown sources
+        static_dir (str): Directory holding the static assets
+        incremental (bool): Only rebuild pages whose inputs changed since the last build
+        graph_path (str): Where the dependency graph is persisted (None keeps it in memory)
+        write_if_changed (bool): Leave output files untouched when their contents are identical
+        output_hashes_path (str): Where the hashes of written outputs are persisted
+        gzip (bool): Write precompressed .gz siblings of the text assets after each build
+        gzip_min_size (int): Smallest file size (in bytes) that gets a .gz sibling
+        gzip_records_path (str): Where the hashes of compressed files are persisted
+        minify (bool): Serialize pages and templates without redundant whitespace
+        fingerprint (bool): Copy static assets to content-hashed names and rewrite references
+        asset_records_path (str): Where the hashes of static assets are persisted
+        template_cache_dir (str): Where compiled templates are cached (None disables it)
+        metadata_path (str): Where the site-wide metadata index is persisted
+        listing_sections (list): Content sections that get generated index pages
+        listing_per_page (int): Posts per generated listing page
+        feed_sections (list): Content sections that get an Atom feed
+        feed_entries (int): Newest posts kept in each feed
+        site_url (str): Scheme and host the site is served from, for absolute feed URLs
+        content_cache_dir (str): Where the rendered bodies of feed pages are kept
+        sitemap (bool): Write sitemap.xml for every generated page
+        search (bool): Build the sharded client-side search index
+        search_index_path (str): Where the search index is persisted
+        check_links (bool): Validate internal links and images against the built site
+        image_sizes (bool): Give images width/height from their headers, plus lazy loading
+        image_records_path (str): Where image dimensions are persisted
+        minify_css (bool): Minify the stylesheets copied from the static directory
+        inline_css (bool): Inline stylesheets linked from templates (implies minify_css)
+        critical_css_bytes (int): Most stylesheet bytes inlined; the rest loads asynchronously
+        css_cache_dir (str): Where minified stylesheets are cached by content hash
+        service_worker (bool): Write a precache manifest and a service worker
+        precache_max_file_bytes (int): Largest file the service worker precaches
+        precache_budget (int): Most bytes precached in total
+        precache_records_path (str): Where the hashes of precached files are persisted
+        prefetch_count (int): Internal pages each page prefetches (0 disables prefetch hints)
+        heading_ids (bool): Give headings ids and fill the {{ TOC }} slot
+        highlight (bool): Highlight code blocks whose info string names a known language
+        highlight_cache_dir (str): Where highlighted code blocks are cached across builds
+        tolerant (bool): Render malformed markup as text and report diagnostics, and
+            report pages that cannot be generated, instead of stopping the build
+    """
+
+    def __init__(
+        self,
+        content_dir="content",
+        static_dir="static",
+        incremental=False,
+        graph_path=None,
+        write_if_changed=False,
+        output_hashes_path=None,
+        gzip=False,
+        gzip_min_size=DEFAULT_MIN_SIZE,
+        gzip_records_path=None,
+        minify=False,
+        fingerprint=False,
+        asset_records_path=None,
+        template_cache_dir=None,
+        metadata_path=None,
+        listing_sections=(),
+        listing_per_page=10,
+        feed_sections=(),
+        feed_entries=20,
+        site_url="",
+        content_cache_dir=None,
+        sitemap=False,
+        search=False,
+        search_index_path=None,
+        check_links=False,
+        image_sizes=False,
+        image_records_path=None,
+        minify_css=False,
+        inline_css=False,
+        critical_css_bytes=DEFAULT_CRITICAL_CSS_BYTES,
+        css_cache_dir=None,
+        service_worker=False,
+        precache_max_file_bytes=DEFAULT_PRECACHE_MAX_FILE_BYTES,
+        precache_budget=DEFAULT_PRECACHE_BUDGET,
+        precache_records_path=None,
+        prefetch_count=0,
+        heading_ids=False,
+        highlight=False,
+        highlight_cache_dir=None,
+        tolerant=False,
+    ):
+        self.content_dir = content_dir
+        self.static_dir = static_dir
+        self.incremental = incremental
+        self.graph_path = graph_path
+        self.write_if_changed = write_if_changed
+        self.output_hashes_path = output_hashes_path
+        self.gzip = gzip
+        self.gzip_min_size = gzip_min_size
+        self.gzip_records_path = gzip_records_path
+        self.minify = minify
+        self.fingerprint = fingerprint
+        self.asset_records_path = asset_records_path
+        self.template_cache_dir = template_cache_dir
+        self.summary = BuildSummary()
+
+        # Static rel_path -> fingerprinted rel_path, and the same keyed by URL
+        self.asset_manifest = {}
+        self.asset_urls = {}
+        # rel_path -> [sha256, mtime_ns, size] of the static files
+        self.asset_records = {}
+
+        # Prepared page bodies awaiting their write when there is no content cache
+        self._stashed = {}
+
+        # Per-build caches, reset by start_build()
+        self.templates = {}
+        # rel_dir -> (layout path, layout candidates that were checked and absent)
+        self.layouts = {}
+
+        # dest_path -> [sha256, mtime_ns, size] of the last write
+        self.output_hashes = {}
+        if write_if_changed and output_hashes_path:
+            self.output_hashes = load_cache(output_hashes_path, {})
+
+        self.metadata_path = metadata_path
+        self.listing_sections = list(listing_sections)
+        self.listing_per_page = listing_per_page
+        self.feed_sections = [section.strip('/') for section in feed_sections]
+        self.feed_entries = feed_entries
+        self.site_url = site_url
+        self.content_cache_dir = content_cache_dir
+        self.sitemap = sitemap
+        self.search_index_path = search_index_path
+        self.check_links = check_links
+        self.image_sizes = image_sizes
+        self.image_records_path = image_records_path
+
+        self.minify_css = minify_css or inline_css
+        self.inline_css = inline_css
+        self.critical_css_bytes = critical_css_bytes
+        self.css_cache_dir = css_cache_dir
+        self.service_worker = service_worker
+        self.precache_max_file_bytes = precache_max_file_bytes
+        self.precache_budget = precache_budget
+        self.precache_records_path = precache_records_path
+        self.prefetch_count = prefetch_count
+        self.heading_ids = heading_ids
+        self.highlighter = Highlighter(highlight_cache_dir) if highlight else None
+        self.tolerant = tolerant
+        # Names and paths of every page for [[wiki links]], rebuilt by start_build()
+        self.page_index = None
+        # Fragments named by {% include %} directives, parsed once per build
+        self.fragments = FragmentCache(heading_ids, self.highlighter, tolerant=tolerant)
+        # Site-wide link graph, rebuilt by build_link_graph()
+        self.link_targets = {}
+        self.inbound_links = {}
+        # Static rel_path -> minified stylesheet, rebuilt by prepare_css()
+        self.stylesheets = {}
+
+        # path -> [mtime_ns, size, width, height] of static images
+        self.image_records = {}
+        if image_sizes and image_records_path:
+            self.image_records = load_cache(image_records_path, {})
+
+        # A full build re-records every page, so it starts from an empty graph and index
+        if incremental and graph_path:
+            self.graph = DependencyGraph.load(graph_path)
+        else:
+            self.graph = DependencyGraph()
+        if incremental and metadata_path:
+            self.metadata = MetadataIndex.load(metadata_path)
+        else:
+            self.metadata = MetadataIndex()
+        self.search = None
+        if search:
+            if incremental and search_index_path:
+                self.search = SearchIndex.load(search_index_path)
+            else:
+                self.search = SearchIndex()
+
+        # Set when the graph changed and has to be persisted again
+        self.dirty = False
+
+    def start_build(self, rel_paths=None, rendered=()):
+        """
+        Reset the caches that only hold for a single build (e.g., between watch polls).
+
+        Args:
+            rel_paths (iterable): Every page found by the content scan, relative to the
+                content directory; indexed so [[wiki links]] resolve by lookup
+            rendered (iterable): The pages this build renders (see build_page_index)
+        """
+        self.templates.clear()
+        self.layouts.clear()
+        if rel_paths is not None:
+            self.page_index = self.build_page_index(rel_paths, rendered)
+        self.fragments = FragmentCache(self.heading_ids, self.highlighter, self.page_index, self.tolerant)
+
+    def build_page_index(self, rel_paths, rendered=()):
+        """
+        Index the site's pages by path, last path segment and title.
+
+        The pages about to be rendered may be new or retitled, so their titles are read
+        from the sources (up to the title line); the other pages keep the title in the
+        metadata index (the persisted one of the previous build, on a full build).
+
+        Args:
+            rel_paths (iterable): Markdown paths relative to the content directory
+            rendered (iterable): Markdown paths of the pages this build renders
+
+        Returns:
+            PageIndex: The index
+        """
+        records = self.metadata.records
+        if not records and self.metadata_path:
+            records = MetadataIndex.load(self.metadata_path).records
+        titles = {
+            os.path.relpath(source, self.content_dir): record.get("title")
+            for source, record in records.items()
+        }
+        for rel_path in rendered:
+            try:
+                titles[rel_path] = read_title(os.path.join(self.content_dir, rel_path))
+            except (OSError, ValueError):
+                # The render reports the unreadable page
+                titles.pop(rel_path, None)
+        return PageIndex.build(rel_paths, titles)
+
+    def stale_wiki_pages(self, rendered):
+        """
+        Find the pages not rendered by this build whose [[wiki links]] now name a
+        different page (e.g., one created or retitled by this build).
+
+        Args:
+            rendered (iterable): Markdown paths of the pages this build rendered
+
+        Returns:
+            list: Markdown paths (relative to the content directory) of the pages to render
+        """
+        rendered = set(rendered)
+        stale = []
+        for source, record in self.metadata.records.items():
+            rel_path = os.path.relpath(source, self.content_dir)
+            if rel_path in rendered:
+                continue
+            for key, target in record.get("wiki_targets", {}).items():
+                entry = self.page_index.entry(key)
+                if (entry[1] if entry is not None else None) != target:
+                    stale.append(rel_path)
+                    break
+        return sorted(stale)
+
+    def resolve_layout(self, rel_dir, default):
+        """
+        Find the layout for a content directory: the nearest _layout.html at or above it.
+
+        Results are memoized per directory for the rest of the build, so each directory
+        is checked once no matter how many pages it holds.
+
+        Args:
+            rel_dir (str): Directory relative to the content directory
+            default (str): Template used when no ancestor has a layout
+
+        Returns:
+            str: Path of the layout to render the directory's pages with
+        """
+        rel_dir = os.path.normpath(rel_dir or ".")
+        cached = self.layouts.get(rel_dir)
+        if cached is not None:
+            return cached[0]
+
+        candidate = os.path.normpath(os.path.join(self.content_dir, rel_dir, LAYOUT_NAME))
+        if os.path.isfile(candidate):
+            result = (candidate, ())
+        else:
+            if rel_dir == ".":
+                layout, misses = default, ()
+            else:
+                parent = os.path.normpath(os.path.dirname(rel_dir) or ".")
+                self.resolve_layout(parent, default)
+                layout, misses = self.layouts[parent]
+            result = (layout, (candidate,) + misses)
+
+        self.layouts[rel_dir] = result
+        return result[0]
+
+    def load_template(self, template_path):
+        """
+        Compile a template once per build (reusing the on-disk compiled-template cache).
+
+        Args:
+            template_path (str): Path to the HTML template file
+
+        Returns:
+            Template: The compiled template
+        """
+        template = self.templates.get(template_path)
+        if template is None:
+            inline_css = None
+            if self.inline_css:
+                inline_css = {}
+                for rel_path, css in self.stylesheets.items():
+                    portion, complete = critical_css(css, self.critical_css_bytes)
+                    inline_css["/" + rel_path] = (os.path.join(self.static_dir, rel_path), portion, complete)
+            template = compile_template(
+                template_path,
+                minify=self.minify,
+                url_map=self.asset_urls if self.fingerprint else None,
+                cache_dir=self.template_cache_dir,
+                inline_css=inline_css,
+            )
+            self.templates[template_path] = template
+        return template
+
+    def prepare_assets(self):
+        """
+        Hash the static assets (reusing cached hashes) and build the fingerprint manifest.
+
+        Returns:
+            dict: rel_path -> fingerprinted rel_path
+        """
+        records = load_cache(self.asset_records_path, {}) if self.asset_records_path else {}
+        self.asset_manifest = build_asset_manifest(self.static_dir, records)
+        self.asset_records = records
+        self.asset_urls = asset_url_map(self.asset_manifest)
+        if self.asset_records_path:
+            save_cache(self.asset_records_path, records)
+        return self.asset_manifest
+
+    def prepare_css(self):
+        """
+        Minify every stylesheet in the static directory, once per build.
+
+        Minified results are cached by content hash, so an unchanged stylesheet is only
+        read, never minified again.
+
+        Returns:
+            dict: rel_path -> minified stylesheet
+        """
+        self.stylesheets = {}
+        if not self.minify_css:
+            return self.stylesheets
+        for root, dirs, files in os.walk(self.static_dir):
+            dirs.sort()
+            for name in sorted(files):
+                if not name.endswith('.css'):
+                    continue
+                path = os.path.join(root, name)
+                rel_path = os.path.relpath(path, self.static_dir).replace(os.sep, '/')
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.stylesheets[rel_path] = cached_minify_css(f.read(), self.css_cache_dir)
+        return self.stylesheets
+
+    def write_css(self, dest_dir):
+        """
+        Write the minified stylesheets into the built site (under their fingerprinted
+        names when fingerprinting), leaving files that already match untouched.
+
+        Args:
+            dest_dir (str): Directory of the built site
+
+        Returns:
+            int: Number of stylesheets written
+        """
+        written = 0
+        for rel_path, css in self.stylesheets.items():
+            dest_path = os.path.join(dest_dir, self.asset_manifest.get(rel_path, rel_path))
+            data = css.encode('utf-8')
+            try:
+                with open(dest_path, 'rb') as f:
+                    if f.read() == data:
+                        continue
+            except OSError:
+                pass
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            with open(dest_path, 'wb') as f:
+                f.write(data)
+            written += 1
+        return written
+
+    def resolve_url(self, url):
+        """
+        Map a site-absolute URL to the source file it is generated from.
+
+        Args:
+            url (str): URL as written in the markdown (e.g., "/blog/tom" or "/images/tom.png")
+
+        Returns:
+            str: Path of the static asset or markdown page, or None for external/unknown URLs
+        """
+        if not url.startswith('/') or url.startswith('//'):
+            return None
+
+        path = url.split('#', 1)[0].split('?', 1)[0].strip('/')
+
+        if path:
+            static_path = os.path.join(self.static_dir, path)
+            if os.path.isfile(static_path):
+                return static_path
+            if path.endswith('.html'):
+                path = path[:-5]
+                if path == 'index' or path.endswith('/index'):
+                    path = path[:-5].rstrip('/')
+
+        candidates = []
+        if path:
+            candidates.append(os.path.join(self.content_dir, path + '.md'))
+        candidates.append(os.path.join(self.content_dir, path, 'index.md'))
+
+        for candidate in candidates:
+            if os.path.isfile(candidate):
+                return os.path.normpath(candidate)
+        return None
+
+    def static_path(self, url):
+        """
+        Map a URL to the static file it serves, if any.
+
+        Args:
+            url (str): Site-absolute URL (e.g., "/images/tom.png")
+
+        Returns:
+            str: Path inside the static directory, or None
+        """
+        path = self.resolve_url(url)
+        if path is None or os.path.commonpath([path, self.static_dir]) != os.path.normpath(self.static_dir):
+            return None
+        return path
+
+    def record_page(self, page, template_path, urls, includes=(), unresolved=()):
+        """
+        Replace the recorded inputs of a page with the ones read by its latest render.
+
+        Args:
+            page (str): Source path of the page
+            template_path (str): Template the page was rendered with
+            urls (iterable): Link and image URLs found in the page
+            includes (iterable): Markdown fragments the page included
+            unresolved (iterable): Targets of [[wiki links]] that named no page
+        """
+        self.dirty = True
+        self.graph.clear_page(page)
+        self.graph.record(page, page)
+        for fragment in includes:
+            self.graph.record(page, fragment)
+        # Creating a page at an unresolved link's path rebuilds the page linking to it
+        for target in unresolved:
+            name = target.split('#', 1)[0].strip().strip('/')
+            if name:
+                self.graph.record(page, os.path.normpath(os.path.join(self.content_dir, name + '.md')))
+                self.graph.record(page, os.path.normpath(os.path.join(self.content_dir, name, 'index.md')))
+
+        # Absent layouts nearer to the page would replace its template if created
+        rel_dir = os.path.relpath(os.path.dirname(page), self.content_dir)
+        for missing in self.layouts.get(rel_dir, (None, ()))[1]:
+            self.graph.record(page, missing)
+        template = self.templates.get(template_path)
+        if template is not None:
+            # The template and its partials; with fingerprinting, the assets it references
+            for source in template.sources:
+                self.graph.record(page, source)
+            if self.fingerprint:
+                urls = list(urls) + template.urls
+        else:
+            self.graph.record(page, template_path)
+        for url in urls:
+            target = self.resolve_url(url)
+            if target is not None and target != page:
+                self.graph.record(page, target)
+
+    def output_options(self, basepath):
+        """
+        Describe the options that change how every page renders.
+
+        Args:
+            basepath (str): Base path of the build
+
+        Returns:
+            dict: JSON-serializable options, compared against the previous build's
+        """
+        return {
+            "basepath": basepath,
+            "minify": self.minify,
+            "fingerprint": self.fingerprint,
+            "image_sizes": self.image_sizes,
+            "inline_css": self.critical_css_bytes if self.inline_css else None,
+            "prefetch": self.prefetch_count,
+            "heading_ids": self.heading_ids,
+            "highlight": self.highlighter is not None,
+            "tolerant": self.tolerant,
+            # Only rendered pages are indexed, so turning the index on indexes every page
+            "search": self.search is not None,
+        }
+
+    def pages_to_rebuild(self, sources, basepath="/"):
+        """
+        Decide which pages an incremental build has to render.
+
+        Args:
+            sources (iterable): Source paths of every page currently in the content tree
+            basepath (str): Base path of the build; changed output options rebuild everything
+
+        Returns:
+            tuple: (rebuild, removed) where rebuild is the set of source paths to render
+                and removed lists the pages whose source no longer exists
+        """
+        sources = set(sources)
+        removed = [page for page in self.graph.deps if page not in sources]
+
+        # Deleted sources show up as changed inputs, so pages linking to them rebuild too
+        changed = self.graph.changed_inputs()
+        rebuild = self.graph.affected(changed)
+        for page in removed:
+            self.graph.clear_page(page)
+            self.metadata.remove(page)
+            self._remove_content(page)
+            if self.search is not None:
+                self.search.remove(page)
+            self.dirty = True
+
+        rebuild.update(page for page in sources if page not in self.graph.deps)
+
+        # Bodies are only kept for feed pages, so a newly added feed renders its pages once
+        if self.feed_sections and self.content_cache_dir:
+            for page in sources:
+                record = self.metadata.get(page)
+                if record is not None and "content_sha" not in record and self._in_feed(record["url"]):
+                    rebuild.add(page)
+
+        options = self.output_options(basepath)
+        if self.graph.options != options:
+            rebuild.update(sources)
+            self.graph.options = options
+            self.dirty = True
+
+        rebuild &= sources
+        return rebuild, removed
+
+    def record_metadata(self, page, dest_path, title, front_matter, info=None):
+        """
+        Add a page to the site-wide metadata index.
+
+        Args:
+            page (str): Source path of the page
+            dest_path (str): Path of the generated HTML file
+            title (str): Page title
+            front_matter (dict): Parsed front-matter fields
+            info (DocumentInfo): Facts collected while parsing the page
+
+        Returns:
+            dict: The stored record (also exposed to templates as {{ page.* }})
+        """
+        record = dict(front_matter)
+        record.update({
+            "title": title,
+            "url": page_url(os.path.relpath(page, self.content_dir)),
+            "source": page,
+            "dest": dest_path,
+        })
+        if info is not None:
+            record["word_count"] = info.word_count
+            record["headings"] = [[level, text] for level, text in info.headings]
+            record["links"] = info.urls()
+            record["wiki_links"] = sorted({page_url(rel_path) for _, rel_path in info.wiki_links})
+            record["unresolved_wiki_links"] = info.unresolved_wiki_links
+            # What each wiki link name resolved to, to spot the pages a new title redirects
+            record["wiki_targets"] = {name_key(target): rel_path for target, rel_path in info.wiki_links}
+            record["wiki_targets"].update((name_key(target), None) for target in info.unresolved_wiki_links)
+            record["diagnostics"] = [list(diagnostic) for diagnostic in info.diagnostics]
+        self.metadata.update(page, record)
+        if self.search is not None and info is not None:
+            self.search.update(page, record["url"], title, info.terms)
+        return record
+
+    def _content_path(self, page):
+        name = hashlib.sha256(os.path.normpath(page).encode('utf-8')).hexdigest()
+        return os.path.join(self.content_cache_dir, name + ".html")
+
+    def _in_feed(self, url):
+        return any(url.startswith(f"/{section}/") for section in self.feed_sections)
+
+    def store_content(self, page, record, html):
+        """
+        Keep the rendered body of a page that appears in a feed.
+
+        Feeds reuse these bodies instead of parsing the page again; the body hash is
+        stored in the page's metadata record so feeds notice when it changed.
+
+        Args:
+            page (str): Source path of the page
+            record (dict): The page's metadata record (see record_metadata)
+            html (str): Rendered body HTML, before the template is applied
+        """
+        if not self.content_cache_dir:
+            return
+        if not self._in_feed(record["url"]):
+            return
+
+        os.makedirs(self.content_cache_dir, exist_ok=True)
+        path = self._content_path(page)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        os.replace(tmp_path, path)
+        record["content_sha"] = hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+    def load_content(self, page, digest):
+        """
+        Read a body kept by store_content.
+
+        Args:
+            page (str): Source path of the page
+            digest (str): Expected body hash from the page's metadata record
+
+        Returns:
+            str: The body HTML, or None if it was never stored
+        """
+        if not self.content_cache_dir or not page or not digest:
+            return None
+        try:
+            with open(self._content_path(page), 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _remove_content(self, page):
+        if self.content_cache_dir:
+            try:
+                os.remove(self._content_path(page))
+            except OSError:
+                pass
+
+    def build_link_graph(self):
+        """
+        Build the site-wide graph of links between pages from the metadata index.
+
+        Links were collected while each page was parsed, so no source is read again.
+        Each target URL is resolved once, however many pages link to it.
+        """
+        resolved = {}
+        self.link_targets = {}
+        self.inbound_links = {}
+        for source, record in self.metadata.records.items():
+            targets = []
+            for url in record.get("links", ()):
+                if url not in resolved:
+                    resolved[url] = self.resolve_url(url)
+                target = resolved[url]
+                if target is not None and target != source and target in self.metadata.records and target not in targets:
+                    targets.append(target)
+            self.link_targets[source] = targets
+            for target in targets:
+                self.inbound_links[target] = self.inbound_links.get(target, 0) + 1
+
+    def prefetch_tags(self, page):
+        """
+        Build the prefetch hints of a page: its internal link targets with the most
+        inbound links across the site (ties keep document order).
+
+        Args:
+            page (str): Source path of the page
+
+        Returns:
+            str: <link rel="prefetch"> tags for the top prefetch_count targets
+        """
+        targets = self.link_targets.get(page, ())
+        ranked = sorted(targets, key=lambda target: -self.inbound_links.get(target, 0))
+        return "".join(
+            f'<link rel="prefetch" href="{self.metadata.records[target]["url"]}" />'
+            for target in ranked[:self.prefetch_count]
+        )
+
+    def stash_page(self, page, prepared):
+        """
+        Set aside a prepared page until it is written.
+
+        Prefetch hints need every page parsed before any is written, so the bodies
+        wait on disk (next to the kept feed bodies) rather than in memory; the rest
+        of the prepared page is already in the metadata index.
+
+        Args:
+            page (str): Source path of the page
+            prepared (dict): Result of prepare_page
+        """
+        body = {"content": prepared["content"], "toc": prepared["toc"]}
+        if not self.content_cache_dir:
+            self._stashed[page] = body
+            return
+        os.makedirs(self.content_cache_dir, exist_ok=True)
+        with open(self._content_path(page) + ".pending", 'w', encoding='utf-8') as f:
+            json.dump(body, f)
+
+    def unstash_page(self, page, template_path):
+        """
+        Take back a page set aside by stash_page.
+
+        Args:
+            page (str): Source path of the page
+            template_path (str): Template the page is rendered with
+
+        Returns:
+            dict: The page as prepare_page returned it
+        """
+        body = self._stashed.pop(page, None)
+        if body is None:
+            path = self._content_path(page) + ".pending"
+            with open(path, 'r', encoding='utf-8') as f:
+                body = json.load(f)
+            os.remove(path)
+        record = self.metadata.get(page)
+        return {
+            "template": self.load_template(template_path),
+            "title": record["title"],
+            "content": body["content"],
+            "toc": body["toc"],
+            "page": record,
+        }
+
+    def write_output(self, dest_path, content, count=True):
+        """
+        Write a generated file, skipping the write when write-if-changed finds it identical.
+
+        Args:
+            dest_path (str): Path of the output file
+            content (str): Rendered output
+            count (bool): Count the file in the summary's pages written/unchanged
+                (generated pages with counters of their own pass False)
+
+        Returns:
+            bool: Whether the file was written
+        """
+        if self.write_if_changed:
+            written = write_if_changed(dest_path, content, self.output_hashes)
+        else:
+            with open(dest_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            written = True
+
+        if count and written:
+            self.summary.written += 1
+        elif count:
+            self.summary.unchanged += 1
+        return written
+
+    def compress(self, dest_dir):
+        """
+        Write .gz siblings for the built site when compression is enabled.
+
+        Args:
+            dest_dir (str): Directory of the built site
+        """
+        if not self.gzip:
+            return
+        records = load_cache(self.gzip_records_path, {}) if self.gzip_records_path else {}
+        written, unchanged = compress_assets(dest_dir, records, self.gzip_min_size)
+        self.summary.gzip_written += written
+        self.summary.gzip_unchanged += unchanged
+        if self.gzip_records_path and written:
+            save_cache(self.gzip_records_path, records)
+
+    def write_search_index(self, dest_dir, basepath="/"):
+        """
+        Write the search shards that changed during this build and persist the index.
+
+        Args:
+            dest_dir (str): Directory of the built site
+            basepath (str): Base path prefixed to result URLs
+        """
+        if self.search is None:
+            return
+        self.summary.search_shards += self.search.write(dest_dir, basepath)
+        if self.search_index_path:
+            self.search.save(self.search_index_path)
+
+    def page_failed(self, page, error, dest_path=None):
+        """
+        Report a page a tolerant build could not generate.
+
+        Its recorded inputs are dropped, so the next incremental build retries it, and
+        the output and search entry of its last successful build are removed, so the
+        site does not keep serving a page the sources no longer produce.
+
+        Args:
+            page (str): Source path of the page
+            error (Exception): Why the page could not be generated
+            dest_path (str): Path of the page's generated HTML file
+        """
+        self.graph.clear_page(page)
+        self.metadata.remove(page)
+        self._remove_content(page)
+        if self.search is not None:
+            self.search.remove(page)
+        if dest_path is not None:
+            self.output_hashes.pop(dest_path, None)
+            if os.path.exists(dest_path):
+                os.remove(dest_path)
+        self.dirty = True
+        self.summary.failed_pages.append((page, str(error)))
+
+    def collect_diagnostics(self):
+        """
+        Gather the diagnostics of every page for the build summary.
+
+        They are read from the metadata index, so pages an incremental build did not
+        re-render are still reported.
+        """
+        self.summary.diagnostics = [
+            tuple(diagnostic)
+            for record in self.metadata.pages()
+            for diagnostic in record.get("diagnostics", ())
+        ]
+
+    def write_backlinks(self, dest_dir, basepath="/"):
+        """
+        Report unresolved [[wiki links]] and write each page's backlinks.
+
+        Both come from the metadata index, so pages an incremental build skipped
+        still count. The backlinks file maps each linked page's URL to the pages
+        linking to it; it is only written when the site has wiki links.
+
+        Args:
+            dest_dir (str): Directory of the built site
+            basepath (str): Base path prefixed to the URLs
+
+        Returns:
+            bool: Whether the backlinks file was written
+        """
+        prefix = basepath.rstrip('/')
+        backlinks = {}
+        unresolved = []
+        for record in self.metadata.pages():
+            for url in record.get("wiki_links", ()):
+                backlinks.setdefault(prefix + url, []).append(
+                    {"url": prefix + record["url"], "title": record["title"]}
+                )
+            for target in record.get("unresolved_wiki_links", ()):
+                unresolved.append((record["source"], target))
+        self.summary.unresolved_links = unresolved
+
+        path = os.path.join(dest_dir, BACKLINKS_NAME)
+        if not backlinks:
+            if os.path.exists(path):
+                os.remove(path)
+            return False
+        content = json.dumps(backlinks, indent=2, sort_keys=True)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                if f.read() == content:
+                    return False
+        except OSError:
+            pass
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return True
+
+    def output_revisions(self, dest_dir):
+        """
+        Gather the content hashes the build already holds for files of the built site.
+
+        Args:
+            dest_dir (str): Directory of the built site
+
+        Returns:
+            dict: Normalized output path -> [sha256, mtime_ns, size]
+        """
+        revisions = {}
+        # Fingerprinted copies are byte-identical to the hashed static file
+        for rel_path, record in self.asset_records.items():
+            hashed = self.asset_manifest.get(rel_path)
+            if hashed is not None:
+                revisions[os.path.normpath(os.path.join(dest_dir, hashed))] = record
+        if self.gzip and self.gzip_records_path:
+            for path, record in load_cache(self.gzip_records_path, {}).items():
+                revisions[os.path.normpath(path)] = record
+        for path, record in self.output_hashes.items():
+            revisions[os.path.normpath(path)] = record
+        return revisions
+
+    def precache(self, dest_dir, basepath="/"):
+        """
+        Choose the precache entries of the built site, reading only files whose hash
+        is neither held by the build nor recorded by an earlier precache run.
+
+        Args:
+            dest_dir (str): Directory of the built site
+            basepath (str): Base path the site is served under
+
+        Returns:
+            list: Precache entries (see precache_entries)
+        """
+        records = load_cache(self.precache_records_path, {}) if self.precache_records_path else {}
+        previous = dict(records)
+        entries = precache_entries(
+            dest_dir, self.output_revisions(dest_dir), basepath,
+            max_file_bytes=self.precache_max_file_bytes,
+            budget=self.precache_budget,
+            records=records,
+        )
+        if self.precache_records_path and records != previous:
+            save_cache(self.precache_records_path, records)
+        return entries
+
+    def finish(self):
+        """Stamp the inputs read during this build and persist the graph and indexes"""
+        if not self.dirty:
+            return
+        self.dirty = False
+        self.graph.stamp_inputs()
+        if self.graph_path:
+            self.graph.save(self.graph_path)
+        if self.write_if_changed and self.output_hashes_path:
+            save_cache(self.output_hashes_path, self.output_hashes)
+        if self.metadata_path:
+            self.metadata.save(self.metadata_path)
+        if self.image_sizes and self.image_records_path:
+            save_cache(self.image_records_path, self.image_records)
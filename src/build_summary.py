@@ -0,0 +1,102 @@
+# Longest per-page listing printed before the rest is summarized
+MAX_PAGE_LINES = 20
+
+
+class BuildSummary:
+    """
+    Counters collected while building, printed once at the end of the build.
+    """
+
+    def __init__(self):
+        self.written = 0
+        self.unchanged = 0
+        self.gzip_written = 0
+        self.gzip_unchanged = 0
+        self.listings_rendered = 0
+        self.listings_unchanged = 0
+        self.feeds_written = 0
+        self.feeds_unchanged = 0
+        self.search_shards = 0
+        # (source path, url) of links that point at no output file
+        self.broken_links = []
+        # (source path, target) of [[wiki links]] that name no page
+        self.unresolved_links = []
+        # (file, line, column, message) of malformed markup a tolerant build worked around
+        self.diagnostics = []
+        # (source path, error) of pages a tolerant build could not generate
+        self.failed_pages = []
+        # dest_path -> bytes removed by minification
+        self.minified = {}
+
+    def did_work(self):
+        """
+        Tell whether the build rendered or wrote anything (a watch poll usually does not).
+
+        Returns:
+            bool: True if any page, listing, feed, search shard or gzip file was produced
+        """
+        return bool(
+            self.written or self.unchanged or self.listings_rendered or self.feeds_written
+            or self.search_shards or self.gzip_written or self.failed_pages
+        )
+
+    def lines(self):
+        """
+        Format the summary for printing.
+
+        Returns:
+            list: Lines of the build summary
+        """
+        lines = [
+            f"Pages written: {self.written}",
+            f"Pages unchanged: {self.unchanged}",
+        ]
+        if self.listings_rendered or self.listings_unchanged:
+            lines.append(
+                f"Listing pages rendered: {self.listings_rendered}, unchanged: {self.listings_unchanged}"
+            )
+        if self.feeds_written or self.feeds_unchanged:
+            lines.append(f"Feeds written: {self.feeds_written}, unchanged: {self.feeds_unchanged}")
+        if self.search_shards:
+            lines.append(f"Search shards updated: {self.search_shards}")
+        if self.gzip_written or self.gzip_unchanged:
+            lines.append(f"Gzip files written: {self.gzip_written}, unchanged: {self.gzip_unchanged}")
+        if self.broken_links:
+            lines.append(f"Broken links: {len(self.broken_links)}")
+            for source, url in self.broken_links[:MAX_PAGE_LINES]:
+                lines.append(f"  {source}: {url}")
+            if len(self.broken_links) > MAX_PAGE_LINES:
+                lines.append(f"  ... and {len(self.broken_links) - MAX_PAGE_LINES} more links")
+        if self.unresolved_links:
+            lines.append(f"Unresolved wiki links: {len(self.unresolved_links)}")
+            for source, target in self.unresolved_links[:MAX_PAGE_LINES]:
+                lines.append(f"  {source}: [[{target}]]")
+            if len(self.unresolved_links) > MAX_PAGE_LINES:
+                lines.append(f"  ... and {len(self.unresolved_links) - MAX_PAGE_LINES} more links")
+        if self.diagnostics:
+            lines.append(f"Diagnostics: {len(self.diagnostics)}")
+            for path, line, column, message in self.diagnostics[:MAX_PAGE_LINES]:
+                lines.append(f"  {path}:{line}:{column}: {message}")
+            if len(self.diagnostics) > MAX_PAGE_LINES:
+                lines.append(f"  ... and {len(self.diagnostics) - MAX_PAGE_LINES} more diagnostics")
+        if self.failed_pages:
+            lines.append(f"Pages not generated: {len(self.failed_pages)}")
+            for source, error in self.failed_pages[:MAX_PAGE_LINES]:
+                lines.append(f"  {source}: {error}")
+            if len(self.failed_pages) > MAX_PAGE_LINES:
+                lines.append(f"  ... and {len(self.failed_pages) - MAX_PAGE_LINES} more pages")
+        if self.minified:
+            total = sum(self.minified.values())
+            lines.append(f"Minification saved {total} bytes over {len(self.minified)} pages")
+            ranked = sorted(self.minified.items(), key=lambda item: item[1], reverse=True)
+            for dest_path, saved in ranked[:MAX_PAGE_LINES]:
+                lines.append(f"  {dest_path}: {saved} bytes")
+            if len(ranked) > MAX_PAGE_LINES:
+                lines.append(f"  ... and {len(ranked) - MAX_PAGE_LINES} more pages")
+        return lines
+
+    def report(self):
+        """Print the build summary"""
+        print("Build summary:")
+        for line in self.lines():
+            print(f"  {line}")
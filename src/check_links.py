@@ -0,0 +1,130 @@
+import os
+import posixpath
+from concurrent.futures import ProcessPoolExecutor
+
+# Below this many links a single process is faster than starting workers
+PARALLEL_THRESHOLD = 100000
+
+# Pages handed to a worker at a time
+CHUNK_SIZE = 500
+
+# Output paths and URL rewrites of the site being checked, installed in each worker
+_outputs = None
+_url_map = None
+
+
+def output_paths(dest_dir):
+    """
+    Collect every file of the built site, once.
+
+    Args:
+        dest_dir (str): Directory of the built site
+
+    Returns:
+        set: Paths relative to dest_dir, using "/" separators (e.g., "blog/tom/index.html")
+    """
+    paths = set()
+    pending = [""]
+    while pending:
+        rel_dir = pending.pop()
+        with os.scandir(os.path.join(dest_dir, rel_dir)) as it:
+            for entry in it:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                if entry.is_dir():
+                    pending.append(rel_path)
+                else:
+                    paths.add(rel_path)
+    return paths
+
+
+def link_target(page_url, url):
+    """
+    Resolve a link found on a page to a path in the built site.
+
+    Args:
+        page_url (str): Site-absolute URL of the page holding the link (e.g., "/blog/tom")
+        url (str): The link as written in the markdown
+
+    Returns:
+        str: Path relative to the site root, or None for external and fragment-only links
+    """
+    if url.startswith('//') or ':' in url.split('/', 1)[0]:
+        return None
+    path = url.split('#', 1)[0].split('?', 1)[0]
+    if not path:
+        return None
+    if not path.startswith('/'):
+        # index.md pages are served as directories, name.md pages as name.html
+        base = page_url if not page_url.endswith('.html') else posixpath.dirname(page_url)
+        path = posixpath.join(base, path)
+    return posixpath.normpath(path).lstrip('/')
+
+
+def is_valid(path, outputs):
+    """
+    Check a resolved link against the output paths: a file, or a directory index.
+
+    Args:
+        path (str): Path relative to the site root (see link_target)
+        outputs (set): Output paths of the site
+
+    Returns:
+        bool: Whether a file would be served for the link
+    """
+    if not path:
+        return "index.html" in outputs
+    return path in outputs or f"{path}/index.html" in outputs
+
+
+def _check_pages(pages, outputs, url_map):
+    broken = []
+    for source, page_url, links in pages:
+        for url in links:
+            path = link_target(page_url, url_map.get(url, url))
+            if path is not None and not is_valid(path, outputs):
+                broken.append((source, url))
+    return broken
+
+
+def _check_chunk(pages):
+    return _check_pages(pages, _outputs, _url_map)
+
+
+def _install(outputs, url_map):
+    global _outputs, _url_map
+    _outputs = outputs
+    _url_map = url_map
+
+
+def check_links(dest_dir, records, url_map=None, workers=None):
+    """
+    Validate the internal links and images of every page against the built site.
+
+    Links come from the metadata index (collected while each page was parsed), so no
+    HTML is read back. Links are checked before the basepath is prefixed, against
+    paths relative to dest_dir, which is how the site is laid out under any basepath.
+    Large sites are checked in parallel worker processes, each resolving and looking
+    up the links of a chunk of pages.
+
+    Args:
+        dest_dir (str): Directory of the built site
+        records (iterable): Metadata records with "url", "source" and "links"
+        url_map (dict): URL -> fingerprinted URL rewrites applied to the pages
+        workers (int): Size of the worker pool (None lets the executor decide)
+
+    Returns:
+        list: (source path, url) of every broken link, in page order
+    """
+    outputs = output_paths(dest_dir)
+    url_map = url_map or {}
+    pages = [(record["source"], record["url"], record.get("links", ())) for record in records]
+
+    if sum(len(links) for _, _, links in pages) < PARALLEL_THRESHOLD:
+        return _check_pages(pages, outputs, url_map)
+
+    chunks = [pages[i:i + CHUNK_SIZE] for i in range(0, len(pages), CHUNK_SIZE)]
+    broken = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_install, initargs=(outputs, url_map)) as pool:
+        for result in pool.map(_check_chunk, chunks):
+            broken.extend(result)
+    return broken
@@ -0,0 +1,103 @@
+import gzip
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Text formats worth serving precompressed
+COMPRESSIBLE_EXTENSIONS = ('.html', '.css', '.js', '.svg', '.xml')
+
+# Files smaller than this gain little from compression
+DEFAULT_MIN_SIZE = 1024
+
+
+def _compress_file(path, record):
+    """
+    Write path + ".gz" if the file's content hash differs from the cached record.
+
+    Args:
+        path (str): File to compress
+        record (list): Cached [sha256, mtime_ns, size] of the last compression, or None
+
+    Returns:
+        tuple: (path, new record, whether the .gz file was written)
+    """
+    st = os.stat(path)
+    gz_path = path + '.gz'
+    gz_exists = os.path.exists(gz_path)
+
+    # Unchanged stat: trust the record without reading the file
+    if gz_exists and record is not None and record[1] == st.st_mtime_ns and record[2] == st.st_size:
+        return path, record, False
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    new_record = [digest, st.st_mtime_ns, st.st_size]
+
+    if gz_exists and record is not None and record[0] == digest:
+        return path, new_record, False
+
+    # zlib releases the GIL while compressing, so threads compress in parallel.
+    # mtime=0 keeps the output byte-identical for identical input.
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    tmp_path = gz_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(compressed)
+    os.replace(tmp_path, gz_path)
+    return path, new_record, True
+
+
+def compress_assets(dest_dir, records, min_size=DEFAULT_MIN_SIZE, workers=None):
+    """
+    Write precompressed .gz siblings for the text assets of a built site.
+
+    Only files whose contents changed since their last compression are recompressed.
+    Siblings written by an earlier run whose source disappeared or dropped below
+    min_size are deleted so a server never serves a stale .gz.
+
+    Args:
+        dest_dir (str): Directory of the built site
+        records (dict): path -> [sha256, mtime_ns, size] cache, updated in place
+        min_size (int): Smallest file size (in bytes) that gets a .gz sibling
+        workers (int): Size of the worker pool (None lets the executor decide)
+
+    Returns:
+        tuple: (written, unchanged) counts of .gz files
+    """
+    candidates = []
+    for root, dirs, files in os.walk(dest_dir):
+        names = set(files)
+        for name in files:
+            path = os.path.join(root, name)
+
+            # Only siblings this stage wrote (present in records) are ever removed
+            if name.endswith('.gz') and path[:-3] in records:
+                source_name = name[:-3]
+                source_path = path[:-3]
+                if source_name not in names or os.path.getsize(source_path) < min_size:
+                    os.remove(path)
+                    del records[source_path]
+                continue
+
+            if name.endswith(COMPRESSIBLE_EXTENSIONS) and os.path.getsize(path) >= min_size:
+                candidates.append(path)
+
+    written = 0
+    unchanged = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_compress_file, path, records.get(path)) for path in candidates]
+        for future in futures:
+            path, record, was_written = future.result()
+            records[path] = record
+            if was_written:
+                written += 1
+            else:
+                unchanged += 1
+
+    # Forget files that are no longer compressed
+    kept = set(candidates)
+    for path in list(records):
+        if path not in kept:
+            del records[path]
+
+    return written, unchanged
@@ -0,0 +1,116 @@
+import os
+from build_cache import load_cache, save_cache
+
+# Bump whenever the layout of the persisted index changes
+CONTENT_INDEX_VERSION = 2
+
+
+def _scan_entries(abs_dir):
+    """
+    Read the entries of a single directory with os.scandir.
+
+    Symlinks are not followed (as os.walk does by default), so a dangling link or a
+    link to an ancestor directory cannot break or loop the scan, and the entry type
+    comes from the directory listing without a stat per file.
+
+    Args:
+        abs_dir (str): Directory to scan
+
+    Returns:
+        dict: Mapping of entry name to its record ({"is_dir": bool})
+    """
+    entries = {}
+    with os.scandir(abs_dir) as it:
+        for entry in it:
+            entries[entry.name] = {"is_dir": entry.is_dir(follow_symlinks=False)}
+    return entries
+
+
+def scan_content_dir(dir_path_content, previous=None):
+    """
+    Build a directory index of the content tree, reusing cached entries where possible.
+
+    Only directories whose mtime changed since the previous index are re-read with
+    os.scandir; unchanged directories cost a single stat. A directory's mtime changes
+    when entries are added, removed or renamed, so the set of files is always current.
+
+    Args:
+        dir_path_content (str): Path to the content directory
+        previous (dict): Index returned by an earlier scan, or None
+
+    Returns:
+        tuple: (index, rescanned) where index is the new index dict and rescanned is
+            the list of relative directory paths that had to be re-read
+    """
+    root = os.path.abspath(dir_path_content)
+    old_dirs = {}
+    if (
+        previous
+        and previous.get("version") == CONTENT_INDEX_VERSION
+        and previous.get("root") == root
+    ):
+        old_dirs = previous.get("dirs", {})
+
+    new_dirs = {}
+    rescanned = []
+    pending = ["."]
+
+    while pending:
+        rel_dir = pending.pop()
+        abs_dir = os.path.join(root, rel_dir) if rel_dir != "." else root
+        mtime_ns = os.stat(abs_dir).st_mtime_ns
+
+        cached = old_dirs.get(rel_dir)
+        if cached is not None and cached["mtime_ns"] == mtime_ns:
+            entries = cached["entries"]
+        else:
+            entries = _scan_entries(abs_dir)
+            rescanned.append(rel_dir)
+
+        new_dirs[rel_dir] = {"mtime_ns": mtime_ns, "entries": entries}
+
+        for name, entry in entries.items():
+            if entry["is_dir"]:
+                pending.append(os.path.normpath(os.path.join(rel_dir, name)))
+
+    index = {"version": CONTENT_INDEX_VERSION, "root": root, "dirs": new_dirs}
+    return index, rescanned
+
+
+def markdown_files(index):
+    """
+    List the markdown files recorded in a content index.
+
+    Args:
+        index (dict): Index returned by scan_content_dir
+
+    Returns:
+        list: Sorted relative paths of all .md files (except _-prefixed fragments,
+            which are only included into pages)
+    """
+    paths = []
+    for rel_dir, record in index["dirs"].items():
+        for name, entry in record["entries"].items():
+            if not entry["is_dir"] and name.endswith('.md') and not name.startswith('_'):
+                paths.append(os.path.normpath(os.path.join(rel_dir, name)))
+    return sorted(paths)
+
+
+def discover_markdown_files(dir_path_content, index_path=None):
+    """
+    Find every markdown file under the content directory using the persisted index.
+
+    Args:
+        dir_path_content (str): Path to the content directory
+        index_path (str): Where to persist the index between builds (None disables persistence)
+
+    Returns:
+        list: Sorted paths of the markdown files, relative to dir_path_content
+    """
+    previous = load_cache(index_path) if index_path else None
+    index, rescanned = scan_content_dir(dir_path_content, previous)
+
+    if index_path and (rescanned or previous is None):
+        save_cache(index_path, index)
+
+    return markdown_files(index)
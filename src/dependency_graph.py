@@ -0,0 +1,169 @@
+import hashlib
+import os
+from build_cache import load_cache, save_cache
+
+# Bump whenever the layout of the persisted graph changes
+DEPENDENCY_GRAPH_VERSION = 1
+
+
+def file_digest(path):
+    """
+    Compute the SHA-256 hex digest of a file's contents.
+
+    Args:
+        path (str): Path to the file
+
+    Returns:
+        str: Hex digest of the file contents
+    """
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class DependencyGraph:
+    """
+    Records which inputs (markdown sources, templates, static assets, other pages)
+    each generated page read, so a set of changed files maps to the pages to rebuild.
+
+    Pages are keyed by their markdown source path, which is also one of each page's
+    inputs. A page linking to another page depends on that page's source, so editing
+    it invalidates the linking page, but rebuilding a page does not cascade further.
+    """
+
+    def __init__(self):
+        # page -> set of input paths it read
+        self.deps = {}
+        # input path -> set of pages that read it
+        self.rdeps = {}
+        # input path -> [mtime_ns, size, sha256] as of the last build
+        # ([None, None, None] records an input that was looked for but absent)
+        self.stamps = {}
+        # Output options of the build that produced the graph (see BuildContext)
+        self.options = None
+
+    def record(self, page, input_path):
+        """
+        Record that a page read an input.
+
+        Args:
+            page (str): Source path of the page
+            input_path (str): Path of the input it depends on
+        """
+        self.deps.setdefault(page, set()).add(input_path)
+        self.rdeps.setdefault(input_path, set()).add(page)
+
+    def clear_page(self, page):
+        """
+        Drop every edge of a page, before it is re-rendered or after it is deleted.
+
+        Args:
+            page (str): Source path of the page
+        """
+        for input_path in self.deps.pop(page, ()):
+            pages = self.rdeps.get(input_path)
+            if pages is not None:
+                pages.discard(page)
+                if not pages:
+                    del self.rdeps[input_path]
+
+    def affected(self, changed):
+        """
+        Find every page that must be rebuilt when the given inputs changed.
+
+        The cost is proportional to the number of affected pages and their edges,
+        not to the size of the site.
+
+        Args:
+            changed (iterable): Paths of the changed inputs
+
+        Returns:
+            set: Source paths of the pages to rebuild
+        """
+        result = set()
+        for input_path in changed:
+            if input_path in self.deps:
+                result.add(input_path)
+            result.update(self.rdeps.get(input_path, ()))
+        return result
+
+    def changed_inputs(self):
+        """
+        List the recorded inputs whose contents changed since they were stamped.
+
+        Inputs whose mtime and size are unchanged are assumed unchanged; others are
+        re-hashed so that a touch without an edit does not trigger a rebuild.
+
+        Returns:
+            list: Paths of inputs that changed, appeared or no longer exist
+        """
+        changed = []
+        for input_path in self.rdeps:
+            stamp = self.stamps.get(input_path)
+            try:
+                st = os.stat(input_path)
+            except OSError:
+                if stamp is None or stamp[2] is not None:
+                    changed.append(input_path)
+                continue
+
+            if stamp is not None and stamp[0] == st.st_mtime_ns and stamp[1] == st.st_size:
+                continue
+
+            if stamp is None or stamp[2] != file_digest(input_path):
+                changed.append(input_path)
+        return changed
+
+    def stamp_inputs(self):
+        """Refresh the stamps of every input whose stat changed since it was stamped"""
+        for input_path in list(self.rdeps):
+            try:
+                st = os.stat(input_path)
+            except OSError:
+                self.stamps[input_path] = [None, None, None]
+                continue
+            stamp = self.stamps.get(input_path)
+            if stamp is None or stamp[0] != st.st_mtime_ns or stamp[1] != st.st_size:
+                self.stamps[input_path] = [st.st_mtime_ns, st.st_size, file_digest(input_path)]
+
+        for input_path in list(self.stamps):
+            if input_path not in self.rdeps:
+                del self.stamps[input_path]
+
+    def to_dict(self):
+        return {
+            "version": DEPENDENCY_GRAPH_VERSION,
+            "deps": {page: sorted(inputs) for page, inputs in self.deps.items()},
+            "stamps": self.stamps,
+            "options": self.options,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        graph = cls()
+        if not data or data.get("version") != DEPENDENCY_GRAPH_VERSION:
+            return graph
+        for page, inputs in data.get("deps", {}).items():
+            for input_path in inputs:
+                graph.record(page, input_path)
+        graph.stamps = data.get("stamps", {})
+        graph.options = data.get("options")
+        return graph
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a persisted graph, returning an empty one if none exists.
+
+        Args:
+            path (str): Path to the graph cache file
+
+        Returns:
+            DependencyGraph: The loaded graph
+        """
+        return cls.from_dict(load_cache(path))
+
+    def save(self, path):
+        save_cache(path, self.to_dict())
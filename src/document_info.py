@@ -0,0 +1,220 @@
+from textnode import TextType
+from search_index import tokenize
+from slugify import slugify
+from parentnode import ParentNode
+from leafnode import LeafNode
+
+
+class DocumentInfo:
+    """
+    Facts about a markdown document, collected while markdown_to_html_node parses it.
+
+    Attributes:
+        title (str): Text of the first h1 line (see add_block), or None
+        headings (list): (level, text) for every heading, in document order
+        links (list): URLs of inline links, in document order
+        images (list): (alt, url) for every image, in document order
+        word_count (int): Words of prose (code blocks and URLs excluded)
+        terms (set): Lowercase search terms of the prose text leaves
+        anchors (list): (level, plain text, id) for every heading given an id
+        includes (list): Paths of the fragments included, directly or not
+        definitions (dict): Reference link definitions (normalized label -> url)
+        wiki_links (list): (target, rel_path of the page) for every resolved [[wiki link]]
+        unresolved_wiki_links (list): Targets of [[wiki links]] that name no page
+        diagnostics (list): (file, line, column, message) for every problem a tolerant
+            parse worked around
+        problems (list): (text, index, message) reported by the inline parser for the
+            block being converted, until parse_markdown locates them in the file
+
+    Args:
+        heading_ids (bool): Give headings slugged, de-duplicated ids
+        highlighter (Highlighter): Highlights code blocks that name a language
+        page_index (PageIndex): Resolves [[wiki links]] (None leaves them as text)
+        tolerant (bool): Render malformed markup as text and record diagnostics
+            instead of raising ValueError
+    """
+
+    def __init__(self, heading_ids=False, highlighter=None, page_index=None, tolerant=False):
+        self.title = None
+        self.headings = []
+        self.links = []
+        self.images = []
+        self.word_count = 0
+        self.terms = set()
+        self.heading_ids = heading_ids
+        self.highlighter = highlighter
+        self.anchors = []
+        self.includes = []
+        self.definitions = {}
+        self.page_index = page_index
+        self.wiki_links = []
+        self.unresolved_wiki_links = []
+        self.tolerant = tolerant
+        self.diagnostics = []
+        self.problems = [] if tolerant else None
+        # Ids already used in this document
+        self._ids = set()
+
+    def add_block(self, block):
+        """
+        Look for the title in a block of the document's own markdown.
+
+        The title is the first line anywhere in the document that starts with "# ",
+        as extract_title's line scan defines it, so an h1 line inside a paragraph
+        counts and a heading's continuation lines do not.
+
+        Args:
+            block (str): A markdown block, before conversion
+        """
+        if self.title is not None:
+            return
+        for line in block.split('\n'):
+            stripped_line = line.strip()
+            if stripped_line.startswith('# '):
+                self.title = stripped_line[1:].strip()
+                return
+
+    def add_heading(self, level, text):
+        """
+        Record a heading.
+
+        Args:
+            level (int): Heading level, 1 to 6
+            text (str): Raw heading text (inline markdown not rendered); only its
+                first line is recorded
+        """
+        self.headings.append((level, text.split('\n', 1)[0].strip()))
+
+    def heading_id(self, level, text):
+        """
+        Assign a heading its id, unique within the document ("intro", "intro-1", ...).
+
+        Args:
+            level (int): Heading level, 1 to 6
+            text (str): Plain heading text (inline markdown removed)
+
+        Returns:
+            str: The id, or None when heading ids are disabled
+        """
+        if not self.heading_ids:
+            return None
+        base = slugify(text)
+        anchor = base
+        suffix = 1
+        while anchor in self._ids:
+            anchor = f"{base}-{suffix}"
+            suffix += 1
+        self._ids.add(anchor)
+        self.anchors.append((level, text, anchor))
+        return anchor
+
+    def toc_html_node(self, min_level=2):
+        """
+        Build a nested table of contents from the heading anchors.
+
+        Args:
+            min_level (int): Shallowest heading level listed (the h1 is the page title)
+
+        Returns:
+            ParentNode: A <nav> holding nested <ul> lists, or None without entries
+        """
+        roots = []
+        stack = []
+        for level, text, anchor in self.anchors:
+            if level < min_level:
+                continue
+            entry = (LeafNode(tag="a", value=text, props={"href": f"#{anchor}"}), [])
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            (stack[-1][1][1] if stack else roots).append(entry)
+            stack.append((level, entry))
+        if not roots:
+            return None
+        return ParentNode(tag="nav", children=[_toc_list(roots)], props={"class": "toc"})
+
+    def resolve_wiki_link(self, target):
+        """
+        Resolve a [[wiki link]] through the page index, recording the outcome.
+
+        Args:
+            target (str): Link target as written (e.g., "tom", "blog/majesty")
+
+        Returns:
+            str: Site-absolute URL of the page, or None if no page has the name
+        """
+        resolved = self.page_index.resolve(target)
+        if resolved is None:
+            self.unresolved_wiki_links.append(target)
+            return None
+        url, rel_path = resolved
+        self.wiki_links.append((target, rel_path))
+        return url
+
+    def add_text_node(self, text_node):
+        """
+        Record an inline TextNode produced by the parser.
+
+        Args:
+            text_node (TextNode): An inline node of the document
+        """
+        if text_node.text_type == TextType.IMAGE:
+            self.images.append((text_node.text, text_node.url))
+            return
+        if text_node.text_type == TextType.LINK:
+            self.links.append(text_node.url)
+        self.word_count += len(text_node.text.split())
+        self.terms.update(tokenize(text_node.text))
+
+    def add_fragment(self, fragment):
+        """
+        Merge the facts of an included fragment, in the place it was included.
+
+        Fragment heading ids already used in this document are given new ones, as
+        heading_id would; the fragment's shared nodes keep theirs, so the caller copies
+        the renamed headings.
+
+        Args:
+            fragment (IncludedFragment): The fragment's path, nodes and DocumentInfo
+
+        Returns:
+            dict: Fragment heading id -> id in this document, for the renamed headings
+        """
+        fragment_info = fragment.info
+        for level, text in fragment_info.headings:
+            self.add_heading(level, text)
+        self.links.extend(fragment_info.links)
+        self.images.extend(fragment_info.images)
+        self.word_count += fragment_info.word_count
+        self.terms.update(fragment_info.terms)
+        renamed = {}
+        for level, text, anchor in fragment_info.anchors:
+            if anchor in self._ids:
+                renamed[anchor] = self.heading_id(level, text)
+            else:
+                self._ids.add(anchor)
+                self.anchors.append((level, text, anchor))
+        self.wiki_links.extend(fragment_info.wiki_links)
+        self.unresolved_wiki_links.extend(fragment_info.unresolved_wiki_links)
+        self.diagnostics.extend(fragment_info.diagnostics)
+        self.includes.append(fragment.path)
+        self.includes.extend(fragment_info.includes)
+        return renamed
+
+    def urls(self):
+        """
+        List every URL the document references.
+
+        Returns:
+            list: Link URLs followed by image URLs
+        """
+        return self.links + [url for _, url in self.images]
+
+
+def _toc_list(entries):
+    items = []
+    for link, children in entries:
+        item_children = [link]
+        if children:
+            item_children.append(_toc_list(children))
+        items.append(ParentNode(tag="li", children=item_children))
+    return ParentNode(tag="ul", children=items)
@@ -28,4 +28,56 @@ def extract_markdown_links(text):
     """
     pattern = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
     matches = re.findall(pattern, text)
-    return matches 
\ No newline at end of file
+    return matches 
+
+# "[id]: url" or '[id]: <url> "title"' on a line of its own
+_LINK_DEFINITION = re.compile(r'^ {0,3}\[([^\[\]]+)\]:[ \t]*<?([^\s<>]+)>?(?:[ \t]+(?:"[^"]*"|\'[^\']*\'|\([^()]*\)))?[ \t]*$')
+
+
+def normalize_label(label):
+    """
+    Normalize a link reference label: case-insensitive, with whitespace runs collapsed.
+    
+    Args:
+        label (str): Label as written between the brackets
+        
+    Returns:
+        str: The lookup key
+    """
+    return ' '.join(label.split()).casefold()
+
+
+def extract_link_definitions(markdown, line_map=None):
+    """
+    Collect reference link definitions ("[id]: url") and remove their lines.
+    
+    One pass over the lines; lines inside fenced code blocks are left alone. When a
+    label is defined twice, the first definition wins.
+    
+    Args:
+        markdown (str): Raw markdown text representing a full document
+        line_map (list): When given and any line is scanned, the 0-based source line of
+            each kept line is appended, so positions in the result can be reported in
+            the source (left empty when the markdown has no definitions to look for)
+        
+    Returns:
+        tuple: (markdown without the definition lines, dict of normalized label -> url)
+    """
+    if ']:' not in markdown:
+        return markdown, {}
+    
+    definitions = {}
+    kept_lines = []
+    in_code = False
+    for number, line in enumerate(markdown.split('\n')):
+        if line.count('```') % 2:
+            in_code = not in_code
+        elif not in_code:
+            match = _LINK_DEFINITION.match(line)
+            if match:
+                definitions.setdefault(normalize_label(match.group(1)), match.group(2))
+                continue
+        kept_lines.append(line)
+        if line_map is not None:
+            line_map.append(number)
+    return '\n'.join(kept_lines), definitions
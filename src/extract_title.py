@@ -1,9 +1,16 @@
-def extract_title(markdown):
+import itertools
+
+
+def extract_title(markdown, info=None):
     """
     Extract the h1 header from markdown content.
     
+    When the DocumentInfo collected while parsing the document is given, the title
+    is looked up from it instead of scanning the markdown again.
+    
     Args:
         markdown (str): Raw markdown text
+        info (DocumentInfo): Facts collected by parse_markdown for this document
         
     Returns:
         str: The title from the h1 header (without # and whitespace)
@@ -11,6 +18,11 @@ def extract_title(markdown):
     Raises:
         ValueError: If no h1 header is found
     """
+    if info is not None:
+        if info.title is None:
+            raise ValueError("No h1 header found in markdown")
+        return info.title
+    
     lines = markdown.split('\n')
     
     for line in lines:
@@ -22,3 +34,41 @@ def extract_title(markdown):
     
     # If no h1 header is found, raise an exception
     raise ValueError("No h1 header found in markdown")
+
+
+def read_title(path):
+    """
+    Read the title a page will get without parsing it: its front-matter title, or
+    else the first h1 line extract_title finds.
+
+    The file is read line by line and only up to the title, so the titles of the
+    pages a build is about to render can be known before any of them is rendered.
+
+    Args:
+        path (str): Path to the markdown file
+
+    Returns:
+        str: The title, or None if the page has none (or malformed front matter)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        first_line = f.readline()
+        lines = f
+        if first_line == "---\n":
+            title = None
+            for line in f:
+                if line.strip() == "---":
+                    break
+                key, sep, value = line.partition(':')
+                if sep and key.strip().lower() == "title":
+                    title = value.strip()
+            else:
+                return None
+            if title:
+                return title
+        else:
+            lines = itertools.chain((first_line,), f)
+        for line in lines:
+            stripped_line = line.strip()
+            if stripped_line.startswith('# '):
+                return stripped_line[1:].strip()
+    return None
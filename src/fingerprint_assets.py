@@ -0,0 +1,194 @@
+import json
+import os
+import re
+import shutil
+from dependency_graph import file_digest
+
+# Hex digits of the content hash kept in fingerprinted file names
+FINGERPRINT_LENGTH = 10
+
+# Name of the manifest written to the root of the built site
+MANIFEST_NAME = "asset-manifest.json"
+
+_URL_ATTRIBUTE = re.compile(r'\b(href|src)="([^"]*)"')
+
+
+def fingerprint_name(rel_path, digest):
+    """
+    Insert a content hash before the extension of a file name.
+
+    Args:
+        rel_path (str): Path relative to the static directory (e.g., "images/tom.png")
+        digest (str): Hex digest of the file contents
+
+    Returns:
+        str: The fingerprinted path (e.g., "images/tom.1a2b3c4d5e.png")
+    """
+    root, ext = os.path.splitext(rel_path)
+    return f"{root}.{digest[:FINGERPRINT_LENGTH]}{ext}"
+
+
+def build_asset_manifest(static_dir, records):
+    """
+    Map every static file to its fingerprinted name.
+
+    Files are only re-hashed when their mtime or size differs from the cached record.
+
+    Args:
+        static_dir (str): Directory holding the static assets
+        records (dict): rel_path -> [sha256, mtime_ns, size] cache, updated in place
+
+    Returns:
+        dict: rel_path -> fingerprinted rel_path, using "/" separators
+    """
+    manifest = {}
+    seen = set()
+    pending = [""]
+
+    while pending:
+        rel_dir = pending.pop()
+        with os.scandir(os.path.join(static_dir, rel_dir)) as it:
+            for entry in it:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                if entry.is_dir():
+                    pending.append(rel_path)
+                    continue
+
+                st = entry.stat()
+                record = records.get(rel_path)
+                if record is None or record[1] != st.st_mtime_ns or record[2] != st.st_size:
+                    record = [file_digest(entry.path), st.st_mtime_ns, st.st_size]
+                    records[rel_path] = record
+
+                manifest[rel_path] = fingerprint_name(rel_path, record[0])
+                seen.add(rel_path)
+
+    for rel_path in list(records):
+        if rel_path not in seen:
+            del records[rel_path]
+
+    return manifest
+
+
+def asset_url_map(manifest):
+    """
+    Turn a manifest into a lookup of site-absolute URLs.
+
+    Args:
+        manifest (dict): rel_path -> fingerprinted rel_path
+
+    Returns:
+        dict: "/rel_path" -> "/fingerprinted_rel_path"
+    """
+    return {f"/{rel_path}": f"/{hashed}" for rel_path, hashed in manifest.items()}
+
+
+def remove_stale_assets(dest_dir, manifest):
+    """
+    Delete fingerprinted files (and their .gz siblings) that the previous build's
+    manifest lists but the new one no longer does, e.g. after a stylesheet edit.
+
+    Args:
+        dest_dir (str): Directory of the built site
+        manifest (dict): rel_path -> fingerprinted rel_path of this build
+
+    Returns:
+        int: Number of files removed
+    """
+    try:
+        with open(os.path.join(dest_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        return 0
+
+    current = set(manifest.values())
+    removed = 0
+    for hashed in previous.values():
+        if hashed in current:
+            continue
+        for path in (os.path.join(dest_dir, hashed), os.path.join(dest_dir, hashed) + ".gz"):
+            if os.path.isfile(path):
+                os.remove(path)
+                removed += 1
+    return removed
+
+
+def copy_fingerprinted_assets(static_dir, dest_dir, manifest):
+    """
+    Copy static files to their fingerprinted names.
+
+    A fingerprinted name identifies its contents, so files already present are skipped.
+    Outdated fingerprinted copies left by the previous build are removed first (see
+    remove_stale_assets); the caller then writes the new manifest.
+
+    Args:
+        static_dir (str): Directory holding the static assets
+        dest_dir (str): Directory of the built site
+        manifest (dict): rel_path -> fingerprinted rel_path
+
+    Returns:
+        int: Number of files copied
+    """
+    remove_stale_assets(dest_dir, manifest)
+    copied = 0
+    for rel_path, hashed in manifest.items():
+        dest_path = os.path.join(dest_dir, hashed)
+        if os.path.exists(dest_path):
+            continue
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        shutil.copy2(os.path.join(static_dir, rel_path), dest_path)
+        copied += 1
+    return copied
+
+
+def rewrite_asset_urls(node, url_map):
+    """
+    Point link and image URLs in an HTMLNode tree at fingerprinted assets.
+
+    Args:
+        node (HTMLNode): Root of the tree
+        url_map (dict): URL -> fingerprinted URL (see asset_url_map)
+    """
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if current.props:
+            for attr in ("href", "src"):
+                url = current.props.get(attr)
+                if url is not None and url in url_map:
+                    current.props[attr] = url_map[url]
+        if current.children:
+            stack.extend(current.children)
+
+
+def rewrite_template_urls(template, url_map):
+    """
+    Point href/src attributes in template markup at fingerprinted assets.
+
+    Args:
+        template (str): Template HTML
+        url_map (dict): URL -> fingerprinted URL (see asset_url_map)
+
+    Returns:
+        str: The rewritten template
+    """
+    def replace(match):
+        url = url_map.get(match.group(2))
+        if url is None:
+            return match.group(0)
+        return f'{match.group(1)}="{url}"'
+
+    return _URL_ATTRIBUTE.sub(replace, template)
+
+
+def template_urls(template):
+    """
+    List the href/src URLs referenced by template markup.
+
+    Args:
+        template (str): Template HTML
+
+    Returns:
+        list: URLs in the order they appear
+    """
+    return [match.group(2) for match in _URL_ATTRIBUTE.finditer(template)]
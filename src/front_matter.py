@@ -0,0 +1,36 @@
+def split_front_matter(markdown):
+    """
+    Split an optional front-matter header off a markdown document.
+
+    The header is a block of "key: value" lines between two "---" lines at the very
+    start of the document. Keys are lowercased; values are kept as stripped strings.
+
+    Args:
+        markdown (str): Raw markdown text, possibly starting with front matter
+
+    Returns:
+        tuple: (metadata, body) where metadata is a dict (empty when there is no header)
+            and body is the markdown after the header
+
+    Raises:
+        ValueError: If the header is not closed or a line is not "key: value"
+    """
+    if not markdown.startswith("---\n"):
+        return {}, markdown
+
+    metadata = {}
+    lines = markdown.split('\n')
+
+    for i in range(1, len(lines)):
+        line = lines[i]
+        if line.strip() == "---":
+            return metadata, '\n'.join(lines[i + 1:])
+        if not line.strip():
+            continue
+
+        key, sep, value = line.partition(':')
+        if not sep or not key.strip():
+            raise ValueError(f"Invalid front matter line {i + 1}: {line!r}")
+        metadata[key.strip().lower()] = value.strip()
+
+    raise ValueError("Front matter is not closed with '---'")
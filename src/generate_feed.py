@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import re
+import time
+from xml.sax.saxutils import escape, quoteattr
+from build_cache import load_cache, save_cache
+from generate_listings import newest_first
+from generate_page import apply_basepath
+
+# Entries kept in a feed; older posts drop off the end
+DEFAULT_FEED_ENTRIES = 20
+
+# File name of a section's feed inside its output directory
+FEED_NAME = "feed.xml"
+
+_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+def entry_updated(record):
+    """
+    Compute the Atom timestamp of an entry.
+
+    Args:
+        record (dict): Metadata record of the page
+
+    Returns:
+        str: RFC 3339 timestamp from the front-matter date, or else the source's mtime
+    """
+    date = record.get("date", "")
+    if _DATE.match(date):
+        return f"{date}T00:00:00Z"
+    try:
+        mtime = os.path.getmtime(record["source"])
+    except (KeyError, OSError):
+        mtime = 0
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(mtime))
+
+
+def write_feed(path, feed, entries, read_content):
+    """
+    Stream an Atom feed to disk, one entry at a time.
+
+    Only one entry's body is held in memory at once; the file is written under a
+    temporary name and renamed so a reader never sees a partial feed.
+
+    Args:
+        path (str): Output path of the feed
+        feed (dict): Feed "title", "id", "link", "self" and "updated"
+        entries (list): Dicts with "title", "id", "link", "updated" and "summary"
+        read_content (callable): entry -> body HTML, or None when there is none
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n')
+        f.write('<feed xmlns="http://www.w3.org/2005/Atom">\n')
+        f.write(f'  <title>{escape(feed["title"])}</title>\n')
+        f.write(f'  <id>{escape(feed["id"])}</id>\n')
+        f.write(f'  <link href={quoteattr(feed["link"])}/>\n')
+        f.write(f'  <link rel="self" href={quoteattr(feed["self"])}/>\n')
+        f.write(f'  <updated>{feed["updated"]}</updated>\n')
+        for entry in entries:
+            f.write('  <entry>\n')
+            f.write(f'    <title>{escape(entry["title"])}</title>\n')
+            f.write(f'    <id>{escape(entry["id"])}</id>\n')
+            f.write(f'    <link href={quoteattr(entry["link"])}/>\n')
+            f.write(f'    <updated>{entry["updated"]}</updated>\n')
+            if entry["summary"]:
+                f.write(f'    <summary>{escape(entry["summary"])}</summary>\n')
+            content = read_content(entry)
+            if content is not None:
+                f.write('    <content type="html">')
+                f.write(escape(content))
+                f.write('</content>\n')
+            f.write('  </entry>\n')
+        f.write('</feed>\n')
+    os.replace(tmp_path, path)
+
+
+def generate_feed(section, dest_dir_path, basepath, context, max_entries=DEFAULT_FEED_ENTRIES, site_url="", state_path=None):
+    """
+    Write the Atom feed of a section from the metadata index.
+
+    Entry bodies are the HTML the page pipeline already rendered (kept by
+    BuildContext.store_content), so no page is parsed again. The feed is only
+    rewritten when an entry's metadata or body hash changed.
+
+    Args:
+        section (str): Section directory relative to the content directory (e.g., "blog")
+        dest_dir_path (str): Directory of the built site
+        basepath (str): Base path for the site
+        context (BuildContext): Build state holding the metadata index
+        max_entries (int): Newest posts kept in the feed
+        site_url (str): Scheme and host the site is served from (e.g., "https://example.com")
+        state_path (str): Where feed hashes are persisted (None keeps nothing)
+
+    Returns:
+        bool: Whether the feed was written
+    """
+    section = section.strip('/')
+    section_url = "/" + section
+    base = site_url.rstrip('/') + basepath.rstrip('/')
+
+    records = [
+        record for record in newest_first(context.metadata.pages(section_url))
+        if record["url"] != section_url
+    ][:max_entries]
+    entries = [
+        {
+            "title": record["title"],
+            "id": base + record["url"],
+            "link": base + record["url"],
+            "updated": entry_updated(record),
+            "summary": record.get("description", ""),
+            "source": record.get("source"),
+            "content_sha": record.get("content_sha"),
+        }
+        for record in records
+    ]
+    feed_path = os.path.join(dest_dir_path, section, FEED_NAME)
+    feed = {
+        "title": section.split('/')[-1].replace('-', ' ').capitalize(),
+        "id": base + section_url,
+        "link": base + section_url,
+        "self": f"{base}{section_url}/{FEED_NAME}",
+        "updated": max((entry["updated"] for entry in entries), default=entry_updated({})),
+    }
+
+    state = load_cache(state_path, {}) if state_path else {}
+    key = hashlib.sha256(json.dumps([feed, entries], sort_keys=True).encode('utf-8')).hexdigest()
+    if state.get(section_url) == key and os.path.exists(feed_path):
+        return False
+
+    def read_content(entry):
+        content = context.load_content(entry["source"], entry["content_sha"])
+        return apply_basepath(content, basepath) if content is not None else None
+
+    print(f"Writing feed {feed_path}")
+    os.makedirs(os.path.dirname(feed_path), exist_ok=True)
+    write_feed(feed_path, feed, entries, read_content)
+
+    state[section_url] = key
+    if state_path:
+        save_cache(state_path, state)
+    return True
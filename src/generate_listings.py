@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+from parentnode import ParentNode
+from leafnode import LeafNode
+from build_cache import load_cache, save_cache
+from generate_page import apply_basepath
+from minify_html import Minifier
+
+# Posts shown on each listing page
+DEFAULT_PER_PAGE = 10
+
+
+def newest_first(records):
+    """
+    Order page records newest first by their front-matter date (undated pages last),
+    then by title.
+
+    Args:
+        records (iterable): Metadata records (or dicts with "title" and optional "date")
+
+    Returns:
+        list: The records in listing order
+    """
+    records = sorted(records, key=lambda record: record["title"])
+    records.sort(key=lambda record: record.get("date", ""), reverse=True)
+    return records
+
+
+def listing_items(records, section_url):
+    """
+    Select and order the posts of a section from metadata index records.
+
+    Posts are ordered newest first by their front-matter date (undated posts last),
+    then by title.
+
+    Args:
+        records (list): Metadata records of the section (see MetadataIndex.pages)
+        section_url (str): URL of the section (e.g., "/blog")
+
+    Returns:
+        list: Dicts with the title, url, date and description of each post
+    """
+    return [
+        {
+            "title": record["title"],
+            "url": record["url"],
+            "date": record.get("date", ""),
+            "description": record.get("description", ""),
+        }
+        for record in newest_first(records)
+        if record["url"] != section_url
+    ]
+
+
+def listing_url(section_url, number, has_index):
+    """
+    Compute the URL of a listing page.
+
+    Args:
+        section_url (str): URL of the section (e.g., "/blog")
+        number (int): 1-based page number
+        has_index (bool): Whether the section has its own index.md (page 1 then moves)
+
+    Returns:
+        str: "/blog" for the first page, "/blog/page/N" for the others
+    """
+    if number == 1 and not has_index:
+        return section_url
+    return f"{section_url}/page/{number}"
+
+
+def listing_to_html_node(items, prev_url=None, next_url=None):
+    """
+    Build the HTMLNode tree of a listing page's content.
+
+    Args:
+        items (list): Posts on this page (see listing_items)
+        prev_url (str): URL of the previous listing page, if any
+        next_url (str): URL of the next listing page, if any
+
+    Returns:
+        ParentNode: A <div> with the list of posts and the pagination links
+    """
+    list_items = []
+    for item in items:
+        children = [LeafNode(tag="a", value=item["title"], props={"href": item["url"]})]
+        if item["date"]:
+            children.append(LeafNode(tag=None, value=" "))
+            children.append(LeafNode(tag="time", value=item["date"]))
+        if item["description"]:
+            children.append(LeafNode(tag="p", value=item["description"]))
+        list_items.append(ParentNode(tag="li", children=children))
+
+    children = [ParentNode(tag="ul", children=list_items)] if list_items else []
+
+    nav = []
+    if prev_url:
+        nav.append(LeafNode(tag="a", value="Newer posts", props={"href": prev_url, "rel": "prev"}))
+    if next_url:
+        nav.append(LeafNode(tag="a", value="Older posts", props={"href": next_url, "rel": "next"}))
+    if nav:
+        children.append(ParentNode(tag="nav", children=nav))
+
+    return ParentNode(tag="div", children=children)
+
+
+def _dest_path(dest_dir_path, url):
+    return os.path.join(dest_dir_path, url.strip('/'), "index.html")
+
+
+def generate_listings(section, template_path, dest_dir_path, basepath, context, per_page=DEFAULT_PER_PAGE, state_path=None):
+    """
+    Generate the paginated index of a section from the metadata index.
+
+    Post metadata comes from the index filled during the main build, so no source is
+    reopened. Each listing page's inputs (its posts, page count, layout and output
+    options) are hashed and only pages whose hash changed are rendered again.
+
+    Args:
+        section (str): Section directory relative to the content directory (e.g., "blog")
+        template_path (str): Site template (used where no _layout.html applies)
+        dest_dir_path (str): Directory of the built site
+        basepath (str): Base path for the site
+        context (BuildContext): Build state holding the metadata index
+        per_page (int): Posts per listing page
+        state_path (str): Where listing page hashes are persisted (None keeps nothing)
+
+    Returns:
+        tuple: (rendered, unchanged) counts of listing pages
+    """
+    section = section.strip('/')
+    section_url = "/" + section
+    has_index = os.path.isfile(os.path.join(context.content_dir, section, "index.md"))
+
+    items = listing_items(context.metadata.pages(section_url), section_url)
+    pages = [items[i:i + per_page] for i in range(0, len(items), per_page)] or [[]]
+    total = len(pages)
+
+    state = load_cache(state_path, {}) if state_path else {}
+    section_state = state.get(section_url, {"pages": 0, "hashes": {}})
+    hashes = section_state["hashes"]
+
+    template = context.load_template(context.resolve_layout(section, template_path))
+    title = section.split('/')[-1].replace('-', ' ').capitalize()
+    options = context.output_options(basepath)
+
+    rendered = 0
+    unchanged = 0
+    for number, page_items in enumerate(pages, start=1):
+        url = listing_url(section_url, number, has_index)
+        prev_url = listing_url(section_url, number - 1, has_index) if number > 1 else None
+        next_url = listing_url(section_url, number + 1, has_index) if number < total else None
+
+        key = hashlib.sha256(json.dumps(
+            [page_items, prev_url, next_url, template.digest, options], sort_keys=True
+        ).encode('utf-8')).hexdigest()
+        dest_path = _dest_path(dest_dir_path, url)
+        if hashes.get(url) == key and os.path.exists(dest_path):
+            unchanged += 1
+            continue
+
+        page_title = title if number == 1 else f"{title} (page {number})"
+        minifier = Minifier() if context.minify else None
+        content = listing_to_html_node(page_items, prev_url, next_url).to_html(minifier)
+        page = {"title": page_title, "url": url, "listing": page_items, "page_number": number, "page_count": total}
+        html = template.render({"Title": page_title, "Content": content, "page": page})
+
+        print(f"Generating listing page {dest_path}")
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        # Listing pages are counted as listings, not as content pages
+        context.write_output(dest_path, apply_basepath(html, basepath), count=False)
+        hashes[url] = key
+        rendered += 1
+
+    # Remove listing pages beyond the new page count
+    for number in range(total + 1, section_state["pages"] + 1):
+        url = listing_url(section_url, number, has_index)
+        stale_path = _dest_path(dest_dir_path, url)
+        if os.path.exists(stale_path):
+            print(f"Removing stale listing page {stale_path}")
+            os.remove(stale_path)
+        hashes.pop(url, None)
+
+    section_state["pages"] = total
+    state[section_url] = section_state
+    if state_path:
+        save_cache(state_path, state)
+
+    return rendered, unchanged
@@ -1,9 +1,32 @@
 import os
-from markdown_to_html_node import markdown_to_html_node
+from markdown_to_html_node import parse_markdown
+from markdown_include import FragmentCache
 from extract_title import extract_title
+from front_matter import split_front_matter
+from minify_html import Minifier
+from fingerprint_assets import rewrite_asset_urls
+from image_size import add_image_attributes
+from template_engine import compile_template
 
 
-def generate_page(from_path, template_path, dest_path, basepath="/"):
+def apply_basepath(html, basepath):
+    """
+    Prefix site-absolute href/src URLs with the basepath.
+    
+    Args:
+        html (str): Rendered page
+        basepath (str): Base path for the site (e.g., "/" for local, "/REPO_NAME/" for GitHub Pages)
+        
+    Returns:
+        str: The page with rewritten URLs
+    """
+    if basepath != "/":
+        html = html.replace('href="/', f'href="{basepath}')
+        html = html.replace('src="/', f'src="{basepath}')
+    return html
+
+
+def generate_page(from_path, template_path, dest_path, basepath="/", context=None):
     """
     Generate an HTML page from markdown content using a template.
     
@@ -12,32 +35,119 @@ def generate_page(from_path, template_path, dest_path, basepath="/"):
         template_path (str): Path to the HTML template file
         dest_path (str): Path where the generated HTML file should be written
         basepath (str): Base path for the site (e.g., "/" for local, "/REPO_NAME/" for GitHub Pages)
+        context (BuildContext): Shared build state; records the page's dependencies when given
     """
     print(f"Generating page from {from_path} to {dest_path} using {template_path}")
+    prepared = prepare_page(from_path, template_path, dest_path, context)
+    write_page(prepared, dest_path, basepath, context)
+
+
+def prepare_page(from_path, template_path, dest_path, context=None):
+    """
+    Parse a page and serialize its content, stopping short of the template.
+    
+    Builds that need facts about every page before any page is rendered (such as
+    the site-wide link graph) prepare all pages first, then write them.
     
-    # Read the markdown file
+    Args:
+        from_path (str): Path to the markdown file
+        template_path (str): Path to the HTML template file
+        dest_path (str): Path where the generated HTML file will be written
+        context (BuildContext): Shared build state; records the page's dependencies when given
+        
+    Returns:
+        dict: The "template", "title", "content", "toc" and "page" variables of the page
+    """
+    # Read the markdown file and split off its front matter
     with open(from_path, 'r', encoding='utf-8') as f:
-        markdown_content = f.read()
+        source = f.read()
+    front_matter, markdown_content = split_front_matter(source)
+    
+    # Compile the template (once per build when a context is shared between pages)
+    if context is not None:
+        template = context.load_template(template_path)
+    else:
+        template = compile_template(template_path)
+    
+    # Convert markdown to HTML, collecting the document's facts in the same pass
+    heading_ids = context is not None and context.heading_ids
+    highlighter = context.highlighter if context is not None else None
+    includes = context.fragments if context is not None else FragmentCache()
+    page_index = context.page_index if context is not None else None
+    tolerant = context is not None and context.tolerant
+    html_node, info = parse_markdown(
+        markdown_content, heading_ids, highlighter, includes, from_path, page_index,
+        tolerant=tolerant,
+        first_line=source.count('\n') - markdown_content.count('\n') + 1,
+    )
+    
+    if context is not None:
+        # Record every input this page read, so incremental builds know when to rebuild it
+        context.record_page(from_path, template_path, info.urls(), info.includes, info.unresolved_wiki_links)
+        
+        # Size images from their headers before their URLs are fingerprinted
+        if context.image_sizes:
+            add_image_attributes(html_node, context.static_path, context.image_records)
+        
+        # Point links and images at fingerprinted asset names
+        if context.asset_urls:
+            rewrite_asset_urls(html_node, context.asset_urls)
+    
+    # Serialize, minifying text as it is written out if requested
+    minifier = Minifier() if context is not None and context.minify else None
+    html_content = html_node.to_html(minifier)
+    
+    # The table of contents comes from the heading ids assigned while parsing
+    toc_node = info.toc_html_node() if heading_ids else None
+    toc = toc_node.to_html(minifier) if toc_node is not None else ""
+    
+    if minifier is not None:
+        saved = minifier.saved + template.bytes_saved
+        context.summary.minified[dest_path] = saved
     
-    # Read the template file
-    with open(template_path, 'r', encoding='utf-8') as f:
-        template_content = f.read()
+    # Take the title from the front matter, or else from the markdown's h1
+    title = front_matter.get("title")
+    if not title and tolerant and info.title is None:
+        # Name the page after its file rather than failing the build
+        title = os.path.splitext(os.path.basename(from_path))[0]
+        if title == "index":
+            title = os.path.basename(os.path.dirname(os.path.abspath(from_path)))
+        info.diagnostics.append((from_path, 1, 1, f"No h1 header found; using {title!r} as the title"))
+    elif not title:
+        title = extract_title(markdown_content, info)
     
-    # Convert markdown to HTML
-    html_node = markdown_to_html_node(markdown_content)
-    html_content = html_node.to_html()
+    # Add the page to the site-wide metadata index in the same pass that read it
+    page = dict(front_matter, title=title, word_count=info.word_count)
+    if context is not None:
+        page = context.record_metadata(from_path, dest_path, title, front_matter, info)
+        # Keep the rendered body for feeds, so they never re-render the page
+        context.store_content(from_path, page, html_content)
     
-    # Extract the title from the markdown
-    title = extract_title(markdown_content)
+    return {"template": template, "title": title, "content": html_content, "toc": toc, "page": page}
+
+
+def write_page(prepared, dest_path, basepath="/", context=None, prefetch=""):
+    """
+    Render a prepared page through its template and write it out.
     
-    # Replace placeholders in the template
-    final_html = template_content.replace("{{ Title }}", title)
-    final_html = final_html.replace("{{ Content }}", html_content)
+    Args:
+        prepared (dict): Result of prepare_page
+        dest_path (str): Path where the generated HTML file should be written
+        basepath (str): Base path for the site
+        context (BuildContext): Shared build state
+        prefetch (str): <link rel="prefetch"> tags for the {{ Prefetch }} slot
+    """
+    # Render the page through the compiled template
+    final_html = prepared["template"].render({
+        "Title": prepared["title"],
+        "Content": prepared["content"],
+        "TOC": prepared["toc"],
+        "page": prepared["page"],
+        "Prefetch": prefetch,
+    })
     
     # Replace absolute paths with basepath for GitHub Pages compatibility
-    if basepath != "/":
-        final_html = final_html.replace('href="/', f'href="{basepath}')
-        final_html = final_html.replace('src="/', f'src="{basepath}')
+    final_html = apply_basepath(final_html, basepath)
     
     # Ensure the destination directory exists
     dest_dir = os.path.dirname(dest_path)
@@ -45,5 +155,8 @@ def generate_page(from_path, template_path, dest_path, basepath="/"):
         os.makedirs(dest_dir)
     
     # Write the generated HTML to the destination file
-    with open(dest_path, 'w', encoding='utf-8') as f:
-        f.write(final_html)
+    if context is not None:
+        context.write_output(dest_path, final_html)
+    else:
+        with open(dest_path, 'w', encoding='utf-8') as f:
+            f.write(final_html)
@@ -1,47 +1,111 @@
 import os
-from generate_page import generate_page
+from generate_page import generate_page, prepare_page, write_page
+from content_index import discover_markdown_files
 
 
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath="/"):
+def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath="/", index_path=None, context=None):
     """
     Recursively crawl the content directory and generate HTML pages for all markdown files.
     
     Args:
         dir_path_content (str): Path to the content directory containing markdown files
-        template_path (str): Path to the HTML template file
+        template_path (str): Path to the HTML template file (used where no _layout.html applies)
         dest_dir_path (str): Path to the destination directory where HTML files will be written
         basepath (str): Base path for the site (e.g., "/" for local, "/REPO_NAME/" for GitHub Pages)
+        index_path (str): Path of the persisted content index (None rescans the whole tree)
+        context (BuildContext): Shared build state; in incremental mode only pages whose
+            inputs changed are regenerated
     """
-    # Ensure the destination directory exists
-    if not os.path.exists(dest_dir_path):
-        os.makedirs(dest_dir_path)
+    # Discover markdown files through the (optionally persisted) directory index
+    rel_paths = discover_markdown_files(dir_path_content, index_path)
     
-    # Walk through the content directory recursively
-    for root, dirs, files in os.walk(dir_path_content):
-        # Calculate the relative path from content directory
-        rel_path = os.path.relpath(root, dir_path_content)
+    all_rel_paths = rel_paths
+    if context is not None and context.incremental:
+        sources = {os.path.join(dir_path_content, rel_path): rel_path for rel_path in rel_paths}
+        rebuild, removed = context.pages_to_rebuild(sources, basepath)
         
-        # Create corresponding destination directory
-        dest_subdir = os.path.join(dest_dir_path, rel_path)
-        if not os.path.exists(dest_subdir):
-            os.makedirs(dest_subdir)
+        # Delete the output of pages whose source was removed
+        for source_path in removed:
+            rel_path = os.path.relpath(source_path, dir_path_content)
+            stale_path = os.path.join(dest_dir_path, rel_path[:-3] + '.html')
+            if os.path.exists(stale_path):
+                print(f"Removing {stale_path} (source {source_path} was deleted)")
+                os.remove(stale_path)
         
-        # Process each file in the current directory
-        for file in files:
-            if file.endswith('.md'):
-                # Construct source and destination paths
-                source_path = os.path.join(root, file)
-                
-                # Create destination HTML filename (replace .md with .html)
-                html_filename = file[:-3] + '.html'  # Remove .md extension
-                dest_path = os.path.join(dest_subdir, html_filename)
-                
-                # Generate the HTML page
-                print(f"Generating page from {source_path} to {dest_path} using {template_path}")
-                generate_page(source_path, template_path, dest_path, basepath)
+        rel_paths = [sources[source_path] for source_path in sorted(rebuild)]
+    elif context is not None:
+        # A full build renders every page with the current options
+        context.graph.options = context.output_options(basepath)
+    
+    if context is not None:
+        context.start_build(all_rel_paths, rel_paths)
+    
+    # Create each destination directory once, rather than checking it per page
+    os.makedirs(dest_dir_path, exist_ok=True)
+    created_dirs = set()
+    
+    # Prefetch hints rank link targets site-wide, so every page is parsed before any is
+    # written; only the page keys stay in memory, the bodies wait in the context's stash
+    prefetch = context is not None and context.prefetch_count > 0
+    prepared_pages = {}
+    
+    def failed(source_path, dest_path, error):
+        # A tolerant build reports the broken page and carries on with the rest
+        if context is None or not context.tolerant:
+            raise error
+        prepared_pages.pop(source_path, None)
+        context.page_failed(source_path, error, dest_path)
+    
+    def render(rel_paths):
+        for rel_path in rel_paths:
+            # Construct source and destination paths
+            source_path = os.path.join(dir_path_content, rel_path)
+            
+            # Create destination HTML filename (replace .md with .html)
+            dest_path = os.path.join(dest_dir_path, rel_path[:-3] + '.html')
+            
+            dest_subdir = os.path.dirname(dest_path)
+            if dest_subdir not in created_dirs:
+                os.makedirs(dest_subdir, exist_ok=True)
+                created_dirs.add(dest_subdir)
+            
+            # Pick the nearest _layout.html above the page, falling back to the site template
+            layout_path = template_path
+            if context is not None:
+                layout_path = context.resolve_layout(os.path.dirname(rel_path), template_path)
+            
+            # Generate the HTML page
+            print(f"Generating page from {source_path} to {dest_path} using {layout_path}")
+            try:
+                if prefetch:
+                    context.stash_page(source_path, prepare_page(source_path, layout_path, dest_path, context))
+                    prepared_pages[source_path] = (dest_path, layout_path)
+                else:
+                    generate_page(source_path, layout_path, dest_path, basepath, context)
+            except Exception as error:
+                failed(source_path, dest_path, error)
+    
+    render(rel_paths)
+    
+    if context is not None:
+        # Pages created or retitled in this build can change what the [[wiki links]] of
+        # pages it did not render name; those pages are rendered once, now
+        render(context.stale_wiki_pages(rel_paths))
+    
+    if prefetch:
+        context.build_link_graph()
+        for source_path, (dest_path, layout_path) in list(prepared_pages.items()):
+            try:
+                prepared = context.unstash_page(source_path, layout_path)
+                write_page(prepared, dest_path, basepath, context, context.prefetch_tags(source_path))
+            except Exception as error:
+                failed(source_path, dest_path, error)
+    
+    if context is not None:
+        context.finish()
 
 
-def generate_pages_recursive_alt(dir_path_content, template_path, dest_dir_path, basepath="/"):
+def generate_pages_recursive_alt(dir_path_content, template_path, dest_dir_path, basepath="/", index_path=None):
     """
     Alternative implementation using pathlib for more modern Python path handling.
     
@@ -50,27 +114,32 @@ def generate_pages_recursive_alt(dir_path_content, template_path, dest_dir_path,
         template_path (str): Path to the HTML template file
         dest_dir_path (str): Path to the destination directory where HTML files will be written
         basepath (str): Base path for the site (e.g., "/" for local, "/REPO_NAME/" for GitHub Pages)
+        index_path (str): Path of the persisted content index (None rescans the whole tree)
     """
     try:
         from pathlib import Path
     except ImportError:
         # Fallback to os.path if pathlib is not available
-        return generate_pages_recursive(dir_path_content, template_path, dest_dir_path)
+        return generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath, index_path)
     
     content_path = Path(dir_path_content)
     dest_path = Path(dest_dir_path)
     
     # Ensure the destination directory exists
     dest_path.mkdir(parents=True, exist_ok=True)
+    created_dirs = set()
     
-    # Walk through the content directory recursively
-    for md_file in content_path.rglob('*.md'):
+    # Use the directory index instead of a fresh rglob over the whole tree
+    for rel_name in discover_markdown_files(dir_path_content, index_path):
         # Calculate the relative path from content directory
-        rel_path = md_file.relative_to(content_path)
+        rel_path = Path(rel_name)
+        md_file = content_path / rel_path
         
-        # Create corresponding destination directory
+        # Create corresponding destination directory (once per directory)
         dest_subdir = dest_path / rel_path.parent
-        dest_subdir.mkdir(parents=True, exist_ok=True)
+        if dest_subdir not in created_dirs:
+            dest_subdir.mkdir(parents=True, exist_ok=True)
+            created_dirs.add(dest_subdir)
         
         # Create destination HTML filename (replace .md with .html)
         html_filename = rel_path.stem + '.html'
@@ -0,0 +1,121 @@
+import os
+import time
+from xml.sax.saxutils import escape
+
+# Protocol limits for a single sitemap file (sitemaps.org)
+MAX_SITEMAP_URLS = 50000
+MAX_SITEMAP_BYTES = 50 * 1024 * 1024
+
+SITEMAP_NAME = "sitemap.xml"
+
+_XMLNS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+_URLSET_HEAD = f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset {_XMLNS}>\n'.encode('utf-8')
+_URLSET_TAIL = b'</urlset>\n'
+
+
+def _lastmod(path):
+    try:
+        mtime = os.path.getmtime(path)
+    except (OSError, TypeError):
+        return None
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(mtime))
+
+
+def _part_name(number):
+    return f"sitemap-{number}.xml"
+
+
+class _SitemapWriter:
+    """Streams <url> rows into numbered sitemap files, starting a new file at the limits"""
+
+    def __init__(self, dest_dir, max_urls, max_bytes):
+        self.dest_dir = dest_dir
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+        self.parts = []
+        self.file = None
+
+    def _open(self):
+        self.parts.append(_part_name(len(self.parts) + 1))
+        self.file = open(os.path.join(self.dest_dir, self.parts[-1] + ".tmp"), 'wb')
+        self.file.write(_URLSET_HEAD)
+        self.urls = 0
+        self.size = len(_URLSET_HEAD) + len(_URLSET_TAIL)
+
+    def _close(self):
+        self.file.write(_URLSET_TAIL)
+        self.file.close()
+        self.file = None
+
+    def add(self, loc, lastmod):
+        row = f"  <url><loc>{escape(loc)}</loc>"
+        if lastmod:
+            row += f"<lastmod>{lastmod}</lastmod>"
+        row = (row + "</url>\n").encode('utf-8')
+
+        if self.file is not None and (self.urls >= self.max_urls or self.size + len(row) > self.max_bytes):
+            self._close()
+        if self.file is None:
+            self._open()
+        self.file.write(row)
+        self.urls += 1
+        self.size += len(row)
+
+    def finish(self):
+        if self.file is None:
+            self._open()
+        self._close()
+        return self.parts
+
+
+def generate_sitemap(dest_dir_path, records, base_url, max_urls=MAX_SITEMAP_URLS, max_bytes=MAX_SITEMAP_BYTES):
+    """
+    Write sitemap.xml for the generated pages, streaming rows to disk.
+
+    Pages beyond one file's URL or byte limit spill into sitemap-2.xml, sitemap-3.xml
+    and so on, and sitemap.xml becomes a sitemap index pointing at every part. Parts
+    left over from a larger previous build are removed.
+
+    Args:
+        dest_dir_path (str): Directory of the built site
+        records (iterable): Metadata records with "url" and "source" (see MetadataIndex.pages)
+        base_url (str): Site URL plus basepath, without a trailing slash
+        max_urls (int): Most URLs in one sitemap file
+        max_bytes (int): Largest size of one sitemap file in bytes
+
+    Returns:
+        int: Number of sitemap files holding URLs
+    """
+    writer = _SitemapWriter(dest_dir_path, max_urls, max_bytes)
+    try:
+        for record in records:
+            writer.add(base_url + record["url"], _lastmod(record.get("source")))
+        parts = writer.finish()
+    finally:
+        if writer.file is not None:
+            writer.file.close()
+
+    sitemap_path = os.path.join(dest_dir_path, SITEMAP_NAME)
+    if len(parts) == 1:
+        # Everything fits in one file: it is the sitemap itself
+        os.replace(os.path.join(dest_dir_path, parts[0] + ".tmp"), sitemap_path)
+        first_stale = 1
+    else:
+        for name in parts:
+            path = os.path.join(dest_dir_path, name)
+            os.replace(path + ".tmp", path)
+        tmp_path = sitemap_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex {_XMLNS}>\n')
+            for name in parts:
+                f.write(f"  <sitemap><loc>{escape(f'{base_url}/{name}')}</loc></sitemap>\n")
+            f.write('</sitemapindex>\n')
+        os.replace(tmp_path, sitemap_path)
+        first_stale = len(parts) + 1
+
+    number = first_stale
+    while os.path.exists(os.path.join(dest_dir_path, _part_name(number))):
+        os.remove(os.path.join(dest_dir_path, _part_name(number)))
+        number += 1
+
+    return len(parts)
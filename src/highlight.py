@@ -0,0 +1,259 @@
+import builtins
+import hashlib
+import html
+import io
+import keyword
+import os
+import re
+import tokenize
+
+# Bump when the markup produced for a language changes, to invalidate cached results
+HIGHLIGHT_VERSION = 1
+
+# Info-string names of the supported languages
+LANGUAGE_ALIASES = {
+    "python": "python",
+    "py": "python",
+    "python3": "python",
+    "shell": "shell",
+    "sh": "shell",
+    "bash": "shell",
+    "zsh": "shell",
+    "console": "shell",
+    "json": "json",
+    "html": "html",
+    "xml": "html",
+    "css": "css",
+}
+
+_PYTHON_BUILTINS = frozenset(name for name in dir(builtins) if not name.startswith('_'))
+_PYTHON_STRING_TOKENS = frozenset(
+    getattr(tokenize, name)
+    for name in ("STRING", "FSTRING_START", "FSTRING_MIDDLE", "FSTRING_END")
+    if hasattr(tokenize, name)
+)
+
+
+def _lexer(*rules):
+    # One alternation with a group per rule, so text is scanned once from left to right
+    pattern = re.compile('|'.join(f'({regex})' for _, regex in rules), re.DOTALL | re.MULTILINE)
+    return pattern, [css_class for css_class, _ in rules]
+
+
+_SHELL = _lexer(
+    ('c', r'(?<![^\s;])#[^\n]*'),
+    ('s', r'"(?:\\.|[^"\\])*"|\'[^\']*\''),
+    ('nv', r'\$\{[^}\n]*\}|\$(?:\w+|[@#?$!*-])'),
+    ('k', r'\b(?:if|then|else|elif|fi|for|while|until|do|done|case|esac|function|in|return|export|local)\b'),
+    ('nb', r'\b(?:echo|cd|pwd|source|exit|set|unset|read|printf|test|alias|eval|exec|shift|trap)\b'),
+    ('o', r'&&|\|\||[|&;<>]'),
+)
+
+_JSON = _lexer(
+    ('na', r'"(?:\\.|[^"\\])*"(?=\s*:)'),
+    ('s', r'"(?:\\.|[^"\\])*"'),
+    ('m', r'-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b'),
+    ('k', r'\b(?:true|false|null)\b'),
+    ('p', r'[{}\[\],:]'),
+)
+
+_HTML_TAG = _lexer(
+    ('nt', r'^</?[\w:-]+|/?>$'),
+    ('na', r'[\w:-]+(?=\s*=)'),
+    ('s', r'"[^"]*"|\'[^\']*\''),
+)
+
+_HTML = _lexer(
+    ('c', r'<!--.*?-->'),
+    ('k', r'<![^>]*>'),
+    (_HTML_TAG, r'</?[\w:-]+(?:"[^"]*"|\'[^\']*\'|[^\'">])*>'),
+    ('m', r'&#?\w+;'),
+)
+
+_CSS_DECLARATIONS = _lexer(
+    ('c', r'/\*.*?\*/'),
+    ('s', r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\''),
+    ('na', r'[\w-]+(?=\s*:)'),
+    ('m', r'#[0-9a-fA-F]{3,8}\b|-?(?:\d+\.?\d*|\.\d+)(?:%|[a-zA-Z]+)?'),
+    ('p', r'[{};:,()]'),
+)
+
+_CSS = _lexer(
+    ('c', r'/\*.*?\*/'),
+    ('s', r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\''),
+    ('k', r'@[\w-]+'),
+    (_CSS_DECLARATIONS, r'\{[^{}]*\}'),
+    ('nt', r'[.#]?[\w-]+'),
+    ('p', r'[{},>+~:()\[\]]'),
+)
+
+_LEXERS = {"shell": _SHELL, "json": _JSON, "html": _HTML, "css": _CSS}
+
+
+def _regex_spans(code, lexer):
+    pattern, classes = lexer
+    spans = []
+    position = 0
+    for match in pattern.finditer(code):
+        if match.start() > position:
+            spans.append((None, code[position:match.start()]))
+        css_class = classes[match.lastindex - 1]
+        if isinstance(css_class, tuple):
+            # A nested lexer (an HTML tag's attributes, a CSS rule's declarations)
+            spans.extend(_regex_spans(match.group(), css_class))
+        else:
+            spans.append((css_class, match.group()))
+        position = match.end()
+    if position < len(code):
+        spans.append((None, code[position:]))
+    return spans
+
+
+def _python_class(token):
+    if token.type == tokenize.NAME:
+        if keyword.iskeyword(token.string):
+            return 'k'
+        if token.string in _PYTHON_BUILTINS:
+            return 'nb'
+        return None
+    if token.type in _PYTHON_STRING_TOKENS:
+        return 's'
+    if token.type == tokenize.NUMBER:
+        return 'm'
+    if token.type == tokenize.COMMENT:
+        return 'c'
+    if token.type == tokenize.OP:
+        return 'o'
+    return None
+
+
+def _python_spans(code):
+    # Offsets of each line, to turn tokenize's (row, column) positions into indexes
+    offsets = [0]
+    for line in code.splitlines(keepends=True):
+        offsets.append(offsets[-1] + len(line))
+
+    spans = []
+    position = 0
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(code).readline):
+            css_class = _python_class(token)
+            if css_class is None or token.start[0] > len(offsets) - 1:
+                continue
+            start = offsets[token.start[0] - 1] + token.start[1]
+            end = offsets[token.end[0] - 1] + token.end[1]
+            if start < position:
+                continue
+            if start > position:
+                spans.append((None, code[position:start]))
+            spans.append((css_class, code[start:end]))
+            position = end
+    except (tokenize.TokenError, SyntaxError):
+        # An incomplete snippet (e.g., an unclosed bracket): the rest stays plain
+        pass
+    if position < len(code):
+        spans.append((None, code[position:]))
+    return spans
+
+
+def highlight_spans(code, language):
+    """
+    Split code into (CSS class, text) spans; text outside any token has class None.
+
+    Args:
+        code (str): Source code
+        language (str): Language name or alias (see LANGUAGE_ALIASES)
+
+    Returns:
+        list: The spans, whose texts join back to the code, or None for unknown languages
+    """
+    language = LANGUAGE_ALIASES.get(language.lower())
+    if language is None:
+        return None
+    if language == "python":
+        return _python_spans(code)
+    return _regex_spans(code, _LEXERS[language])
+
+
+def highlight(code, language):
+    """
+    Highlight code as HTML: escaped text with tokens wrapped in <span class="...">.
+
+    Args:
+        code (str): Source code
+        language (str): Language name or alias (see LANGUAGE_ALIASES)
+
+    Returns:
+        str: The highlighted HTML, or None for unknown languages
+    """
+    spans = highlight_spans(code, language)
+    if spans is None:
+        return None
+    # Adjacent tokens of one class (e.g., "):") share a span
+    merged = []
+    for css_class, text in spans:
+        if merged and merged[-1][0] == css_class:
+            merged[-1][1].append(text)
+        else:
+            merged.append((css_class, [text]))
+    return ''.join(
+        f'<span class="{css_class}">{html.escape("".join(texts), quote=False)}</span>' if css_class
+        else html.escape("".join(texts), quote=False)
+        for css_class, texts in merged
+    )
+
+
+class Highlighter:
+    """
+    Highlights code blocks, caching the HTML by (language, code hash).
+
+    Results are kept in memory for the build and on disk across builds, so unchanged
+    code blocks are never tokenized again. Cache files are written atomically and
+    named by content, so concurrent workers can share the directory.
+
+    Args:
+        cache_dir (str): Directory of highlighted blocks (None keeps them in memory only)
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self._memory = {}
+
+    def highlight(self, code, language):
+        """
+        Highlight a code block, reusing a cached result when there is one.
+
+        Args:
+            code (str): Source code
+            language (str): Language name or alias from the block's info string
+
+        Returns:
+            str: The highlighted HTML, or None for unknown languages
+        """
+        language = LANGUAGE_ALIASES.get(language.lower())
+        if language is None:
+            return None
+        digest = hashlib.sha256(f"{HIGHLIGHT_VERSION}\0{language}\0{code}".encode('utf-8')).hexdigest()
+        if digest in self._memory:
+            return self._memory[digest]
+
+        cache_file = os.path.join(self.cache_dir, digest + ".html") if self.cache_dir else None
+        result = None
+        if cache_file:
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    result = f.read()
+            except OSError:
+                pass
+
+        if result is None:
+            result = highlight(code, language)
+            if cache_file:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    f.write(result)
+                os.replace(tmp_file, cache_file)
+
+        self._memory[digest] = result
+        return result
@@ -5,7 +5,7 @@ class HTMLNode:
         self.children = children
         self.props = props
 
-    def to_html(self):
+    def to_html(self, minifier=None):
         raise NotImplementedError("to_html method must be implemented by child classes")
 
     def props_to_html(self):
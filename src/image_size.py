@@ -0,0 +1,128 @@
+import os
+import struct
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# JPEG start-of-frame markers (C4, C8 and CC are other segments in the same range)
+_JPEG_SOF = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _jpeg_size(f):
+    f.seek(2)
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        # Fill bytes may pad a marker
+        while marker[1] == 0xFF:
+            marker = marker[1:] + f.read(1)
+            if len(marker) < 2:
+                return None
+        code = marker[1]
+        if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7:
+            continue
+        if code in (0xD9, 0xDA):
+            # End of image or start of scan data before any frame header
+            return None
+        header = f.read(2)
+        if len(header) < 2:
+            return None
+        length = struct.unpack('>H', header)[0]
+        if code in _JPEG_SOF:
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack('>xHH', frame)
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def read_image_size(path):
+    """
+    Read the pixel dimensions of a PNG, JPEG, GIF or WebP file from its header.
+
+    Only the header is read (for JPEG, the segments up to the first frame).
+
+    Args:
+        path (str): Path to the image
+
+    Returns:
+        tuple: (width, height), or None for other or malformed files
+    """
+    with open(path, 'rb') as f:
+        head = f.read(30)
+        # Files cut off inside the header are malformed, not an error
+        if head.startswith(_PNG_SIGNATURE) and head[12:16] == b'IHDR':
+            if len(head) < 24:
+                return None
+            return struct.unpack('>II', head[16:24])
+        if head[:6] in (b'GIF87a', b'GIF89a'):
+            if len(head) < 10:
+                return None
+            return struct.unpack('<HH', head[6:10])
+        if head[:4] == b'RIFF' and head[8:12] == b'WEBP' and len(head) >= 30:
+            chunk = head[12:16]
+            if chunk == b'VP8 ':
+                width, height = struct.unpack('<HH', head[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+            if chunk == b'VP8L':
+                bits = struct.unpack('<I', head[21:25])[0]
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b'VP8X':
+                return (
+                    int.from_bytes(head[24:27], 'little') + 1,
+                    int.from_bytes(head[27:30], 'little') + 1,
+                )
+            return None
+        if head[:2] == b'\xff\xd8':
+            return _jpeg_size(f)
+    return None
+
+
+def cached_image_size(path, records):
+    """
+    Look up the dimensions of an image, reading its header only when it changed.
+
+    Args:
+        path (str): Path to the image
+        records (dict): path -> [mtime_ns, size, width, height] cache, updated in place
+            (width and height are None for files that are not a supported image)
+
+    Returns:
+        tuple: (width, height), or None if unknown
+    """
+    st = os.stat(path)
+    record = records.get(path)
+    if record is None or record[0] != st.st_mtime_ns or record[1] != st.st_size:
+        size = read_image_size(path)
+        record = [st.st_mtime_ns, st.st_size] + (list(size) if size else [None, None])
+        records[path] = record
+    if record[2] is None:
+        return None
+    return record[2], record[3]
+
+
+def add_image_attributes(node, resolve_url, records):
+    """
+    Give every <img> in an HTMLNode tree lazy loading, async decoding and, for
+    images found on disk, its width and height (so the page does not shift as it loads).
+
+    Args:
+        node (HTMLNode): Root of the tree
+        resolve_url (callable): URL -> path of a static file, or None
+        records (dict): Image size cache (see cached_image_size)
+    """
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if current.tag == "img":
+            props = current.props if current.props is not None else {}
+            path = resolve_url(props.get("src", ""))
+            size = cached_image_size(path, records) if path else None
+            if size is not None:
+                props["width"] = str(size[0])
+                props["height"] = str(size[1])
+            props.setdefault("loading", "lazy")
+            props.setdefault("decoding", "async")
+            current.props = props
+        if current.children:
+            stack.extend(current.children)
@@ -1,18 +1,23 @@
 from htmlnode import HTMLNode
+from minify_html import PRESERVE_WHITESPACE_TAGS
 
 
 class LeafNode(HTMLNode):
     def __init__(self, tag, value, props=None):
         super().__init__(tag=tag, value=value, children=None, props=props)
 
-    def to_html(self):
+    def to_html(self, minifier=None):
         if self.value is None:
             raise ValueError("All leaf nodes must have a value")
         
+        value = self.value
+        if minifier is not None and self.tag not in PRESERVE_WHITESPACE_TAGS:
+            value = minifier.text(value)
+        
         # If no tag, return raw text
         if self.tag is None:
-            return self.value
+            return value
         
         # Otherwise, render as HTML tag
         attrs = self.props_to_html()
-        return f"<{self.tag}{attrs}>{self.value}</{self.tag}>"
+        return f"<{self.tag}{attrs}>{value}</{self.tag}>"
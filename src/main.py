@@ -1,16 +1,33 @@
 import os
+import sys
 import shutil
 import logging
-import sys
+import argparse
+import json
+import time
 from textnode import TextNode, TextType
 from generate_pages_recursive import generate_pages_recursive
+from build_cache import cache_path
+from build_context import BuildContext
+from build_summary import BuildSummary
+from compress_assets import DEFAULT_MIN_SIZE
+from fingerprint_assets import copy_fingerprinted_assets, MANIFEST_NAME
+from generate_listings import generate_listings, DEFAULT_PER_PAGE
+from generate_feed import generate_feed, DEFAULT_FEED_ENTRIES
+from generate_sitemap import generate_sitemap
+from check_links import check_links
+from minify_css import DEFAULT_CRITICAL_CSS_BYTES
+from service_worker import (
+    write_service_worker, SERVICE_WORKER_NAME, PRECACHE_MANIFEST_NAME,
+    DEFAULT_PRECACHE_MAX_FILE_BYTES, DEFAULT_PRECACHE_BUDGET,
+)
 
 # Set up logging to see what's happening during the copy process
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
 
 
-def copy_static_files(source_dir, dest_dir):
+def copy_static_files(source_dir, dest_dir, clean=True, manifest=None, exclude=()):
     """
     Recursively copy all contents from source directory to destination directory.
     First deletes all contents of destination directory to ensure clean copy.
@@ -18,6 +35,10 @@ def copy_static_files(source_dir, dest_dir):
     Args:
         source_dir (str): Source directory path
         dest_dir (str): Destination directory path
+        clean (bool): Delete the destination first; when False, only files whose size
+            or mtime differ from the existing copy are copied
+        manifest (dict): Copy each file to its fingerprinted name from this manifest
+        exclude (tuple): File extensions left for a later stage to write (e.g., ".css")
     """
     # Ensure source directory exists
     if not os.path.exists(source_dir):
@@ -25,71 +46,413 @@ def copy_static_files(source_dir, dest_dir):
         return
     
     # Delete destination directory if it exists
-    if os.path.exists(dest_dir):
+    if clean and os.path.exists(dest_dir):
         logger.info(f"Removing existing destination directory: {dest_dir}")
         shutil.rmtree(dest_dir)
     
     # Create destination directory
-    logger.info(f"Creating destination directory: {dest_dir}")
-    os.makedirs(dest_dir)
+    if not os.path.exists(dest_dir):
+        logger.info(f"Creating destination directory: {dest_dir}")
+        os.makedirs(dest_dir)
     
     # Copy all files and subdirectories recursively
-    copy_directory_contents(source_dir, dest_dir)
+    if manifest is not None:
+        copied = copy_fingerprinted_assets(source_dir, dest_dir, manifest)
+        logger.info(f"Copied {copied} fingerprinted files ({len(manifest) - copied} already present)")
+        write_asset_manifest(dest_dir, manifest)
+    else:
+        copy_directory_contents(source_dir, dest_dir, only_changed=not clean, exclude=exclude)
     
     logger.info(f"Successfully copied all files from '{source_dir}' to '{dest_dir}'")
 
 
-def copy_directory_contents(source_dir, dest_dir):
+def copy_directory_contents(source_dir, dest_dir, only_changed=False, exclude=()):
     """
     Recursively copy contents of a directory.
     
     Args:
         source_dir (str): Source directory path
         dest_dir (str): Destination directory path
+        only_changed (bool): Skip files whose existing copy has the same size and mtime
+        exclude (tuple): File extensions that are not copied
     """
     # Get all items in source directory
-    items = os.listdir(source_dir)
+    with os.scandir(source_dir) as it:
+        items = list(it)
     
     for item in items:
-        source_path = os.path.join(source_dir, item)
-        dest_path = os.path.join(dest_dir, item)
+        source_path = item.path
+        dest_path = os.path.join(dest_dir, item.name)
         
-        if os.path.isfile(source_path):
-            # Copy file
+        if item.is_file():
+            if exclude and item.name.endswith(exclude):
+                continue
+            if only_changed and _same_file_stat(item, dest_path):
+                continue
+            # Copy file (copy2 keeps the mtime, so unchanged files compare equal next time)
             logger.info(f"Copying file: {source_path} -> {dest_path}")
             shutil.copy2(source_path, dest_path)
-        elif os.path.isdir(source_path):
+        elif item.is_dir():
             # Create subdirectory and copy its contents
-            logger.info(f"Creating subdirectory: {dest_path}")
-            os.makedirs(dest_path)
-            copy_directory_contents(source_path, dest_path)
+            if not os.path.exists(dest_path):
+                logger.info(f"Creating subdirectory: {dest_path}")
+                os.makedirs(dest_path)
+            copy_directory_contents(source_path, dest_path, only_changed, exclude)
 
 
-def main():
-    """Main function to run the static site generator"""
-    print("Starting static site generator...")
+def _same_file_stat(entry, dest_path):
+    """Check whether dest_path already holds a copy of the scandir entry"""
+    try:
+        dest_stat = os.stat(dest_path)
+    except OSError:
+        return False
+    source_stat = entry.stat()
+    return (
+        source_stat.st_size == dest_stat.st_size
+        and source_stat.st_mtime_ns == dest_stat.st_mtime_ns
+    )
+
+
+def write_asset_manifest(dest_dir, manifest):
+    """
+    Write the fingerprint manifest to the root of the built site.
     
-    # Get basepath from command line arguments, default to "/" for local development
-    basepath = sys.argv[1] if len(sys.argv) > 1 else "/"
-    print(f"Using basepath: {basepath}")
+    Args:
+        dest_dir (str): Directory of the built site
+        manifest (dict): rel_path -> fingerprinted rel_path
+    """
+    manifest_path = os.path.join(dest_dir, MANIFEST_NAME)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def copy_stylesheets(dest_dir, context):
+    """
+    Minify the static stylesheets (once per build) and write them into the site.
     
-    # Define source and destination directories
-    static_dir = "static"
-    dest_dir = "docs" if basepath != "/" else "public"
+    Args:
+        dest_dir (str): Directory the site is written to
+        context (BuildContext): Shared build state
+    """
+    if not context.minify_css:
+        return
+    stylesheets = context.prepare_css()
+    written = context.write_css(dest_dir)
+    logger.info(f"Minified {len(stylesheets)} stylesheets ({written} written)")
+
+
+def build_site(basepath, dest_dir, context):
+    """
+    Copy the static files and generate every page.
     
+    Args:
+        basepath (str): Base path for the site
+        dest_dir (str): Directory the site is written to
+        context (BuildContext): Shared build state (decides full vs. incremental)
+    """
     # Copy static files to destination directory
-    print(f"Copying static files from '{static_dir}' to '{dest_dir}'...")
-    copy_static_files(static_dir, dest_dir)
+    print(f"Copying static files from '{context.static_dir}' to '{dest_dir}'...")
+    clean = not (context.incremental or context.write_if_changed)
+    manifest = context.prepare_assets() if context.fingerprint else None
+    exclude = ('.css',) if context.minify_css else ()
+    copy_static_files(context.static_dir, dest_dir, clean=clean, manifest=manifest, exclude=exclude)
+    copy_stylesheets(dest_dir, context)
     
     print("Static file copying completed!")
     
     # Generate all HTML pages recursively from markdown
     print("Generating HTML pages...")
-    generate_pages_recursive("content", "template.html", dest_dir, basepath)
+    generate_pages_recursive(
+        context.content_dir, "template.html", dest_dir, basepath,
+        index_path=cache_path("content_index.json"),
+        context=context,
+    )
     
     print("Page generation completed!")
+    
+    run_site_stages(basepath, dest_dir, context)
+    
+    context.summary.report()
+
+
+def run_site_stages(basepath, dest_dir, context):
+    """
+    Run the stages that work from the generated pages and the metadata index.
+    
+    Args:
+        basepath (str): Base path for the site
+        dest_dir (str): Directory the site is written to
+        context (BuildContext): Shared build state
+    """
+    for section in context.listing_sections:
+        rendered, unchanged = generate_listings(
+            section, "template.html", dest_dir, basepath, context,
+            per_page=context.listing_per_page,
+            state_path=cache_path("listings.json"),
+        )
+        context.summary.listings_rendered += rendered
+        context.summary.listings_unchanged += unchanged
+    
+    for section in context.feed_sections:
+        written = generate_feed(
+            section, dest_dir, basepath, context,
+            max_entries=context.feed_entries,
+            site_url=context.site_url,
+            state_path=cache_path("feeds.json"),
+        )
+        if written:
+            context.summary.feeds_written += 1
+        else:
+            context.summary.feeds_unchanged += 1
+    
+    context.collect_diagnostics()
+    context.write_search_index(dest_dir, basepath)
+    context.write_backlinks(dest_dir, basepath)
+    
+    if context.sitemap:
+        print("Writing sitemap...")
+        parts = generate_sitemap(
+            dest_dir, context.metadata.pages(), context.site_url.rstrip('/') + basepath.rstrip('/')
+        )
+        if parts > 1:
+            print(f"Sitemap split into {parts} files behind a sitemap index")
+    
+    if context.check_links:
+        print("Checking links...")
+        context.summary.broken_links = check_links(
+            dest_dir, context.metadata.pages(), context.asset_urls
+        )
+    
+    if context.service_worker:
+        entries = context.precache(dest_dir, basepath)
+        if write_service_worker(dest_dir, entries):
+            print(f"Wrote service worker precaching {len(entries)} files")
+    
+    if context.gzip:
+        print("Compressing text assets...")
+        context.compress(dest_dir)
+
+
+def watch(basepath, dest_dir, context, interval=1.0):
+    """
+    Poll the sources and incrementally rebuild the pages affected by each change.
+    
+    The dependency graph stays in memory between polls, so each poll only stats the
+    recorded inputs and renders the pages that depend on whatever changed.
+    
+    Args:
+        basepath (str): Base path for the site
+        dest_dir (str): Directory the site is written to
+        context (BuildContext): Incremental build state shared across polls
+        interval (float): Seconds to wait between polls
+    """
+    print(f"Watching for changes every {interval}s (Ctrl+C to stop)...")
+    try:
+        while True:
+            time.sleep(interval)
+            # Each poll reports only its own work
+            context.summary = BuildSummary()
+            if context.fingerprint:
+                manifest = context.prepare_assets()
+                if copy_fingerprinted_assets(context.static_dir, dest_dir, manifest):
+                    write_asset_manifest(dest_dir, manifest)
+            else:
+                exclude = ('.css',) if context.minify_css else ()
+                copy_directory_contents(context.static_dir, dest_dir, only_changed=True, exclude=exclude)
+            copy_stylesheets(dest_dir, context)
+            generate_pages_recursive(
+                context.content_dir, "template.html", dest_dir, basepath,
+                index_path=cache_path("content_index.json"),
+                context=context,
+            )
+            run_site_stages(basepath, dest_dir, context)
+            if context.summary.did_work():
+                context.summary.report()
+    except KeyboardInterrupt:
+        print("Stopped watching.")
+
+
+def parse_args(argv=None):
+    """Parse the command line options"""
+    parser = argparse.ArgumentParser(description="Static site generator")
+    parser.add_argument(
+        "basepath", nargs="?", default="/",
+        help='Base path for the site (default "/" for local development)',
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="Only rebuild pages whose inputs changed since the last build",
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="Keep running and rebuild affected pages when sources change",
+    )
+    parser.add_argument(
+        "--write-if-changed", action="store_true",
+        help="Leave output files untouched when their rendered contents are unchanged",
+    )
+    parser.add_argument(
+        "--gzip", action="store_true",
+        help="Write precompressed .gz siblings for HTML, CSS, JS, SVG and XML files",
+    )
+    parser.add_argument(
+        "--gzip-min-size", type=int, default=DEFAULT_MIN_SIZE,
+        help=f"Smallest file size in bytes that gets a .gz sibling (default {DEFAULT_MIN_SIZE})",
+    )
+    parser.add_argument(
+        "--minify", action="store_true",
+        help="Emit minified HTML (whitespace inside <pre>/<code> is preserved)",
+    )
+    parser.add_argument(
+        "--fingerprint", action="store_true",
+        help="Copy static assets to name.<hash>.ext and rewrite references to them",
+    )
+    parser.add_argument(
+        "--listing", action="append", default=[], metavar="SECTION",
+        help="Generate paginated index pages for a content section (e.g., blog); repeatable",
+    )
+    parser.add_argument(
+        "--per-page", type=int, default=DEFAULT_PER_PAGE,
+        help=f"Posts per listing page (default {DEFAULT_PER_PAGE})",
+    )
+    parser.add_argument(
+        "--feed", action="append", default=[], metavar="SECTION",
+        help="Write an Atom feed (SECTION/feed.xml) for a content section; repeatable",
+    )
+    parser.add_argument(
+        "--feed-entries", type=int, default=DEFAULT_FEED_ENTRIES,
+        help=f"Newest posts kept in each feed (default {DEFAULT_FEED_ENTRIES})",
+    )
+    parser.add_argument(
+        "--site-url", default="",
+        help="Scheme and host the site is served from (e.g., https://example.com), for absolute feed and sitemap URLs",
+    )
+    parser.add_argument(
+        "--sitemap", action="store_true",
+        help="Write sitemap.xml (split behind a sitemap index past 50,000 URLs or 50 MB); needs --site-url",
+    )
+    parser.add_argument(
+        "--search", action="store_true",
+        help="Build a client-side search index (search/pages.json plus shards by term prefix)",
+    )
+    parser.add_argument(
+        "--check-links", action="store_true",
+        help="Report internal links and images that point at no file of the built site",
+    )
+    parser.add_argument(
+        "--image-sizes", action="store_true",
+        help="Add width/height (read from PNG, JPEG, GIF and WebP headers) and lazy loading to images",
+    )
+    parser.add_argument(
+        "--minify-css", action="store_true",
+        help="Minify the stylesheets copied from static/",
+    )
+    parser.add_argument(
+        "--inline-css", action="store_true",
+        help="Inline minified stylesheets into the template, loading the full file asynchronously when capped",
+    )
+    parser.add_argument(
+        "--critical-css-bytes", type=int, default=DEFAULT_CRITICAL_CSS_BYTES,
+        help=f"Most stylesheet bytes inlined per stylesheet (default {DEFAULT_CRITICAL_CSS_BYTES})",
+    )
+    parser.add_argument(
+        "--service-worker", action="store_true",
+        help=f"Write {SERVICE_WORKER_NAME} and {PRECACHE_MANIFEST_NAME} (register {SERVICE_WORKER_NAME} from the template)",
+    )
+    parser.add_argument(
+        "--precache-max-file-bytes", type=int, default=DEFAULT_PRECACHE_MAX_FILE_BYTES,
+        help=f"Largest file precached by the service worker (default {DEFAULT_PRECACHE_MAX_FILE_BYTES})",
+    )
+    parser.add_argument(
+        "--precache-budget", type=int, default=DEFAULT_PRECACHE_BUDGET,
+        help=f"Most bytes precached in total (default {DEFAULT_PRECACHE_BUDGET})",
+    )
+    parser.add_argument(
+        "--prefetch", type=int, default=0, metavar="N",
+        help="Prefetch each page's N most linked-to internal targets (needs {{ Prefetch }} in the template's head)",
+    )
+    parser.add_argument(
+        "--heading-ids", action="store_true",
+        help="Give headings slugged ids and fill the {{ TOC }} slot with a table of contents",
+    )
+    parser.add_argument(
+        "--highlight", action="store_true",
+        help="Highlight fenced code blocks that name a language (python, shell, json, html, css)",
+    )
+    parser.add_argument(
+        "--tolerant", action="store_true",
+        help="Render malformed markup as text and report diagnostics at the end instead of stopping the build",
+    )
+    args = parser.parse_args(argv)
+    if args.sitemap and not args.site_url:
+        # Sitemap <loc> entries must be absolute URLs
+        parser.error("--sitemap requires --site-url")
+    return args
+
+
+def main(argv=None):
+    """Main function to run the static site generator"""
+    print("Starting static site generator...")
+    
+    # Get basepath from command line arguments, default to "/" for local development
+    args = parse_args(argv)
+    basepath = args.basepath
+    print(f"Using basepath: {basepath}")
+    
+    # Define destination directory
+    dest_dir = "docs" if basepath != "/" else "public"
+    
+    # An incremental build needs the previous output to build on
+    incremental = (args.incremental or args.watch) and os.path.isdir(dest_dir)
+    context = BuildContext(
+        incremental=incremental,
+        graph_path=cache_path("dependency_graph.json"),
+        write_if_changed=args.write_if_changed,
+        output_hashes_path=cache_path("output_hashes.json"),
+        gzip=args.gzip,
+        gzip_min_size=args.gzip_min_size,
+        gzip_records_path=cache_path("gzip_records.json"),
+        minify=args.minify,
+        fingerprint=args.fingerprint,
+        asset_records_path=cache_path("asset_hashes.json"),
+        template_cache_dir=cache_path("templates"),
+        metadata_path=cache_path("metadata_index.json"),
+        listing_sections=args.listing,
+        listing_per_page=args.per_page,
+        feed_sections=args.feed,
+        feed_entries=args.feed_entries,
+        site_url=args.site_url,
+        content_cache_dir=cache_path("rendered"),
+        sitemap=args.sitemap,
+        search=args.search,
+        search_index_path=cache_path("search_index.json"),
+        check_links=args.check_links,
+        image_sizes=args.image_sizes,
+        image_records_path=cache_path("image_sizes.json"),
+        minify_css=args.minify_css,
+        inline_css=args.inline_css,
+        critical_css_bytes=args.critical_css_bytes,
+        css_cache_dir=cache_path("css"),
+        service_worker=args.service_worker,
+        precache_max_file_bytes=args.precache_max_file_bytes,
+        precache_budget=args.precache_budget,
+        precache_records_path=cache_path("precache_records.json"),
+        prefetch_count=args.prefetch,
+        heading_ids=args.heading_ids,
+        highlight=args.highlight,
+        highlight_cache_dir=cache_path("highlight"),
+        tolerant=args.tolerant,
+    )
+    build_site(basepath, dest_dir, context)
     print("Site is ready!")
+    
+    if args.watch:
+        # Every rebuild after the first one only touches affected pages
+        context.incremental = True
+        watch(basepath, dest_dir, context)
+    elif context.summary.broken_links or context.summary.failed_pages:
+        return 1
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import os
+from front_matter import split_front_matter
+from markdown_to_html_node import parse_markdown
+
+
+class IncludedFragment:
+    """
+    A markdown fragment parsed once for the build.
+
+    Attributes:
+        path (str): Normalized path of the fragment
+        nodes (list): Top-level HTMLNodes of the fragment, shared by every includer
+        info (DocumentInfo): Facts collected while parsing the fragment
+    """
+
+    def __init__(self, path, nodes, info):
+        self.path = path
+        self.nodes = nodes
+        self.info = info
+
+
+class FragmentCache:
+    """
+    Parses the fragments named by {% include "path" %} directives, once per build.
+
+    Fragments may include other fragments; an include cycle raises ValueError.
+
+    Args:
+        heading_ids (bool): Give the fragments' headings ids (as for pages)
+        highlighter (Highlighter): Highlights the fragments' code blocks
+        page_index (PageIndex): Resolves the fragments' [[wiki links]]
+        tolerant (bool): Parse the fragments in tolerant mode
+    """
+
+    def __init__(self, heading_ids=False, highlighter=None, page_index=None, tolerant=False):
+        self.heading_ids = heading_ids
+        self.highlighter = highlighter
+        self.page_index = page_index
+        self.tolerant = tolerant
+        self.fragments = {}
+        # Fragments being parsed, outermost first
+        self._stack = []
+
+    def resolve(self, path):
+        """
+        Look up a fragment, parsing it on first use.
+
+        Args:
+            path (str): Path of the fragment
+
+        Returns:
+            IncludedFragment: The parsed fragment
+
+        Raises:
+            ValueError: If the fragment includes itself, directly or not
+        """
+        path = os.path.normpath(path)
+        if path in self._stack:
+            chain = " -> ".join(self._stack + [path])
+            raise ValueError(f"Markdown include cycle: {chain}")
+        fragment = self.fragments.get(path)
+        if fragment is None:
+            with open(path, 'r', encoding='utf-8') as f:
+                source = f.read()
+            _, markdown = split_front_matter(source)
+            self._stack.append(path)
+            try:
+                node, info = parse_markdown(
+                    markdown, self.heading_ids, self.highlighter, self, path, self.page_index,
+                    tolerant=self.tolerant,
+                    first_line=source.count('\n') - markdown.count('\n') + 1,
+                )
+            finally:
+                self._stack.pop()
+            fragment = IncludedFragment(path, node.children, info)
+            self.fragments[path] = fragment
+        return fragment
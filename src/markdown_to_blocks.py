@@ -1,21 +1,40 @@
-def markdown_to_blocks(markdown):
+import re
+
+# A block holding only {% include "path" %} (the template engine's include syntax)
+INCLUDE_DIRECTIVE = re.compile(r'\{%\s*include\s+"([^"]+)"\s*%\}|\{%\s*include\s+\'([^\']+)\'\s*%\}')
+
+
+def markdown_to_blocks(markdown, resolve_include=None, lines=None):
     """
     Split markdown text into blocks separated by blank lines.
     
     Args:
         markdown (str): Raw markdown text representing a full document
+        resolve_include (callable): Path -> parsed fragment; when given, each
+            {% include "path" %} block is replaced by the fragment it returns
+        lines (list): When given, the 1-based line each block starts on is appended
         
     Returns:
         list: List of block strings with leading/trailing whitespace stripped
+            (and fragments in place of include directives)
     """
     # Split by double newlines to separate blocks
     blocks = markdown.split("\n\n")
     
     # Strip whitespace from each block and filter out empty blocks
     cleaned_blocks = []
+    line = 1
     for block in blocks:
         stripped_block = block.strip()
+        if stripped_block and lines is not None:
+            lines.append(line + block[:len(block) - len(block.lstrip())].count('\n'))
+        line += block.count('\n') + 2
         if stripped_block:  # Only add non-empty blocks
+            if resolve_include is not None:
+                match = INCLUDE_DIRECTIVE.fullmatch(stripped_block)
+                if match:
+                    cleaned_blocks.append(resolve_include(match.group(1) or match.group(2)))
+                    continue
             cleaned_blocks.append(stripped_block)
     
     return cleaned_blocks
@@ -1,3 +1,4 @@
+import os
 from markdown_to_blocks import markdown_to_blocks
 from block_to_block_type import block_to_block_type
 from block_type import BlockType
@@ -5,34 +6,71 @@ from text_to_textnodes import text_to_textnodes
 from text_node_to_html_node import text_node_to_html_node
 from parentnode import ParentNode
 from leafnode import LeafNode
+from document_info import DocumentInfo
+from textnode import TextType
+from extract_markdown import extract_link_definitions
 
 
-def text_to_children(text):
+def text_to_children(text, info=None):
     """
     Convert text with inline markdown to a list of HTMLNodes.
     
     Args:
         text (str): Text that may contain inline markdown
+        info (DocumentInfo): Collects links, images and word counts when given
         
     Returns:
         list: List of HTMLNode objects representing the inline markdown
     """
-    text_nodes = text_to_textnodes(text)
+    return text_nodes_to_children(inline_text_nodes(text, info), info)
+
+
+def inline_text_nodes(text, info=None):
+    """
+    Parse inline markdown, resolving references and wiki links through the document.
+    
+    Args:
+        text (str): Text that may contain inline markdown
+        info (DocumentInfo): Supplies link definitions and the page index when given
+        
+    Returns:
+        list: List of TextNode objects
+    """
+    if info is None:
+        return text_to_textnodes(text)
+    resolve_wiki = info.resolve_wiki_link if info.page_index is not None else None
+    return text_to_textnodes(text, info.definitions, resolve_wiki, info.problems)
+
+
+def text_nodes_to_children(text_nodes, info=None):
+    """
+    Convert parsed inline TextNodes to a list of HTMLNodes.
+    
+    Args:
+        text_nodes (list): TextNodes from text_to_textnodes
+        info (DocumentInfo): Collects links, images and word counts when given
+        
+    Returns:
+        list: List of HTMLNode objects
+    """
     html_nodes = []
     
     for text_node in text_nodes:
+        if info is not None:
+            info.add_text_node(text_node)
         html_node = text_node_to_html_node(text_node)
         html_nodes.append(html_node)
     
     return html_nodes
 
 
-def paragraph_to_html_node(block):
+def paragraph_to_html_node(block, info=None):
     """
     Convert a paragraph block to an HTMLNode.
     
     Args:
         block (str): The paragraph text
+        info (DocumentInfo): Collects document facts when given
         
     Returns:
         ParentNode: A <p> tag containing the paragraph content
@@ -40,16 +78,17 @@ def paragraph_to_html_node(block):
     # Convert newlines to spaces for paragraphs
     normalized_block = block.replace('\n', ' ')
     
-    children = text_to_children(normalized_block)
+    children = text_to_children(normalized_block, info)
     return ParentNode(tag="p", children=children)
 
 
-def heading_to_html_node(block):
+def heading_to_html_node(block, info=None):
     """
     Convert a heading block to an HTMLNode.
     
     Args:
         block (str): The heading text (e.g., "# Heading")
+        info (DocumentInfo): Collects document facts when given
         
     Returns:
         ParentNode: An <h1> to <h6> tag containing the heading content
@@ -68,18 +107,32 @@ def heading_to_html_node(block):
     # Create the appropriate heading tag
     tag = f"h{hash_count}"
     
+    # Record the heading (the first h1 is the document title)
+    if info is not None:
+        info.add_heading(hash_count, heading_text.strip())
+    
     # Convert inline markdown in the heading
-    children = text_to_children(heading_text)
+    text_nodes = inline_text_nodes(heading_text, info)
+    children = text_nodes_to_children(text_nodes, info)
+    
+    # Give the heading an id from its plain text while the node is built
+    props = None
+    if info is not None and info.heading_ids:
+        plain_text = "".join(
+            node.text for node in text_nodes if node.text_type != TextType.IMAGE
+        ).strip()
+        props = {"id": info.heading_id(hash_count, plain_text)}
     
-    return ParentNode(tag=tag, children=children)
+    return ParentNode(tag=tag, children=children, props=props)
 
 
-def code_to_html_node(block):
+def code_to_html_node(block, info=None):
     """
     Convert a code block to an HTMLNode.
     
     Args:
         block (str): The code block text (with ``` delimiters)
+        info (DocumentInfo): Supplies the highlighter when given
         
     Returns:
         ParentNode: A <pre><code> structure containing the code
@@ -87,21 +140,37 @@ def code_to_html_node(block):
     # Remove the opening and closing ``` delimiters
     code_content = block[3:-3]
     
+    # The rest of the opening line is the info string (e.g., ```python)
+    language = None
+    first_line, newline, rest = code_content.partition('\n')
+    if newline and first_line.strip():
+        language = first_line.split()[0]
+        code_content = rest
+    
     # Strip leading whitespace but preserve internal structure
     code_content = code_content.lstrip()
     
+    props = {"class": f"language-{language}"} if language else None
+    
+    # Highlighted code is escaped token by token; unknown languages stay plain
+    if language and info is not None and info.highlighter is not None:
+        highlighted = info.highlighter.highlight(code_content, language)
+        if highlighted is not None:
+            code_content = highlighted
+    
     # For code blocks, don't parse inline markdown - treat as plain text
-    code_node = LeafNode(tag="code", value=code_content)
+    code_node = LeafNode(tag="code", value=code_content, props=props)
     
     return ParentNode(tag="pre", children=[code_node])
 
 
-def quote_to_html_node(block):
+def quote_to_html_node(block, info=None):
     """
     Convert a quote block to an HTMLNode.
     
     Args:
         block (str): The quote text (with > prefixes)
+        info (DocumentInfo): Collects document facts when given
         
     Returns:
         ParentNode: A <blockquote> tag containing the quote content
@@ -118,17 +187,18 @@ def quote_to_html_node(block):
     quote_text = '\n'.join(quote_lines)
     
     # Convert inline markdown in the quote
-    children = text_to_children(quote_text)
+    children = text_to_children(quote_text, info)
     
     return ParentNode(tag="blockquote", children=children)
 
 
-def unordered_list_to_html_node(block):
+def unordered_list_to_html_node(block, info=None):
     """
     Convert an unordered list block to an HTMLNode.
     
     Args:
         block (str): The list text (with - prefixes)
+        info (DocumentInfo): Collects document facts when given
         
     Returns:
         ParentNode: A <ul> tag containing <li> items
@@ -140,19 +210,20 @@ def unordered_list_to_html_node(block):
         if line.startswith('- '):
             # Remove the - prefix and convert inline markdown
             item_text = line[2:]
-            item_children = text_to_children(item_text)
+            item_children = text_to_children(item_text, info)
             list_item = ParentNode(tag="li", children=item_children)
             list_items.append(list_item)
     
     return ParentNode(tag="ul", children=list_items)
 
 
-def ordered_list_to_html_node(block):
+def ordered_list_to_html_node(block, info=None):
     """
     Convert an ordered list block to an HTMLNode.
     
     Args:
         block (str): The list text (with 1. 2. prefixes)
+        info (DocumentInfo): Collects document facts when given
         
     Returns:
         ParentNode: An <ol> tag containing <li> items
@@ -166,19 +237,20 @@ def ordered_list_to_html_node(block):
         if period_index != -1:
             # Remove the number, period, and space prefix
             item_text = line[period_index + 2:]
-            item_children = text_to_children(item_text)
+            item_children = text_to_children(item_text, info)
             list_item = ParentNode(tag="li", children=item_children)
             list_items.append(list_item)
     
     return ParentNode(tag="ol", children=list_items)
 
 
-def block_to_html_node(block):
+def block_to_html_node(block, info=None):
     """
     Convert a single block to an HTMLNode based on its type.
     
     Args:
         block (str): A single markdown block
+        info (DocumentInfo): Collects document facts when given
         
     Returns:
         HTMLNode: The appropriate HTML node for the block type
@@ -186,39 +258,115 @@ def block_to_html_node(block):
     block_type = block_to_block_type(block)
     
     if block_type == BlockType.PARAGRAPH:
-        return paragraph_to_html_node(block)
+        return paragraph_to_html_node(block, info)
     elif block_type == BlockType.HEADING:
-        return heading_to_html_node(block)
+        return heading_to_html_node(block, info)
     elif block_type == BlockType.CODE:
-        return code_to_html_node(block)
+        return code_to_html_node(block, info)
     elif block_type == BlockType.QUOTE:
-        return quote_to_html_node(block)
+        return quote_to_html_node(block, info)
     elif block_type == BlockType.UNORDERED_LIST:
-        return unordered_list_to_html_node(block)
+        return unordered_list_to_html_node(block, info)
     elif block_type == BlockType.ORDERED_LIST:
-        return ordered_list_to_html_node(block)
+        return ordered_list_to_html_node(block, info)
     else:
         raise ValueError(f"Unsupported block type: {block_type}")
 
 
-def markdown_to_html_node(markdown):
+def _locate(block, text, index):
+    # Offset in the block of text[index]; paragraphs only turned newlines into spaces,
+    # while quotes and lists lost their markers, so fall back to the nearby characters
+    flat_block = block.replace('\n', ' ')
+    start = flat_block.find(text.replace('\n', ' '))
+    if start != -1:
+        return start + index
+    snippet = text[index:].split('\n', 1)[0][:20]
+    return max(flat_block.find(snippet), 0)
+
+
+def parse_markdown(
+    markdown, heading_ids=False, highlighter=None, includes=None, path=None, page_index=None,
+    tolerant=False, first_line=1,
+):
     """
-    Convert a full markdown document into a single parent HTMLNode.
+    Parse a full markdown document into an HTMLNode tree and its document facts.
+    
+    The title, headings, links, images and word count are collected during the one
+    parse, so nothing needs to rescan the source afterwards.
     
     Args:
         markdown (str): Raw markdown text representing a full document
+        heading_ids (bool): Give headings slugged, de-duplicated ids (and collect a TOC)
+        highlighter (Highlighter): Highlights code blocks that name a language
+        includes (FragmentCache): Resolves {% include %} directives (None leaves them as text)
+        path (str): Path of the markdown file, which include paths are relative to
+        page_index (PageIndex): Resolves [[wiki links]] (None leaves them as text)
+        tolerant (bool): Render unmatched delimiters as text, recording diagnostics in
+            the DocumentInfo, instead of raising ValueError
+        first_line (int): Line of the file the markdown starts on (after front matter)
         
     Returns:
-        ParentNode: A <div> tag containing all the converted blocks
+        tuple: (ParentNode, DocumentInfo)
     """
-    # Split the markdown into blocks
-    blocks = markdown_to_blocks(markdown)
+    info = DocumentInfo(heading_ids, highlighter, page_index, tolerant)
+    
+    # One pre-scan collects the reference link definitions, so references resolve by lookup
+    # (definition lines are removed, so a tolerant parse maps lines back to the source)
+    line_map = [] if tolerant else None
+    markdown, info.definitions = extract_link_definitions(markdown, line_map)
+    
+    # Split the markdown into blocks, with included fragments already parsed
+    resolve_include = None
+    if includes is not None:
+        base_dir = os.path.dirname(path) if path else ""
+        
+        def resolve_include(target):
+            return includes.resolve(os.path.join(base_dir, target))
+    block_lines = [] if tolerant else None
+    blocks = markdown_to_blocks(markdown, resolve_include, block_lines)
     
     # Convert each block to an HTML node
     html_nodes = []
-    for block in blocks:
-        html_node = block_to_html_node(block)
+    for i, block in enumerate(blocks):
+        if not isinstance(block, str):
+            # An included fragment's nodes are shared by every page that includes it,
+            # so headings whose ids are taken on this page are copied, not re-id'd
+            renamed = info.add_fragment(block)
+            for node in block.nodes:
+                anchor = node.props.get("id") if node.props else None
+                if anchor in renamed:
+                    node = ParentNode(tag=node.tag, children=node.children, props=dict(node.props, id=renamed[anchor]))
+                html_nodes.append(node)
+            continue
+        info.add_block(block)
+        html_node = block_to_html_node(block, info)
         html_nodes.append(html_node)
+        
+        # Place what the inline parser worked around at its line and column
+        if info.problems:
+            for text, index, message in info.problems:
+                offset = _locate(block, text, index)
+                line = block_lines[i] + block.count('\n', 0, offset)
+                if line_map:
+                    line = line_map[line - 1] + 1
+                line += first_line - 1
+                column = offset - (block.rfind('\n', 0, offset) + 1) + 1
+                info.diagnostics.append((path, line, column, message))
+            info.problems.clear()
     
     # Create a parent div containing all the blocks
-    return ParentNode(tag="div", children=html_nodes)
+    return ParentNode(tag="div", children=html_nodes), info
+
+
+def markdown_to_html_node(markdown):
+    """
+    Convert a full markdown document into a single parent HTMLNode.
+    
+    Args:
+        markdown (str): Raw markdown text representing a full document
+        
+    Returns:
+        ParentNode: A <div> tag containing all the converted blocks
+    """
+    html_node, _ = parse_markdown(markdown)
+    return html_node
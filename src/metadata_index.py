@@ -0,0 +1,89 @@
+import os
+from build_cache import load_cache, save_cache
+
+# Bump whenever the layout of the persisted index changes
+METADATA_INDEX_VERSION = 1
+
+
+def page_url(rel_path):
+    """
+    Compute the site-absolute URL of a page from its path in the content directory.
+
+    Args:
+        rel_path (str): Markdown path relative to the content directory
+
+    Returns:
+        str: URL such as "/", "/blog/tom" or "/notes.html"
+    """
+    rel_path = rel_path.replace(os.sep, '/')
+    if rel_path == "index.md":
+        return "/"
+    if rel_path.endswith("/index.md"):
+        return "/" + rel_path[:-len("/index.md")]
+    return "/" + rel_path[:-3] + ".html"
+
+
+class MetadataIndex:
+    """
+    Site-wide index of page metadata, filled while each page is generated.
+
+    Listing pages, feeds and sitemaps read records from here instead of opening or
+    re-parsing the source documents. The index is persisted so incremental builds
+    keep the records of pages they did not re-render.
+    """
+
+    def __init__(self):
+        # source path -> metadata record
+        self.records = {}
+
+    def update(self, source, record):
+        """
+        Store the metadata of a page.
+
+        Args:
+            source (str): Source path of the page
+            record (dict): JSON-serializable metadata (front matter plus derived fields)
+        """
+        self.records[source] = record
+
+    def remove(self, source):
+        self.records.pop(source, None)
+
+    def get(self, source):
+        return self.records.get(source)
+
+    def pages(self, section=None):
+        """
+        List page records, optionally limited to a section of the site.
+
+        Args:
+            section (str): URL prefix such as "/blog" (None lists every page)
+
+        Returns:
+            list: Metadata records sorted by URL
+        """
+        records = self.records.values()
+        if section is not None:
+            prefix = section.rstrip('/') + '/'
+            records = [record for record in records if record["url"].startswith(prefix)]
+        return sorted(records, key=lambda record: record["url"])
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a persisted index, returning an empty one if none exists.
+
+        Args:
+            path (str): Path to the index cache file
+
+        Returns:
+            MetadataIndex: The loaded index
+        """
+        index = cls()
+        data = load_cache(path)
+        if data and data.get("version") == METADATA_INDEX_VERSION:
+            index.records = data.get("records", {})
+        return index
+
+    def save(self, path):
+        save_cache(path, {"version": METADATA_INDEX_VERSION, "records": self.records})
@@ -0,0 +1,132 @@
+import hashlib
+import os
+import re
+
+# Strings and comments are matched first so their contents are never rewritten
+_CSS_TOKEN = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.DOTALL)
+_WHITESPACE_RUN = re.compile(r'[ \t\n\r\f]+')
+# Spaces next to these are never significant (unlike + and -, which calc() needs)
+_AROUND_PUNCTUATION = re.compile(r' ?([{};,>]) ?')
+_AFTER_COLON = re.compile(r': ')
+_LAST_SEMICOLON = re.compile(r';}')
+
+# Bytes of stylesheet inlined into the template by default (fits the first round trip)
+DEFAULT_CRITICAL_CSS_BYTES = 14 * 1024
+
+
+def _minify_code(code):
+    code = _WHITESPACE_RUN.sub(' ', code)
+    code = _AROUND_PUNCTUATION.sub(r'\1', code)
+    code = _AFTER_COLON.sub(':', code)
+    return _LAST_SEMICOLON.sub('}', code)
+
+
+def minify_css(css):
+    """
+    Minify a stylesheet: drop comments and redundant whitespace and semicolons.
+
+    Args:
+        css (str): Stylesheet source
+
+    Returns:
+        str: The minified stylesheet
+    """
+    result = []
+    position = 0
+    for match in _CSS_TOKEN.finditer(css):
+        result.append(_minify_code(css[position:match.start()]))
+        if match.group(1):
+            result.append(match.group(1))
+        position = match.end()
+    result.append(_minify_code(css[position:]))
+    return ''.join(result).strip()
+
+
+def split_rules(css):
+    """
+    Split minified CSS into its top-level rules (an @media block is one rule).
+
+    Args:
+        css (str): Minified stylesheet
+
+    Returns:
+        list: Rule texts, in order
+    """
+    rules = []
+    depth = 0
+    start = 0
+    quote = None
+    for i, char in enumerate(css):
+        if quote:
+            if char == quote and css[i - 1] != '\\':
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                rules.append(css[start:i + 1])
+                start = i + 1
+        elif char == ';' and depth == 0:
+            # Statements such as @import or @charset
+            rules.append(css[start:i + 1])
+            start = i + 1
+    if css[start:].strip():
+        rules.append(css[start:])
+    return rules
+
+
+def critical_css(css, max_bytes=DEFAULT_CRITICAL_CSS_BYTES):
+    """
+    Take the leading whole rules of a stylesheet that fit within a size cap.
+
+    Args:
+        css (str): Minified stylesheet
+        max_bytes (int): Largest size of the inlined portion in bytes
+
+    Returns:
+        tuple: (critical portion, whether it is the complete stylesheet)
+    """
+    if len(css.encode('utf-8')) <= max_bytes:
+        return css, True
+    kept = []
+    size = 0
+    for rule in split_rules(css):
+        rule_size = len(rule.encode('utf-8'))
+        if size + rule_size > max_bytes:
+            break
+        kept.append(rule)
+        size += rule_size
+    return ''.join(kept), False
+
+
+def cached_minify_css(css, cache_dir=None):
+    """
+    Minify a stylesheet, reusing the result stored under its content hash.
+
+    Args:
+        css (str): Stylesheet source
+        cache_dir (str): Directory of minified stylesheets (None disables the cache)
+
+    Returns:
+        str: The minified stylesheet
+    """
+    if not cache_dir:
+        return minify_css(css)
+    digest = hashlib.sha256(css.encode('utf-8')).hexdigest()
+    cache_file = os.path.join(cache_dir, digest + ".css")
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return f.read()
+    except OSError:
+        pass
+
+    minified = minify_css(css)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_file = cache_file + ".tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        f.write(minified)
+    os.replace(tmp_file, cache_file)
+    return minified
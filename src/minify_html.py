@@ -0,0 +1,73 @@
+import re
+
+# Elements whose contents must be emitted byte-for-byte
+PRESERVE_WHITESPACE_TAGS = frozenset(("pre", "code", "textarea", "script", "style"))
+
+# HTML whitespace only: a no-break space (which \s would match) is significant
+_WHITESPACE_RUN = re.compile(r'[ \t\n\r\f]+')
+# Only indentation (whitespace spanning a line break) between tags is dropped
+_BETWEEN_TAGS = re.compile(r'>[ \t\r\f]*\n[ \t\n\r\f]*<')
+_TRAILING_INDENT = re.compile(r'>[ \t\r\f]*\n[ \t\n\r\f]*$')
+_LEADING_INDENT = re.compile(r'^[ \t\r\f]*\n[ \t\n\r\f]*<')
+_COMMENT = re.compile(r'<!--(?!\[).*?-->', re.DOTALL)
+_PRESERVED_BLOCK = re.compile(
+    r'(<(pre|textarea|script|style)\b.*?</\2\s*>)', re.DOTALL | re.IGNORECASE
+)
+
+
+class Minifier:
+    """
+    Collapses whitespace in text as it is serialized, counting the bytes it saves.
+
+    One Minifier is passed down through HTMLNode.to_html for a page; elements in
+    PRESERVE_WHITESPACE_TAGS render their subtree without it.
+    """
+
+    def __init__(self):
+        self.saved = 0
+
+    def text(self, value):
+        """
+        Collapse every run of whitespace in a text leaf to a single space.
+
+        Args:
+            value (str): Text content of a leaf node
+
+        Returns:
+            str: The minified text
+        """
+        minified = _WHITESPACE_RUN.sub(' ', value)
+        # Only ASCII whitespace is removed, so characters saved equal bytes saved
+        self.saved += len(value) - len(minified)
+        return minified
+
+
+def minify_template(template):
+    """
+    Minify template markup once, before any page is rendered into it.
+
+    Removes comments and line-break indentation between tags, and collapses other
+    whitespace runs, leaving <pre>, <textarea>, <script> and <style> blocks untouched.
+
+    Args:
+        template (str): Template HTML
+
+    Returns:
+        str: The minified template
+    """
+    parts = _PRESERVED_BLOCK.split(template)
+    result = []
+    # split() yields text, block, tag name, text, block, tag name, ...
+    for i in range(0, len(parts), 3):
+        chunk = _COMMENT.sub('', parts[i])
+        chunk = _BETWEEN_TAGS.sub('><', chunk)
+        # Indentation next to a preserved block sits at the edge of the chunk
+        if i + 1 < len(parts):
+            chunk = _TRAILING_INDENT.sub('>', chunk)
+        if i > 0:
+            chunk = _LEADING_INDENT.sub('<', chunk)
+        chunk = _WHITESPACE_RUN.sub(' ', chunk)
+        result.append(chunk)
+        if i + 1 < len(parts):
+            result.append(parts[i + 1])
+    return ''.join(result).strip()
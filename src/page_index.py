@@ -0,0 +1,114 @@
+from slugify import slugify
+from metadata_index import page_url
+
+
+def _path_key(text):
+    # "Blog/Majesty/" and "blog/majesty" name the same page
+    segments = [segment for segment in text.replace('\\', '/').split('/') if segment]
+    return '/'.join(slugify(segment) for segment in segments)
+
+
+def name_key(target):
+    """
+    Key a wiki link target by the page name it looks up ("Blog/Tom#intro" -> "blog/tom").
+
+    Args:
+        target (str): Link target as written
+
+    Returns:
+        str: The key, shared by every spelling of the same name
+    """
+    return _path_key(target.partition('#')[0].strip())
+
+
+class PageIndex:
+    """
+    Site-wide map from the names authors use in [[wiki links]] to page URLs.
+
+    Every page is known by its path ("blog/majesty"), and by its last path segment
+    ("majesty") and title ("Why Glorfindel Is More Impressive") when those are
+    unique on the site. Names are compared as slugs, so case and punctuation do not
+    matter, and every lookup is a dict access.
+    """
+
+    def __init__(self):
+        # path key -> (url, rel_path)
+        self.paths = {}
+        # short name key -> (url, rel_path), or None when several pages share the name
+        self.names = {}
+
+    def add(self, rel_path, title=None):
+        """
+        Add a page to the index.
+
+        Args:
+            rel_path (str): Markdown path relative to the content directory
+            title (str): Page title, if known
+        """
+        url = page_url(rel_path)
+        entry = (url, rel_path)
+        path = rel_path.replace('\\', '/')[:-3]
+        if path == "index" or path.endswith("/index"):
+            path = path[:-len("index")]
+        key = _path_key(path) or "index"
+        self.paths[key] = entry
+
+        names = {key.rsplit('/', 1)[-1]}
+        if title:
+            names.add(slugify(title))
+        for name in names:
+            if name in self.names and self.names[name] != entry:
+                self.names[name] = None
+            else:
+                self.names[name] = entry
+
+    def resolve(self, target):
+        """
+        Look up the page a wiki link names.
+
+        Args:
+            target (str): Link target as written, e.g. "tom", "blog/majesty#intro"
+
+        Returns:
+            tuple: (url, rel_path) of the page (url keeps any #fragment), or None if
+                no page or more than one page has the name
+        """
+        _, hash_sign, fragment = target.partition('#')
+        entry = self.entry(name_key(target))
+        if entry is None:
+            return None
+        url, rel_path = entry
+        if hash_sign:
+            url = f"{url}#{slugify(fragment)}"
+        return url, rel_path
+
+    def entry(self, key):
+        """
+        Look up a page by name key (see name_key).
+
+        Args:
+            key (str): Name key of a wiki link target
+
+        Returns:
+            tuple: (url, rel_path) of the page, or None if no page or more than one
+                page has the name
+        """
+        return self.paths.get(key) or self.names.get(key)
+
+    @classmethod
+    def build(cls, rel_paths, titles=None):
+        """
+        Index the pages found by the content scan.
+
+        Args:
+            rel_paths (iterable): Markdown paths relative to the content directory
+            titles (dict): rel_path -> title of the pages whose titles are known
+
+        Returns:
+            PageIndex: The index
+        """
+        titles = titles or {}
+        index = cls()
+        for rel_path in sorted(rel_paths):
+            index.add(rel_path, titles.get(rel_path))
+        return index
@@ -1,11 +1,12 @@
 from htmlnode import HTMLNode
+from minify_html import PRESERVE_WHITESPACE_TAGS
 
 
 class ParentNode(HTMLNode):
     def __init__(self, tag, children, props=None):
         super().__init__(tag=tag, value=None, children=children, props=props)
 
-    def to_html(self):
+    def to_html(self, minifier=None):
         if self.tag is None:
             raise ValueError("ParentNode must have a tag")
         
@@ -15,9 +16,11 @@ class ParentNode(HTMLNode):
         # Get attributes string
         attrs = self.props_to_html()
         
+        # Whitespace inside <pre>/<code> is significant, so render it untouched
+        if minifier is not None and self.tag in PRESERVE_WHITESPACE_TAGS:
+            minifier = None
+        
         # Recursively render all children
-        children_html = ""
-        for child in self.children:
-            children_html += child.to_html()
+        children_html = "".join(child.to_html(minifier) for child in self.children)
         
         return f"<{self.tag}{attrs}>{children_html}</{self.tag}>"
@@ -0,0 +1,268 @@
+import base64
+import bisect
+import json
+import os
+import re
+from build_cache import load_cache, save_cache
+
+# Bump whenever the layout of the persisted index or the shard format changes
+SEARCH_INDEX_VERSION = 1
+
+# Characters of a term that pick its shard; the browser fetches search/<prefix>.json
+SHARD_PREFIX_LENGTH = 2
+
+# Directory of the search files inside the built site
+SEARCH_DIR = "search"
+
+# Page id -> [url, title] lookup written next to the shards
+PAGES_NAME = "pages.json"
+
+_WORD = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """
+    Split text into lowercase search terms.
+
+    Args:
+        text (str): Prose from a text leaf
+
+    Returns:
+        list: Terms in the order they appear
+    """
+    return _WORD.findall(text.lower())
+
+
+def shard_key(term):
+    """
+    Name the shard a term is stored in.
+
+    Args:
+        term (str): A search term
+
+    Returns:
+        str: The term's first SHARD_PREFIX_LENGTH characters
+    """
+    return term[:SHARD_PREFIX_LENGTH]
+
+
+def encode_postings(ids):
+    """
+    Encode a sorted list of page ids as base64 of delta-encoded varints.
+
+    Each id is stored as the gap from the previous one, 7 bits per byte with the
+    high bit marking that more bytes follow, so dense postings take one byte per page.
+
+    Args:
+        ids (list): Page ids in ascending order
+
+    Returns:
+        str: The encoded postings
+    """
+    out = bytearray()
+    previous = 0
+    for page_id in ids:
+        gap = page_id - previous
+        previous = page_id
+        while gap >= 0x80:
+            out.append((gap & 0x7f) | 0x80)
+            gap >>= 7
+        out.append(gap)
+    return base64.b64encode(bytes(out)).decode('ascii')
+
+
+def decode_postings(data):
+    """
+    Decode postings written by encode_postings.
+
+    Args:
+        data (str): The encoded postings
+
+    Returns:
+        list: Page ids in ascending order
+    """
+    ids = []
+    previous = 0
+    value = 0
+    shift = 0
+    for byte in base64.b64decode(data):
+        value |= (byte & 0x7f) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        previous += value
+        ids.append(previous)
+        value = 0
+        shift = 0
+    return ids
+
+
+class SearchIndex:
+    """
+    Inverted index of page text, sharded by term prefix for client-side search.
+
+    Pages are added as they are rendered; only the shards holding terms a page gained
+    or lost are rewritten, so one edited page does not rebuild the whole index. The
+    built site gets search/pages.json (id -> [url, title]) and one search/<prefix>.json
+    per shard mapping each term to its encoded postings (see encode_postings).
+    """
+
+    def __init__(self):
+        # source path -> {"id", "url", "title", "terms"}
+        self.pages = {}
+        # shard key -> term -> sorted page ids
+        self.shards = {}
+        self.next_id = 0
+        # Shards (and whether pages.json) changed since the last write
+        self.dirty = set()
+        self.pages_dirty = False
+        # A fresh index replaces whatever a previous build left in the site
+        self.fresh = True
+        # Base path pages.json was last written with
+        self.basepath = None
+
+    def _postings(self, term):
+        return self.shards.setdefault(shard_key(term), {}).setdefault(term, [])
+
+    def _drop_terms(self, page_id, terms):
+        for term in terms:
+            key = shard_key(term)
+            shard = self.shards.get(key, {})
+            postings = shard.get(term)
+            if postings is None:
+                continue
+            index = bisect.bisect_left(postings, page_id)
+            if index < len(postings) and postings[index] == page_id:
+                del postings[index]
+            if not postings:
+                del shard[term]
+            self.dirty.add(key)
+
+    def update(self, source, url, title, terms):
+        """
+        Index (or re-index) a page.
+
+        Args:
+            source (str): Source path of the page
+            url (str): Site-absolute URL of the page
+            title (str): Page title shown in results
+            terms (iterable): Search terms found in the page's text
+        """
+        terms = set(terms)
+        entry = self.pages.get(source)
+        if entry is None:
+            entry = {"id": self.next_id, "url": url, "title": title, "terms": []}
+            self.next_id += 1
+            self.pages[source] = entry
+            self.pages_dirty = True
+        elif entry["url"] != url or entry["title"] != title:
+            entry["url"] = url
+            entry["title"] = title
+            self.pages_dirty = True
+
+        old_terms = set(entry["terms"])
+        self._drop_terms(entry["id"], old_terms - terms)
+        for term in terms - old_terms:
+            bisect.insort(self._postings(term), entry["id"])
+            self.dirty.add(shard_key(term))
+        entry["terms"] = sorted(terms)
+
+    def remove(self, source):
+        """
+        Drop a page whose source was deleted (or that failed to generate).
+
+        Args:
+            source (str): Source path of the page
+        """
+        entry = self.pages.pop(source, None)
+        if entry is not None:
+            self._drop_terms(entry["id"], entry["terms"])
+            self.pages_dirty = True
+
+    def write(self, dest_dir_path, basepath="/"):
+        """
+        Write pages.json and every shard that changed since the last write.
+
+        Args:
+            dest_dir_path (str): Directory of the built site
+            basepath (str): Base path prefixed to result URLs
+
+        Returns:
+            int: Number of shard files written or removed
+        """
+        search_dir = os.path.join(dest_dir_path, SEARCH_DIR)
+        os.makedirs(search_dir, exist_ok=True)
+        pages_path = os.path.join(search_dir, PAGES_NAME)
+
+        if self.fresh:
+            # Shards left by an earlier build may hold terms this index never saw
+            for name in os.listdir(search_dir):
+                key = name[:-len(".json")]
+                if name.endswith(".json") and name != PAGES_NAME and key not in self.shards:
+                    self.dirty.add(key)
+
+        if self.pages_dirty or self.fresh or basepath != self.basepath or not os.path.exists(pages_path):
+            pages = {
+                entry["id"]: [basepath.rstrip('/') + entry["url"], entry["title"]]
+                for entry in self.pages.values()
+            }
+            _write_json(pages_path, pages)
+
+        for key in self.dirty:
+            path = os.path.join(search_dir, key + ".json")
+            shard = self.shards.get(key)
+            if shard:
+                _write_json(path, {term: encode_postings(ids) for term, ids in sorted(shard.items())})
+            else:
+                self.shards.pop(key, None)
+                if os.path.exists(path):
+                    os.remove(path)
+
+        changed = len(self.dirty)
+        self.dirty.clear()
+        self.pages_dirty = False
+        self.fresh = False
+        self.basepath = basepath
+        return changed
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a persisted index, returning an empty one if none exists.
+
+        Args:
+            path (str): Path to the index cache file
+
+        Returns:
+            SearchIndex: The loaded index
+        """
+        index = cls()
+        data = load_cache(path)
+        if data and data.get("version") == SEARCH_INDEX_VERSION:
+            index.pages = data["pages"]
+            index.next_id = data["next_id"]
+            index.basepath = data.get("basepath")
+            for entry in index.pages.values():
+                for term in entry["terms"]:
+                    index._postings(term).append(entry["id"])
+            for shard in index.shards.values():
+                for postings in shard.values():
+                    postings.sort()
+            index.fresh = False
+        return index
+
+    def save(self, path):
+        # Postings are derived from the page term lists, so only the pages are persisted
+        save_cache(path, {
+            "version": SEARCH_INDEX_VERSION,
+            "next_id": self.next_id,
+            "basepath": self.basepath,
+            "pages": self.pages,
+        })
+
+
+def _write_json(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+    os.replace(tmp_path, path)
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+
+PRECACHE_MANIFEST_NAME = "precache-manifest.json"
+SERVICE_WORKER_NAME = "sw.js"
+
+# Files larger than this are fetched on demand instead of precached
+DEFAULT_PRECACHE_MAX_FILE_BYTES = 2 * 1024 * 1024
+# Total bytes a first visit may download for the precache
+DEFAULT_PRECACHE_BUDGET = 10 * 1024 * 1024
+
+# Only pages and the assets that render them are precached; build metadata (search
+# shards, sitemaps, feeds, manifests) and precompressed siblings are fetched on demand
+_SKIPPED_NAMES = frozenset((SERVICE_WORKER_NAME,))
+
+# Extension -> priority: pages first, then what renders them, then images and fonts
+_PRECACHED = {
+    '.html': 0,
+    '.css': 1, '.js': 1,
+    '.png': 2, '.jpg': 2, '.jpeg': 2, '.gif': 2, '.webp': 2, '.avif': 2, '.svg': 2, '.ico': 2,
+    '.woff': 2, '.woff2': 2, '.ttf': 2, '.otf': 2,
+}
+
+_SERVICE_WORKER = """// Generated by the site build; do not edit
+const CACHE = "precache-%(version)s";
+const PRECACHE = %(urls)s;
+
+self.addEventListener("install", (event) => {
+  event.waitUntil(caches.open(CACHE).then((cache) => cache.addAll(PRECACHE)).then(() => self.skipWaiting()));
+});
+
+self.addEventListener("activate", (event) => {
+  event.waitUntil(
+    caches.keys()
+      .then((keys) => Promise.all(keys.filter((key) => key.startsWith("precache-") && key !== CACHE).map((key) => caches.delete(key))))
+      .then(() => self.clients.claim())
+  );
+});
+
+self.addEventListener("fetch", (event) => {
+  if (event.request.method !== "GET") return;
+  const url = new URL(event.request.url);
+  if (url.origin !== self.location.origin) return;
+  // Pages are linked as /dir or /dir/ but stored as /dir/index.html
+  const path = url.pathname;
+  const candidates = [path, path.replace(/\\/?$/, "/index.html")];
+  event.respondWith(
+    caches.open(CACHE).then(async (cache) => {
+      for (const candidate of candidates) {
+        const hit = await cache.match(candidate);
+        if (hit) return hit;
+      }
+      return fetch(event.request);
+    })
+  );
+});
+"""
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def precache_entries(
+    dest_dir, revisions, basepath="/", max_file_bytes=DEFAULT_PRECACHE_MAX_FILE_BYTES,
+    budget=DEFAULT_PRECACHE_BUDGET, records=None,
+):
+    """
+    Choose the pages and page assets of the built site to precache, within the size budgets.
+
+    Revisions are content hashes, so rebuilding a file with the same bytes keeps its
+    revision. They come from hashes the build already holds, or from records of earlier
+    precache runs; only files without a matching record are read.
+
+    Args:
+        dest_dir (str): Directory of the built site
+        revisions (dict): Output path -> [sha256, mtime_ns, size] hash records the build
+            already keeps (used only while the file's stat still matches)
+        basepath (str): Base path the site is served under
+        max_file_bytes (int): Largest file that is precached
+        budget (int): Most bytes precached in total (pages first, then CSS/JS, then images and fonts)
+        records (dict): Output path -> hash record of files hashed here, updated in place
+
+    Returns:
+        list: Dicts with "url", "revision" and "size", sorted by URL
+    """
+    if records is None:
+        records = {}
+    prefix = basepath.rstrip('/') + '/'
+    candidates = []
+    pending = [""]
+    while pending:
+        rel_dir = pending.pop()
+        with os.scandir(os.path.join(dest_dir, rel_dir)) as it:
+            for entry in it:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                if entry.is_dir():
+                    pending.append(rel_path)
+                    continue
+                priority = _PRECACHED.get(os.path.splitext(entry.name)[1].lower())
+                if priority is None or entry.name in _SKIPPED_NAMES:
+                    continue
+                st = entry.stat()
+                if st.st_size > max_file_bytes:
+                    continue
+                path = os.path.normpath(entry.path)
+                record = revisions.get(path)
+                if record is None or record[1] != st.st_mtime_ns or record[2] != st.st_size:
+                    record = records.get(path)
+                    if record is None or record[1] != st.st_mtime_ns or record[2] != st.st_size:
+                        record = [_file_hash(entry.path), st.st_mtime_ns, st.st_size]
+                        records[path] = record
+                candidates.append((priority, st.st_size, rel_path, record[0]))
+
+    entries = []
+    total = 0
+    for _, size, rel_path, revision in sorted(candidates):
+        if total + size > budget:
+            continue
+        total += size
+        entries.append({"url": prefix + rel_path, "revision": revision[:16], "size": size})
+    entries.sort(key=lambda entry: entry["url"])
+    return entries
+
+
+def write_service_worker(dest_dir, entries):
+    """
+    Write the precache manifest and a service worker that precaches it.
+
+    The worker's cache name is derived from the manifest, so any changed revision
+    installs a new cache and drops the old one. Files are left untouched when their
+    contents are unchanged.
+
+    Args:
+        dest_dir (str): Directory of the built site
+        entries (list): Precache entries (see precache_entries)
+
+    Returns:
+        bool: Whether anything was written
+    """
+    manifest = json.dumps(entries, indent=2, sort_keys=True)
+    version = hashlib.sha256(manifest.encode('utf-8')).hexdigest()[:16]
+    worker = _SERVICE_WORKER % {
+        "version": version,
+        "urls": json.dumps([entry["url"] for entry in entries]),
+    }
+
+    written = False
+    for name, content in ((PRECACHE_MANIFEST_NAME, manifest), (SERVICE_WORKER_NAME, worker)):
+        path = os.path.join(dest_dir, name)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                if f.read() == content:
+                    continue
+        except OSError:
+            pass
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        written = True
+    return written
@@ -0,0 +1,23 @@
+import re
+from functools import lru_cache
+
+# Runs of characters that are not letters, digits or underscores become one hyphen
+_SEPARATORS = re.compile(r'[^\w]+')
+
+
+@lru_cache(maxsize=4096)
+def slugify(text):
+    """
+    Turn heading text into a URL fragment (e.g., "Why Tom?" -> "why-tom").
+
+    One regex pass over the text; results are memoized because the same headings
+    ("Introduction", "Usage", ...) recur across pages.
+
+    Args:
+        text (str): Plain heading text
+
+    Returns:
+        str: Lowercase slug, or "section" when the text has no word characters
+    """
+    slug = _SEPARATORS.sub('-', text.lower()).strip('-')
+    return slug or "section"
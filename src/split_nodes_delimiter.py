@@ -1,7 +1,23 @@
 from textnode import TextNode, TextType
 
 
-def split_nodes_delimiter(old_nodes, delimiter, text_type):
+def split_nodes_delimiter(old_nodes, delimiter, text_type, problems=None):
+    """
+    Split TEXT nodes on a delimiter pair such as ** or `, typing the enclosed text.
+    
+    Args:
+        old_nodes (list): List of TextNode objects
+        delimiter (str): The delimiter, e.g. "**"
+        text_type (TextType): Type of the text between a pair of delimiters
+        problems (list): In tolerant mode, collects (node text, index, message) for
+            each unmatched or empty delimiter, which is then kept as literal text
+        
+    Returns:
+        list: New list of TextNode objects
+        
+    Raises:
+        ValueError: On an unmatched delimiter or an empty pair (unless tolerant)
+    """
     new_nodes = []
     
     for old_node in old_nodes:
@@ -20,9 +36,14 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
         
         # Check if we have an even number of parts (matching delimiters)
         if len(parts) % 2 == 0:
-            raise ValueError(f"Invalid markdown syntax: unmatched delimiter '{delimiter}'")
+            if problems is None:
+                raise ValueError(f"Invalid markdown syntax: unmatched delimiter '{delimiter}'")
+            # The last delimiter has no partner: keep it as literal text
+            problems.append((old_node.text, old_node.text.rfind(delimiter), f"Unmatched delimiter '{delimiter}'"))
+            parts = parts[:-2] + [parts[-2] + delimiter + parts[-1]]
         
         # Process the parts
+        offset = 0
         for i, part in enumerate(parts):
             if i % 2 == 0:
                 # Even indices are regular text (outside delimiters)
@@ -31,7 +52,15 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
             else:
                 # Odd indices are content between delimiters
                 if not part:  # Empty content between delimiters is invalid
-                    raise ValueError(f"Invalid markdown syntax: empty content between '{delimiter}' delimiters")
-                new_nodes.append(TextNode(part, text_type))
+                    if problems is None:
+                        raise ValueError(f"Invalid markdown syntax: empty content between '{delimiter}' delimiters")
+                    problems.append((
+                        old_node.text, offset - len(delimiter),
+                        f"Empty content between '{delimiter}' delimiters",
+                    ))
+                    new_nodes.append(TextNode(delimiter + delimiter, TextType.TEXT))
+                else:
+                    new_nodes.append(TextNode(part, text_type))
+            offset += len(part) + len(delimiter)
     
     return new_nodes
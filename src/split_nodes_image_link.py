@@ -1,5 +1,12 @@
 from textnode import TextNode, TextType
-from extract_markdown import extract_markdown_images, extract_markdown_links
+import re
+from extract_markdown import extract_markdown_images, extract_markdown_links, normalize_label
+
+# [[target]] or [[target|label]]
+_WIKI_LINK = re.compile(r'\[\[([^\[\]|]+)(?:\|([^\[\]]+))?\]\]')
+
+# [text][id], [text][] or [text], optionally preceded by ! for images
+_REFERENCE = re.compile(r'(!?)\[([^\[\]]*)\](?:\[([^\[\]]*)\])?')
 
 
 def split_nodes_image(old_nodes):
@@ -126,3 +133,94 @@ def split_nodes_link(old_nodes):
             new_nodes.append(TextNode(remaining_text, TextType.TEXT))
     
     return new_nodes
+
+
+def split_nodes_wiki(old_nodes, resolve):
+    """
+    Split TextNodes based on [[target]] and [[target|label]] wiki links.
+    Only processes TEXT type nodes, others are passed through unchanged.
+    
+    Args:
+        old_nodes (list): List of TextNode objects
+        resolve (callable): Target -> URL, or None for targets that name no page
+            (those are rendered as their label, as plain text)
+        
+    Returns:
+        list: New list of TextNode objects with wiki links split out
+    """
+    new_nodes = []
+    
+    for old_node in old_nodes:
+        if old_node.text_type != TextType.TEXT or '[[' not in old_node.text:
+            new_nodes.append(old_node)
+            continue
+        
+        text = old_node.text
+        position = 0
+        for match in _WIKI_LINK.finditer(text):
+            target, label = match.groups()
+            label = (label or target).strip()
+            url = resolve(target.strip())
+            
+            # Text before the link; an unresolved link's label joins it
+            before = text[position:match.start()]
+            if url is None:
+                before += label
+            if before:
+                new_nodes.append(TextNode(before, TextType.TEXT))
+            if url is not None:
+                new_nodes.append(TextNode(label, TextType.LINK, url))
+            position = match.end()
+        
+        # Add any remaining text after the last link
+        if position < len(text):
+            new_nodes.append(TextNode(text[position:], TextType.TEXT))
+    
+    return new_nodes
+
+
+def split_nodes_reference(old_nodes, definitions):
+    """
+    Split TextNodes based on reference-style links and images.
+    Only processes TEXT type nodes, others are passed through unchanged.
+    
+    Handles [text][id], collapsed [text][] and shortcut [text] references; brackets
+    whose label has no definition are kept as literal text.
+    
+    Args:
+        old_nodes (list): List of TextNode objects
+        definitions (dict): Normalized label -> url (see extract_link_definitions)
+        
+    Returns:
+        list: New list of TextNode objects with resolved references split out
+    """
+    if not definitions:
+        return old_nodes
+    
+    new_nodes = []
+    
+    for old_node in old_nodes:
+        if old_node.text_type != TextType.TEXT or '[' not in old_node.text:
+            new_nodes.append(old_node)
+            continue
+        
+        text = old_node.text
+        position = 0
+        for match in _REFERENCE.finditer(text):
+            bang, anchor_text, label = match.groups()
+            url = definitions.get(normalize_label(label or anchor_text))
+            if url is None:
+                continue
+            
+            # Add text before the reference (if not empty)
+            if match.start() > position:
+                new_nodes.append(TextNode(text[position:match.start()], TextType.TEXT))
+            text_type = TextType.IMAGE if bang else TextType.LINK
+            new_nodes.append(TextNode(anchor_text, text_type, url))
+            position = match.end()
+        
+        # Add any remaining text after the last reference
+        if position < len(text):
+            new_nodes.append(TextNode(text[position:], TextType.TEXT))
+    
+    return new_nodes
@@ -0,0 +1,294 @@
+import hashlib
+import json
+import marshal
+import os
+import re
+import sys
+from minify_html import minify_template
+from fingerprint_assets import rewrite_template_urls, template_urls
+
+# Bump whenever the generated code changes, so stale compiled templates are ignored
+TEMPLATE_ENGINE_VERSION = 1
+
+_TOKEN = re.compile(r'(\{\{.*?\}\}|\{%.*?%\})', re.DOTALL)
+_EXPRESSION = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z0-9_]+)*$')
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+_LINK_TAG = re.compile(r'<link\b[^>]*>', re.IGNORECASE)
+_LINK_HREF = re.compile(r'\bhref="([^"]*)"')
+_LINK_STYLESHEET = re.compile(r'\brel="stylesheet"', re.IGNORECASE)
+
+
+def _text(value):
+    """Convert a template value to output text (None renders as nothing)"""
+    if value is None:
+        return ""
+    return value if isinstance(value, str) else str(value)
+
+
+def _attr(obj, name):
+    """Look up a dotted-path segment on a dict, list or object"""
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(name)
+    if isinstance(obj, (list, tuple)) and name.isdigit():
+        index = int(name)
+        return obj[index] if index < len(obj) else None
+    return getattr(obj, name, None)
+
+
+def _iter(value):
+    """Iterate over a loop value (None loops zero times)"""
+    return () if value is None else value
+
+
+# Names available to generated render functions
+_RUNTIME = {"_text": _text, "_attr": _attr, "_iter": _iter}
+
+
+class Template:
+    """
+    A template compiled to a Python function.
+
+    Attributes:
+        sources (list): Paths of the template and every partial it includes
+        urls (list): href/src URLs referenced by the template markup (before rewriting)
+        bytes_saved (int): Bytes removed by minification across all sources
+        digest (str): Hash of every source's contents, identifying this version of the template
+    """
+
+    def __init__(self, code, sources, urls, bytes_saved):
+        namespace = dict(_RUNTIME)
+        exec(code, namespace)
+        self._render = namespace["render"]
+        self.sources = [path for path, _ in sources]
+        self.digest = hashlib.sha256(
+            "\0".join(digest for _, digest in sources).encode('utf-8')
+        ).hexdigest()
+        self.urls = urls
+        self.bytes_saved = bytes_saved
+
+    def render(self, variables):
+        """
+        Render the template.
+
+        Args:
+            variables (dict): Values for {{ name }} tags and loops
+
+        Returns:
+            str: The rendered markup
+        """
+        return self._render(variables)
+
+
+class _Compiler:
+    """Translates template sources into the body of a Python render function"""
+
+    def __init__(self, minify, url_map, inline_css=None):
+        self.minify = minify
+        self.url_map = url_map
+        self.inline_css = inline_css
+        self.lines = ["def render(_ctx):", "    _out = []", "    _a = _out.append"]
+        self.indent = 1
+        self.scope = []
+        self.blocks = []
+        self.sources = []
+        self.urls = []
+        self.bytes_saved = 0
+
+    def emit(self, line):
+        self.lines.append("    " * self.indent + line)
+
+    def expression(self, expr, path):
+        expr = expr.strip()
+        if not _EXPRESSION.match(expr):
+            raise ValueError(f"{path}: invalid template expression '{expr}'")
+        head, *rest = expr.split('.')
+        code = f"_v_{head}" if head in self.scope else f"_ctx.get({head!r})"
+        for name in rest:
+            code = f"_attr({code}, {name!r})"
+        return code
+
+    def compile_file(self, path, include_stack=()):
+        path = os.path.normpath(path)
+        if path in include_stack:
+            chain = " -> ".join(include_stack + (path,))
+            raise ValueError(f"Template include cycle: {chain}")
+
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        self.sources.append([path, hashlib.sha256(text.encode('utf-8')).hexdigest()])
+
+        if self.inline_css:
+            text = _LINK_TAG.sub(self.inline_stylesheet, text)
+        if self.url_map is not None:
+            self.urls.extend(template_urls(text))
+            text = rewrite_template_urls(text, self.url_map)
+        if self.minify:
+            minified = minify_template(text)
+            self.bytes_saved += len(text.encode('utf-8')) - len(minified.encode('utf-8'))
+            text = minified
+
+        depth = len(self.blocks)
+        for token in _TOKEN.split(text):
+            if not token:
+                continue
+            if token.startswith('{{'):
+                self.emit(f"_a(_text({self.expression(token[2:-2], path)}))")
+            elif token.startswith('{%'):
+                self.statement(token[2:-2].strip(), path, include_stack + (path,))
+            else:
+                self.emit(f"_a({token!r})")
+
+        if len(self.blocks) != depth:
+            raise ValueError(f"{path}: unclosed '{{% {self.blocks[-1]} %}}' block")
+
+    def inline_stylesheet(self, match):
+        tag = match.group(0)
+        href = _LINK_HREF.search(tag)
+        if href is None or not _LINK_STYLESHEET.search(tag) or href.group(1) not in self.inline_css:
+            return tag
+        href = href.group(1)
+        source_path, css, complete = self.inline_css[href]
+        with open(source_path, 'rb') as f:
+            self.sources.append([source_path, hashlib.sha256(f.read()).hexdigest()])
+        if complete:
+            return f"<style>{css}</style>"
+        # Only the critical rules are inlined; the full stylesheet loads without blocking
+        return (
+            f"<style>{css}</style>"
+            f'<link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'" />'
+            f'<noscript><link rel="stylesheet" href="{href}" /></noscript>'
+        )
+
+    def statement(self, stmt, path, include_stack):
+        words = stmt.split()
+        keyword = words[0] if words else ""
+
+        if keyword == "include" and len(words) == 2:
+            partial = words[1].strip('"\'')
+            self.compile_file(os.path.join(os.path.dirname(path), partial), include_stack)
+        elif keyword == "for" and len(words) == 4 and words[2] == "in":
+            name = words[1]
+            if not _IDENTIFIER.match(name):
+                raise ValueError(f"{path}: invalid loop variable '{name}'")
+            self.emit(f"for _v_{name} in _iter({self.expression(words[3], path)}):")
+            self.indent += 1
+            self.emit("pass")
+            self.scope.append(name)
+            self.blocks.append("for")
+        elif keyword == "if" and len(words) == 2:
+            self.emit(f"if {self.expression(words[1], path)}:")
+            self.indent += 1
+            self.emit("pass")
+            self.blocks.append("if")
+        elif keyword == "else" and len(words) == 1 and self.blocks and self.blocks[-1] == "if":
+            self.indent -= 1
+            self.emit("else:")
+            self.indent += 1
+            self.emit("pass")
+        elif keyword in ("endfor", "endif") and len(words) == 1:
+            if not self.blocks or self.blocks[-1] != keyword[3:]:
+                raise ValueError(f"{path}: unexpected '{{% {keyword} %}}'")
+            if self.blocks.pop() == "for":
+                self.scope.pop()
+            self.indent -= 1
+        else:
+            raise ValueError(f"{path}: unknown template tag '{{% {stmt} %}}'")
+
+    def code(self, path):
+        self.emit("return ''.join(_out)")
+        return compile("\n".join(self.lines), f"<template {path}>", "exec")
+
+
+def _cache_key(template_path, text, minify, url_map, inline_css):
+    h = hashlib.sha256()
+    for part in (
+        str(TEMPLATE_ENGINE_VERSION),
+        sys.implementation.cache_tag or "",
+        os.path.normpath(template_path),
+        text,
+        "minify" if minify else "",
+        json.dumps(url_map, sort_keys=True) if url_map is not None else "",
+        json.dumps(inline_css, sort_keys=True) if inline_css else "",
+    ):
+        h.update(part.encode('utf-8'))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _load_cached(cache_file):
+    """Load a compiled template, returning None if it is missing or any source changed"""
+    try:
+        with open(cache_file, 'rb') as f:
+            entry = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    for path, digest in entry["sources"][1:]:
+        try:
+            with open(path, 'rb') as f:
+                if hashlib.sha256(f.read()).hexdigest() != digest:
+                    return None
+        except OSError:
+            return None
+    return entry
+
+
+def compile_template(template_path, minify=False, url_map=None, cache_dir=None, inline_css=None):
+    """
+    Compile a template and its partials into a single render function.
+
+    Supported tags:
+        {{ name }} / {{ post.title }}         insert a variable (not escaped)
+        {% include "partials/nav.html" %}     inline a partial (path relative to the file)
+        {% for post in posts %}...{% endfor %}
+        {% if name %}...{% else %}...{% endif %}
+
+    Compiled code is cached on disk (marshal) under a key made of the engine version,
+    the interpreter, the template source and the compile options; partials are
+    validated by content hash when the cache is loaded.
+
+    Args:
+        template_path (str): Path to the template file
+        minify (bool): Minify the markup at compile time
+        url_map (dict): URL -> fingerprinted URL rewrites for href/src attributes
+        cache_dir (str): Directory for compiled templates (None disables the disk cache)
+        inline_css (dict): Stylesheet href -> (source path, CSS, complete); matching
+            <link rel="stylesheet"> tags are replaced by a <style> block, and when only
+            a critical portion is inlined the full file is preloaded asynchronously
+
+    Returns:
+        Template: The compiled template
+
+    Raises:
+        ValueError: If the template has a syntax error or an include cycle
+    """
+    cache_file = None
+    if cache_dir:
+        with open(template_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        key = _cache_key(template_path, text, minify, url_map, inline_css)
+        cache_file = os.path.join(cache_dir, key + ".marshal")
+        entry = _load_cached(cache_file)
+        if entry is not None:
+            return Template(entry["code"], entry["sources"], entry["urls"], entry["bytes_saved"])
+
+    compiler = _Compiler(minify, url_map, inline_css)
+    compiler.compile_file(template_path)
+    code = compiler.code(template_path)
+
+    if cache_file:
+        os.makedirs(cache_dir, exist_ok=True)
+        entry = {
+            "code": code,
+            "sources": compiler.sources,
+            "urls": compiler.urls,
+            "bytes_saved": compiler.bytes_saved,
+        }
+        tmp_file = cache_file + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            marshal.dump(entry, f)
+        os.replace(tmp_file, cache_file)
+
+    return Template(code, compiler.sources, compiler.urls, compiler.bytes_saved)
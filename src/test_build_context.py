@@ -0,0 +1,326 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from build_context import BuildContext, BACKLINKS_NAME
+from markdown_to_html_node import parse_markdown
+from generate_page import generate_page
+import generate_pages_recursive as pages
+from generate_pages_recursive import generate_pages_recursive
+from document_info import DocumentInfo
+
+
+def write_file(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+class TestBuildContext(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.static = os.path.join(self.tmp.name, "static")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        write_file(os.path.join(self.content, "index.md"), "# Home")
+        write_file(os.path.join(self.content, "blog", "tom", "index.md"), "# Tom")
+        write_file(os.path.join(self.content, "contact.md"), "# Contact")
+        write_file(os.path.join(self.static, "images", "tom.png"), "png")
+        write_file(self.template, "{{ Content }}")
+        self.context = BuildContext(self.content, self.static)
+        self.home = os.path.join(self.content, "index.md")
+        self.tom = os.path.join(self.content, "blog", "tom", "index.md")
+        self.contact = os.path.join(self.content, "contact.md")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_resolve_static_asset(self):
+        """Test that an image URL maps to the static file"""
+        self.assertEqual(
+            self.context.resolve_url("/images/tom.png"),
+            os.path.join(self.static, "images", "tom.png"),
+        )
+
+    def test_resolve_pages(self):
+        """Test that page URLs map to index.md or name.md sources"""
+        self.assertEqual(self.context.resolve_url("/"), self.home)
+        self.assertEqual(self.context.resolve_url("/blog/tom"), self.tom)
+        self.assertEqual(self.context.resolve_url("/blog/tom/index.html#top"), self.tom)
+        self.assertEqual(self.context.resolve_url("/contact"), self.contact)
+
+    def test_resolve_external_and_missing(self):
+        """Test that external and unknown URLs are not dependencies"""
+        self.assertIsNone(self.context.resolve_url("https://example.com/"))
+        self.assertIsNone(self.context.resolve_url("//cdn.example.com/x.js"))
+        self.assertIsNone(self.context.resolve_url("/blog/missing"))
+
+    def test_incremental_rebuild_set(self):
+        """Test that only pages depending on a changed input are rebuilt"""
+        sources = [self.home, self.tom, self.contact]
+        for page in sources:
+            self.context.record_page(page, self.template, [])
+        self.context.record_page(self.home, self.template, ["/blog/tom", "/images/tom.png"])
+        self.context.graph.options = self.context.output_options("/")
+        self.context.finish()
+
+        rebuild, removed = self.context.pages_to_rebuild(sources)
+        self.assertEqual(rebuild, set())
+        self.assertEqual(removed, [])
+
+        write_file(self.tom, "# Tom Bombadil")
+        rebuild, _ = self.context.pages_to_rebuild(sources)
+        self.assertEqual(rebuild, {self.home, self.tom})
+
+    def test_new_and_removed_pages(self):
+        """Test that new sources are built and removed ones reported"""
+        self.context.record_page(self.home, self.template, ["/contact"])
+        self.context.record_page(self.contact, self.template, [])
+        self.context.graph.options = self.context.output_options("/")
+        self.context.finish()
+
+        os.remove(self.contact)
+        rebuild, removed = self.context.pages_to_rebuild([self.home, self.tom])
+        self.assertEqual(removed, [self.contact])
+        self.assertEqual(rebuild, {self.home, self.tom})
+
+    def test_changed_options_rebuild_everything(self):
+        """Test that switching output options invalidates every page"""
+        sources = [self.home, self.tom]
+        for page in sources:
+            self.context.record_page(page, self.template, [])
+        self.context.graph.options = self.context.output_options("/")
+        self.context.finish()
+
+        rebuild, _ = self.context.pages_to_rebuild(sources, "/")
+        self.assertEqual(rebuild, set())
+        self.context.minify = True
+        rebuild, _ = self.context.pages_to_rebuild(sources, "/")
+        self.assertEqual(rebuild, set(sources))
+
+    def test_enabling_search_rebuilds_everything(self):
+        """Test that the first build with a search index renders (and indexes) every page"""
+        sources = [self.home, self.tom]
+        for page in sources:
+            self.context.record_page(page, self.template, [])
+        self.context.graph.options = self.context.output_options("/")
+        context = BuildContext(self.content, self.static, search=True)
+        context.graph = self.context.graph
+        rebuild, _ = context.pages_to_rebuild(sources, "/")
+        self.assertEqual(rebuild, set(sources))
+
+    def test_new_feed_rebuilds_its_pages(self):
+        """Test that pages of a newly added feed section are rendered to keep their bodies"""
+        sources = [self.home, self.tom]
+        for page, title in ((self.home, "Home"), (self.tom, "Tom")):
+            self.context.record_page(page, self.template, [])
+            self.context.record_metadata(page, "", title, {})
+        self.context.graph.options = self.context.output_options("/")
+        self.context.finish()
+        self.context.feed_sections = ["blog"]
+        self.context.content_cache_dir = os.path.join(self.tmp.name, "rendered")
+        rebuild, _ = self.context.pages_to_rebuild(sources, "/")
+        self.assertEqual(rebuild, {self.tom})
+
+        self.context.store_content(self.tom, self.context.metadata.get(self.tom), "<p>Tom</p>")
+        rebuild, _ = self.context.pages_to_rebuild(sources, "/")
+        self.assertEqual(rebuild, set())
+
+    def test_template_is_read_once_per_build(self):
+        """Test that templates are cached until the next build starts"""
+        variables = {"Content": "x"}
+        self.assertEqual(self.context.load_template(self.template).render(variables), "x")
+        write_file(self.template, "<p>{{ Content }}</p>")
+        self.assertEqual(self.context.load_template(self.template).render(variables), "x")
+        self.context.start_build()
+        self.assertEqual(self.context.load_template(self.template).render(variables), "<p>x</p>")
+
+    def test_resolve_layout_nearest_ancestor(self):
+        """Test that pages use the nearest _layout.html above them"""
+        blog_layout = os.path.join(self.content, "blog", "_layout.html")
+        write_file(blog_layout, "<main>{{ Content }}</main>")
+        self.assertEqual(self.context.resolve_layout("blog/tom", self.template), blog_layout)
+        self.assertEqual(self.context.resolve_layout("blog", self.template), blog_layout)
+        self.assertEqual(self.context.resolve_layout("", self.template), self.template)
+
+    def test_resolve_layout_is_memoized(self):
+        """Test that each directory is only checked once per build"""
+        self.assertEqual(self.context.resolve_layout("blog/tom", self.template), self.template)
+        write_file(os.path.join(self.content, "blog", "_layout.html"), "x")
+        self.assertEqual(self.context.resolve_layout("blog/tom", self.template), self.template)
+        self.context.start_build()
+        self.assertNotEqual(self.context.resolve_layout("blog/tom", self.template), self.template)
+
+    def test_new_layout_rebuilds_directory(self):
+        """Test that creating a layout rebuilds only the pages beneath it"""
+        sources = [self.home, self.tom]
+        self.context.resolve_layout("", self.template)
+        self.context.resolve_layout("blog/tom", self.template)
+        for page in sources:
+            self.context.record_page(page, self.template, [])
+        self.context.graph.options = self.context.output_options("/")
+        self.context.finish()
+
+        rebuild, _ = self.context.pages_to_rebuild(sources)
+        self.assertEqual(rebuild, set())
+        write_file(os.path.join(self.content, "blog", "_layout.html"), "x")
+        rebuild, _ = self.context.pages_to_rebuild(sources)
+        self.assertEqual(rebuild, {self.tom})
+
+    def test_prefetch_ranked_by_inbound_links(self):
+        """Test that prefetch hints favour the targets most linked to across the site"""
+        self.context.prefetch_count = 1
+        def info(links):
+            document = DocumentInfo()
+            document.links = links
+            return document
+
+        self.context.record_metadata(self.home, "", "Home", {}, info(["/contact", "/blog/tom"]))
+        self.context.record_metadata(self.tom, "", "Tom", {}, info(["/", "/blog/tom", "/contact"]))
+        self.context.record_metadata(self.contact, "", "Contact", {}, info(["/"]))
+        self.context.build_link_graph()
+
+        # Self-links are ignored; "/" and "/contact" have two inbound links each
+        self.assertEqual(self.context.inbound_links[self.home], 2)
+        self.assertEqual(self.context.prefetch_tags(self.tom), '<link rel="prefetch" href="/" />')
+        self.assertEqual(self.context.prefetch_tags(self.home), '<link rel="prefetch" href="/contact.html" />')
+
+
+    def test_backlinks_and_unresolved_wiki_links(self):
+        """Test that wiki links give backlinks and report unresolved targets"""
+        self.context.start_build(["index.md", "blog/tom/index.md", "contact.md"])
+        for page, title, md in (
+            (self.home, "Home", "[[tom]] and [[contact]]"),
+            (self.contact, "Contact", "[[blog/tom]] or [[gandalf]]"),
+        ):
+            _, info = parse_markdown(md, page_index=self.context.page_index)
+            self.context.record_metadata(page, "", title, {}, info)
+
+        dest = os.path.join(self.tmp.name, "public")
+        os.makedirs(dest)
+        self.assertTrue(self.context.write_backlinks(dest, "/site/"))
+        with open(os.path.join(dest, BACKLINKS_NAME), encoding='utf-8') as f:
+            backlinks = json.load(f)
+        self.assertEqual(backlinks, {
+            "/site/blog/tom": [
+                {"url": "/site/", "title": "Home"},
+                {"url": "/site/contact.html", "title": "Contact"},
+            ],
+            "/site/contact.html": [{"url": "/site/", "title": "Home"}],
+        })
+        self.assertEqual(self.context.summary.unresolved_links, [(self.contact, "gandalf")])
+        self.assertFalse(self.context.write_backlinks(dest, "/site/"))
+
+
+    def test_wiki_links_follow_this_builds_titles(self):
+        """Test that wiki links resolve by the current titles, whatever the build history"""
+        write_file(self.tom, "# Tom Bombadil")
+        write_file(self.contact, "# Contact\n\n[[Tom Bombadil]] or [[Old Tom]]")
+        write_file(self.home, "# Home\n\n[[Old Tom]]")
+        dest = os.path.join(self.tmp.name, "public")
+        cache = os.path.join(self.tmp.name, "cache")
+
+        def build(incremental):
+            context = BuildContext(
+                self.content, self.static, incremental=incremental,
+                graph_path=os.path.join(cache, "graph.json"),
+                metadata_path=os.path.join(cache, "metadata.json"),
+            )
+            generate_pages_recursive(self.content, self.template, dest, "/", context=context)
+            with open(os.path.join(dest, "contact.html"), encoding='utf-8') as f:
+                contact = f.read()
+            with open(os.path.join(dest, "index.html"), encoding='utf-8') as f:
+                return context.summary.written, contact, f.read()
+
+        # The first build has no earlier titles to go by, and writes each page once
+        written, contact, home = build(False)
+        self.assertEqual(written, 3)
+        self.assertIn('<a href="/blog/tom">Tom Bombadil</a> or Old Tom', contact)
+        self.assertEqual(build(True)[0], 0)
+
+        # A new page with an unrelated name re-renders nothing else
+        write_file(os.path.join(self.content, "new", "index.md"), "# Brand New")
+        self.assertEqual(build(True)[0], 1)
+
+        # Retitling a page re-resolves the links of pages that did not change
+        write_file(self.tom, "# Old Tom")
+        written, contact, home = build(True)
+        self.assertEqual(written, 3)
+        self.assertIn('Tom Bombadil or <a href="/blog/tom">Old Tom</a>', contact)
+        self.assertIn('<a href="/blog/tom">Old Tom</a>', home)
+        self.assertEqual(build(True)[0], 0)
+
+    def test_tolerant_page_without_h1(self):
+        """Test that a tolerant build titles a page without h1 after its file and reports it"""
+        context = BuildContext(self.content, self.static, tolerant=True)
+        page = os.path.join(self.content, "notes.md")
+        write_file(page, "---\nauthor: me\n---\nJust _text")
+        generate_page(page, self.template, os.path.join(self.tmp.name, "public", "notes.html"), "/", context)
+        context.collect_diagnostics()
+        self.assertEqual(context.metadata.get(page)["title"], "notes")
+        self.assertEqual(context.summary.diagnostics, [
+            (page, 4, 6, "Unmatched delimiter '_'"),
+            (page, 1, 1, "No h1 header found; using 'notes' as the title"),
+        ])
+
+
+    def test_failed_page_leaves_no_stale_output(self):
+        """Test that a page a tolerant build cannot generate loses its old output and search entry"""
+        dest = os.path.join(self.tmp.name, "public")
+        cache = os.path.join(self.tmp.name, "cache")
+
+        def build(incremental):
+            context = BuildContext(
+                self.content, self.static, incremental=incremental, search=True, tolerant=True,
+                graph_path=os.path.join(cache, "graph.json"),
+                metadata_path=os.path.join(cache, "metadata.json"),
+                search_index_path=os.path.join(cache, "search.json"),
+            )
+            generate_pages_recursive(self.content, self.template, dest, "/", context=context)
+            return context
+
+        build(False)
+        contact_html = os.path.join(dest, "contact.html")
+        self.assertTrue(os.path.exists(contact_html))
+
+        write_file(self.contact, "# Contact\n\nChanged")
+        real_generate_page = pages.generate_page
+
+        def generate_page(source_path, *args):
+            if source_path == self.contact:
+                raise KeyError("broken")
+            return real_generate_page(source_path, *args)
+
+        with mock.patch.object(pages, "generate_page", generate_page):
+            context = build(True)
+        self.assertEqual(context.summary.failed_pages, [(self.contact, "'broken'")])
+        self.assertFalse(os.path.exists(contact_html))
+        self.assertIsNone(context.metadata.get(self.contact))
+        self.assertNotIn(self.contact, context.search.pages)
+
+
+    def test_prefetch_write_failure_is_tolerated(self):
+        """Test that with prefetch hints a page failing at its write is reported, not fatal"""
+        dest = os.path.join(self.tmp.name, "public")
+        context = BuildContext(
+            self.content, self.static, tolerant=True, prefetch_count=2,
+            content_cache_dir=os.path.join(self.tmp.name, "rendered"),
+        )
+        real_write_page = pages.write_page
+
+        def write_page(prepared, dest_path, *args):
+            if prepared["title"] == "Contact":
+                raise OSError("disk full")
+            return real_write_page(prepared, dest_path, *args)
+
+        with mock.patch.object(pages, "write_page", write_page):
+            generate_pages_recursive(self.content, self.template, dest, "/", context=context)
+        self.assertEqual(context.summary.failed_pages, [(self.contact, "disk full")])
+        self.assertTrue(os.path.exists(os.path.join(dest, "blog", "tom", "index.html")))
+        # Bodies were stashed on disk and taken back at their write
+        self.assertEqual(os.listdir(context.content_cache_dir), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
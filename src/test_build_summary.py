@@ -0,0 +1,48 @@
+import unittest
+from build_summary import BuildSummary
+
+
+class TestBuildSummary(unittest.TestCase):
+    def test_counts(self):
+        """Test that written and unchanged counts are reported"""
+        summary = BuildSummary()
+        summary.written += 2
+        summary.unchanged += 3
+        self.assertEqual(summary.lines(), ["Pages written: 2", "Pages unchanged: 3"])
+
+
+    def test_unresolved_links(self):
+        """Test that unresolved wiki links are listed with their page"""
+        summary = BuildSummary()
+        summary.unresolved_links = [("content/index.md", "gandalf")]
+        self.assertEqual(summary.lines()[2:], [
+            "Unresolved wiki links: 1",
+            "  content/index.md: [[gandalf]]",
+        ])
+
+
+    def test_diagnostics_and_failed_pages(self):
+        """Test that diagnostics are listed as file:line:column and failed pages with their error"""
+        summary = BuildSummary()
+        summary.diagnostics = [("content/index.md", 3, 7, "Unmatched delimiter '_'")]
+        summary.failed_pages = [("content/bad.md", "Front matter is not closed with '---'")]
+        self.assertEqual(summary.lines()[2:], [
+            "Diagnostics: 1",
+            "  content/index.md:3:7: Unmatched delimiter '_'",
+            "Pages not generated: 1",
+            "  content/bad.md: Front matter is not closed with '---'",
+        ])
+
+
+    def test_did_work(self):
+        """Test that an idle build (such as a watch poll with no changes) did no work"""
+        summary = BuildSummary()
+        self.assertFalse(summary.did_work())
+        summary.broken_links = [("content/index.md", "/missing")]
+        self.assertFalse(summary.did_work())
+        summary.unchanged += 1
+        self.assertTrue(summary.did_work())
+
+
+if __name__ == "__main__":
+    unittest.main()
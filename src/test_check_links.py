@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+import check_links as checker
+from check_links import check_links, link_target, output_paths
+
+
+def write_file(path, text=""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+class TestLinkTarget(unittest.TestCase):
+    def test_absolute(self):
+        """Test that site-absolute links drop their fragment and query"""
+        self.assertEqual(link_target("/", "/blog/tom#intro"), "blog/tom")
+        self.assertEqual(link_target("/", "/"), "")
+
+    def test_relative(self):
+        """Test that relative links resolve against the page's directory"""
+        self.assertEqual(link_target("/blog/tom", "../majesty"), "blog/majesty")
+        self.assertEqual(link_target("/notes/intro.html", "next.html"), "notes/next.html")
+
+    def test_external(self):
+        """Test that external, protocol-relative and fragment-only links are skipped"""
+        self.assertIsNone(link_target("/", "https://example.com/"))
+        self.assertIsNone(link_target("/", "mailto:tom@example.com"))
+        self.assertIsNone(link_target("/", "//cdn.example.com/x.js"))
+        self.assertIsNone(link_target("/", "#top"))
+
+
+class TestCheckLinks(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dest = self.tmp.name
+        write_file(os.path.join(self.dest, "index.html"))
+        write_file(os.path.join(self.dest, "blog", "tom", "index.html"))
+        write_file(os.path.join(self.dest, "contact.html"))
+        write_file(os.path.join(self.dest, "images", "tom.1a2b3c4d5e.png"))
+        self.records = [
+            {"url": "/", "source": "content/index.md", "links": [
+                "/blog/tom", "/contact.html", "/images/tom.png", "https://example.com/",
+            ]},
+            {"url": "/blog/tom", "source": "content/blog/tom/index.md", "links": [
+                "/", "../missing", "/images/missing.png",
+            ]},
+        ]
+        self.url_map = {"/images/tom.png": "/images/tom.1a2b3c4d5e.png"}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_output_paths(self):
+        """Test that every output file is collected with / separators"""
+        self.assertIn("blog/tom/index.html", output_paths(self.dest))
+
+    def test_broken_links(self):
+        """Test that only links without an output file are reported"""
+        self.assertEqual(check_links(self.dest, self.records, self.url_map), [
+            ("content/blog/tom/index.md", "../missing"),
+            ("content/blog/tom/index.md", "/images/missing.png"),
+        ])
+
+    def test_parallel_matches_serial(self):
+        """Test that the worker pool finds the same broken links"""
+        threshold, chunk = checker.PARALLEL_THRESHOLD, checker.CHUNK_SIZE
+        checker.PARALLEL_THRESHOLD, checker.CHUNK_SIZE = 1, 2
+        try:
+            broken = check_links(self.dest, self.records, self.url_map, workers=2)
+        finally:
+            checker.PARALLEL_THRESHOLD, checker.CHUNK_SIZE = threshold, chunk
+        self.assertEqual(broken, [
+            ("content/blog/tom/index.md", "../missing"),
+            ("content/blog/tom/index.md", "/images/missing.png"),
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
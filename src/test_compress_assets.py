@@ -0,0 +1,75 @@
+import gzip
+import os
+import tempfile
+import unittest
+from compress_assets import compress_assets
+
+
+class TestCompressAssets(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.html = os.path.join(self.root, "blog", "index.html")
+        self.css = os.path.join(self.root, "index.css")
+        self.small = os.path.join(self.root, "small.js")
+        self.png = os.path.join(self.root, "tom.png")
+        self.write(self.html, "<p>" + "hello " * 400 + "</p>")
+        self.write(self.css, "body { color: red; }\n" * 100)
+        self.write(self.small, "x=1")
+        self.write(self.png, "p" * 4000)
+        self.records = {}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def test_compresses_large_text_assets(self):
+        """Test that only text assets above the threshold get .gz siblings"""
+        written, unchanged = compress_assets(self.root, self.records, min_size=1024)
+        self.assertEqual((written, unchanged), (2, 0))
+        self.assertTrue(os.path.exists(self.html + ".gz"))
+        self.assertTrue(os.path.exists(self.css + ".gz"))
+        self.assertFalse(os.path.exists(self.small + ".gz"))
+        self.assertFalse(os.path.exists(self.png + ".gz"))
+
+        with gzip.open(self.html + ".gz", 'rt', encoding='utf-8') as f:
+            self.assertTrue(f.read().startswith("<p>hello"))
+
+    def test_unchanged_files_are_not_recompressed(self):
+        """Test that a second run skips files whose content hash is unchanged"""
+        compress_assets(self.root, self.records, min_size=1024)
+        os.utime(self.css, ns=(1, 1))  # touched, same contents
+        written, unchanged = compress_assets(self.root, self.records, min_size=1024)
+        self.assertEqual((written, unchanged), (0, 2))
+
+    def test_changed_file_is_recompressed(self):
+        """Test that editing a file refreshes its sibling"""
+        compress_assets(self.root, self.records, min_size=1024)
+        self.write(self.css, "p { margin: 0; }\n" * 100)
+        written, _ = compress_assets(self.root, self.records, min_size=1024)
+        self.assertEqual(written, 1)
+        with gzip.open(self.css + ".gz", 'rt', encoding='utf-8') as f:
+            self.assertTrue(f.read().startswith("p { margin"))
+
+    def test_stale_sibling_is_removed(self):
+        """Test that a sibling is deleted when its source shrinks below the threshold"""
+        compress_assets(self.root, self.records, min_size=1024)
+        self.write(self.css, "a{}")
+        compress_assets(self.root, self.records, min_size=1024)
+        self.assertFalse(os.path.exists(self.css + ".gz"))
+        self.assertNotIn(self.css, self.records)
+
+    def test_foreign_gz_files_are_kept(self):
+        """Test that .gz files the stage did not write are left alone"""
+        archive = os.path.join(self.root, "archive.tar.gz")
+        self.write(archive, "data")
+        compress_assets(self.root, self.records, min_size=1024)
+        self.assertTrue(os.path.exists(archive))
+
+
+if __name__ == "__main__":
+    unittest.main()
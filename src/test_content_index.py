@@ -0,0 +1,110 @@
+import os
+import tempfile
+import time
+import unittest
+from content_index import scan_content_dir, markdown_files, discover_markdown_files
+
+
+def write_file(path, text="# Title"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def bump_mtime(path):
+    """Move a directory's mtime forward so the change is visible on coarse clocks"""
+    future = time.time_ns() + 10_000_000_000
+    os.utime(path, ns=(future, future))
+
+
+class TestContentIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        write_file(os.path.join(self.root, "index.md"))
+        write_file(os.path.join(self.root, "blog", "tom", "index.md"))
+        write_file(os.path.join(self.root, "blog", "tom", "notes.txt"), "not markdown")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_finds_markdown_files(self):
+        """Test that only .md files are listed, relative to the content root"""
+        index, _ = scan_content_dir(self.root)
+        self.assertEqual(
+            markdown_files(index),
+            ["blog/tom/index.md", "index.md"],
+        )
+
+    def test_skips_fragments(self):
+        """Test that _-prefixed fragments are not listed as pages"""
+        write_file(os.path.join(self.root, "blog", "_install.md"), "Install steps")
+        index, _ = scan_content_dir(self.root)
+        self.assertNotIn("blog/_install.md", markdown_files(index))
+
+    def test_records_entry_type(self):
+        """Test that entries record whether they are directories"""
+        index, _ = scan_content_dir(self.root)
+        self.assertEqual(index["dirs"]["."]["entries"]["index.md"], {"is_dir": False})
+        self.assertEqual(index["dirs"]["."]["entries"]["blog"], {"is_dir": True})
+
+    def test_symlinks_not_followed(self):
+        """Test that dangling links and links to an ancestor neither crash nor loop the scan"""
+        os.symlink(os.path.join(self.root, "missing"), os.path.join(self.root, "dangling"))
+        os.symlink("..", os.path.join(self.root, "blog", "loop"))
+        index, _ = scan_content_dir(self.root)
+        self.assertEqual(sorted(index["dirs"]), [".", "blog", "blog/tom"])
+        self.assertEqual(markdown_files(index), ["blog/tom/index.md", "index.md"])
+
+    def test_first_scan_reads_every_directory(self):
+        """Test that without a previous index every directory is scanned"""
+        _, rescanned = scan_content_dir(self.root)
+        self.assertEqual(sorted(rescanned), [".", "blog", "blog/tom"])
+
+    def test_unchanged_tree_is_not_rescanned(self):
+        """Test that a second scan reuses all cached directories"""
+        index, _ = scan_content_dir(self.root)
+        _, rescanned = scan_content_dir(self.root, index)
+        self.assertEqual(rescanned, [])
+
+    def test_only_changed_directory_is_rescanned(self):
+        """Test that adding a file only revalidates its own directory"""
+        index, _ = scan_content_dir(self.root)
+        write_file(os.path.join(self.root, "blog", "tom", "extra.md"))
+        bump_mtime(os.path.join(self.root, "blog", "tom"))
+
+        new_index, rescanned = scan_content_dir(self.root, index)
+        self.assertEqual(rescanned, ["blog/tom"])
+        self.assertIn("blog/tom/extra.md", markdown_files(new_index))
+
+    def test_removed_directory_is_dropped(self):
+        """Test that deleting a directory removes its pages from the index"""
+        index, _ = scan_content_dir(self.root)
+        os.remove(os.path.join(self.root, "blog", "tom", "index.md"))
+        os.remove(os.path.join(self.root, "blog", "tom", "notes.txt"))
+        os.rmdir(os.path.join(self.root, "blog", "tom"))
+        bump_mtime(os.path.join(self.root, "blog"))
+
+        new_index, _ = scan_content_dir(self.root, index)
+        self.assertEqual(markdown_files(new_index), ["index.md"])
+        self.assertNotIn("blog/tom", new_index["dirs"])
+
+    def test_index_for_other_root_is_ignored(self):
+        """Test that an index built for another directory is not reused"""
+        index, _ = scan_content_dir(self.root)
+        index["root"] = "/somewhere/else"
+        _, rescanned = scan_content_dir(self.root, index)
+        self.assertEqual(len(rescanned), 3)
+
+    def test_discover_persists_index(self):
+        """Test that discover_markdown_files writes and reuses the index file"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            index_path = os.path.join(cache_dir, "content_index.json")
+            first = discover_markdown_files(self.root, index_path)
+            self.assertTrue(os.path.exists(index_path))
+            second = discover_markdown_files(self.root, index_path)
+            self.assertEqual(first, second)
+
+
+if __name__ == "__main__":
+    unittest.main()
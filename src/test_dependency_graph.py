@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from dependency_graph import DependencyGraph
+
+
+class TestDependencyGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = DependencyGraph()
+        for page in ("a.md", "b.md", "c.md"):
+            self.graph.record(page, page)
+            self.graph.record(page, "template.html")
+        # a links to b, b links to an image
+        self.graph.record("a.md", "b.md")
+        self.graph.record("b.md", "static/images/tom.png")
+
+    def test_template_change_affects_every_page(self):
+        """Test that a shared input invalidates all pages reading it"""
+        self.assertEqual(self.graph.affected(["template.html"]), {"a.md", "b.md", "c.md"})
+
+    def test_source_change_affects_linking_pages(self):
+        """Test that a changed page invalidates pages linking to it"""
+        self.assertEqual(self.graph.affected(["b.md"]), {"a.md", "b.md"})
+
+    def test_asset_change_is_not_transitive(self):
+        """Test that an asset change only affects the pages that read it"""
+        self.assertEqual(self.graph.affected(["static/images/tom.png"]), {"b.md"})
+
+    def test_unknown_input_affects_nothing(self):
+        """Test that inputs no page read do not trigger rebuilds"""
+        self.assertEqual(self.graph.affected(["static/other.css"]), set())
+
+    def test_clear_page_removes_reverse_edges(self):
+        """Test that clearing a page drops it from every input it read"""
+        self.graph.clear_page("b.md")
+        self.assertNotIn("static/images/tom.png", self.graph.rdeps)
+        self.assertEqual(self.graph.affected(["template.html"]), {"a.md", "c.md"})
+
+    def test_round_trip(self):
+        """Test that a saved graph loads back with the same edges"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "graph.json")
+            self.graph.save(path)
+            loaded = DependencyGraph.load(path)
+        self.assertEqual(loaded.deps, self.graph.deps)
+        self.assertEqual(loaded.rdeps, self.graph.rdeps)
+
+    def test_load_missing_file(self):
+        """Test that a missing cache yields an empty graph"""
+        graph = DependencyGraph.load("/nonexistent/graph.json")
+        self.assertEqual(graph.deps, {})
+
+    def test_changed_inputs(self):
+        """Test that only inputs whose content changed are reported"""
+        with tempfile.TemporaryDirectory() as tmp:
+            kept = os.path.join(tmp, "kept.md")
+            edited = os.path.join(tmp, "edited.md")
+            touched = os.path.join(tmp, "touched.md")
+            for path in (kept, edited, touched):
+                with open(path, 'w') as f:
+                    f.write("# Title")
+
+            graph = DependencyGraph()
+            for path in (kept, edited, touched):
+                graph.record(path, path)
+            graph.stamp_inputs()
+
+            with open(edited, 'w') as f:
+                f.write("# New title")
+            os.utime(touched, ns=(1, 1))
+            self.assertEqual(graph.changed_inputs(), [edited])
+
+            os.remove(kept)
+            self.assertEqual(sorted(graph.changed_inputs()), sorted([kept, edited]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+import unittest
+from markdown_to_html_node import parse_markdown, markdown_to_html_node
+from extract_title import extract_title
+from page_index import PageIndex
+
+
+class TestDocumentInfo(unittest.TestCase):
+    def setUp(self):
+        self.md = """# Why Tom Bombadil Was a Mistake
+
+[< Back Home](/)
+
+![Tom Bombadil image](/images/tom.png)
+
+## Introduction
+
+> An _unpopular_ opinion, I know.
+
+- [Tom](/blog/tom)
+- plain item
+
+```
+code words are not counted
+```
+"""
+        self.node, self.info = parse_markdown(self.md)
+
+    def test_title(self):
+        """Test that the first h1 becomes the title"""
+        self.assertEqual(self.info.title, "Why Tom Bombadil Was a Mistake")
+
+    def test_headings(self):
+        """Test the heading outline"""
+        self.assertEqual(self.info.headings, [
+            (1, "Why Tom Bombadil Was a Mistake"),
+            (2, "Introduction"),
+        ])
+
+    def test_links_and_images(self):
+        """Test that links and images are collected in document order"""
+        self.assertEqual(self.info.links, ["/", "/blog/tom"])
+        self.assertEqual(self.info.images, [("Tom Bombadil image", "/images/tom.png")])
+        self.assertEqual(self.info.urls(), ["/", "/blog/tom", "/images/tom.png"])
+
+    def test_word_count(self):
+        """Test that prose words are counted, excluding code blocks"""
+        # 6 title + 3 link + 1 heading + 5 quote + 1 link + 2 item
+        self.assertEqual(self.info.word_count, 18)
+
+    def test_search_terms(self):
+        """Test that search terms come from prose text leaves, not code or image alt text"""
+        self.assertIn("bombadil", self.info.terms)
+        self.assertIn("unpopular", self.info.terms)
+        self.assertNotIn("code", self.info.terms)
+        self.assertNotIn("image", self.info.terms)
+
+    def test_title_matches_line_scan(self):
+        """Test that the parsed title is the one extract_title's line scan finds"""
+        samples = [
+            "# My Title\nintro line",
+            "Intro\n# Real Title",
+            "## Sub\n# Real Title\n\n# Later",
+            "  #  Hello World  ",
+            "Some content here.\n\n# My Title",
+            "- item\n\n> quote\n# Quoted Title",
+        ]
+        for markdown in samples:
+            _, info = parse_markdown(markdown)
+            self.assertEqual(extract_title(markdown, info), extract_title(markdown))
+
+    def test_heading_records_first_line(self):
+        """Test that a heading's continuation lines are not part of its text"""
+        _, info = parse_markdown("# My Title\nintro line\n\n## Part\nmore")
+        self.assertEqual(info.headings, [(1, "My Title"), (2, "Part")])
+
+    def test_extract_title_lookup(self):
+        """Test that extract_title reads the title from the parse"""
+        self.assertEqual(extract_title("ignored", self.info), "Why Tom Bombadil Was a Mistake")
+
+    def test_extract_title_lookup_without_h1(self):
+        """Test that a document without h1 still raises"""
+        _, info = parse_markdown("## Only h2")
+        with self.assertRaises(ValueError):
+            extract_title("## Only h2", info)
+
+    def test_heading_ids_off_by_default(self):
+        """Test that headings get no ids unless asked for"""
+        self.assertNotIn(' id="', self.node.to_html())
+        self.assertEqual(self.info.anchors, [])
+
+    def test_heading_ids_and_toc(self):
+        """Test slugged, de-duplicated ids and the nested table of contents"""
+        md = "# Title\n\n## Intro\n\n### **Bold** step\n\n## Intro\n\n## What?!"
+        node, info = parse_markdown(md, heading_ids=True)
+        html = node.to_html()
+        self.assertIn('<h1 id="title">Title</h1>', html)
+        self.assertIn('<h2 id="intro">Intro</h2>', html)
+        self.assertIn('<h3 id="bold-step"><b>Bold</b> step</h3>', html)
+        self.assertIn('<h2 id="intro-1">Intro</h2>', html)
+        self.assertIn('<h2 id="what">What?!</h2>', html)
+        self.assertEqual(
+            info.toc_html_node().to_html(),
+            '<nav class="toc"><ul>'
+            '<li><a href="#intro">Intro</a><ul><li><a href="#bold-step">Bold step</a></li></ul></li>'
+            '<li><a href="#intro-1">Intro</a></li>'
+            '<li><a href="#what">What?!</a></li>'
+            '</ul></nav>',
+        )
+
+    def test_toc_without_subheadings(self):
+        """Test that a page with only a title has no table of contents"""
+        _, info = parse_markdown("# Title", heading_ids=True)
+        self.assertIsNone(info.toc_html_node())
+
+    def test_reference_links(self):
+        """Test that reference links render and are collected like inline links"""
+        md = "# Title\n\nRead [about Tom][tom].\n\n[tom]: /blog/tom"
+        node, info = parse_markdown(md)
+        self.assertEqual(node.to_html(), '<div><h1>Title</h1><p>Read <a href="/blog/tom">about Tom</a>.</p></div>')
+        self.assertEqual(info.links, ["/blog/tom"])
+
+    def test_wiki_links(self):
+        """Test that wiki links resolve through the page index and unresolved ones are kept"""
+        index = PageIndex.build(["blog/tom/index.md", "blog/majesty/index.md"])
+        md = "See [[tom]], [[blog/majesty|the majesty]] and [[gandalf]]."
+        node, info = parse_markdown(md, page_index=index)
+        self.assertEqual(
+            node.to_html(),
+            '<div><p>See <a href="/blog/tom">tom</a>, <a href="/blog/majesty">the majesty</a> and gandalf.</p></div>',
+        )
+        self.assertEqual(info.wiki_links, [("tom", "blog/tom/index.md"), ("blog/majesty", "blog/majesty/index.md")])
+        self.assertEqual(info.unresolved_wiki_links, ["gandalf"])
+        self.assertEqual(info.links, ["/blog/tom", "/blog/majesty"])
+
+    def test_wiki_links_without_index(self):
+        """Test that wiki links stay literal text without a page index"""
+        node, _ = parse_markdown("See [[tom]].")
+        self.assertEqual(node.to_html(), "<div><p>See [[tom]].</p></div>")
+
+    def test_tolerant_diagnostics(self):
+        """Test that a tolerant parse renders bad delimiters as text and locates them"""
+        md = "# Title\n\nFine **bold** text\nthen an _unclosed one\n\n- item\n- a `tick"
+        with self.assertRaises(ValueError):
+            parse_markdown(md)
+        node, info = parse_markdown(md, path="page.md", tolerant=True, first_line=4)
+        self.assertIn("<p>Fine <b>bold</b> text then an _unclosed one</p>", node.to_html())
+        self.assertIn("<li>a `tick</li>", node.to_html())
+        self.assertEqual(info.diagnostics, [
+            ("page.md", 7, 9, "Unmatched delimiter '_'"),
+            ("page.md", 10, 5, "Unmatched delimiter '`'"),
+        ])
+
+    def test_definitions_keep_blocks_and_lines(self):
+        """Test that definition lines inside a block neither split it nor shift diagnostics"""
+        md = "- one [x]\n[x]: /u\n- two _open"
+        node, info = parse_markdown(md, path="page.md", tolerant=True)
+        self.assertEqual(node.to_html(), '<div><ul><li>one <a href="/u">x</a></li><li>two _open</li></ul></div>')
+        self.assertEqual(info.diagnostics, [("page.md", 3, 7, "Unmatched delimiter '_'")])
+
+    def test_tree_matches_markdown_to_html_node(self):
+        """Test that parse_markdown builds the same tree"""
+        self.assertEqual(self.node.to_html(), markdown_to_html_node(self.md).to_html())
+
+
+if __name__ == "__main__":
+    unittest.main()
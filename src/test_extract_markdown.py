@@ -1,5 +1,5 @@
 import unittest
-from extract_markdown import extract_markdown_images, extract_markdown_links
+from extract_markdown import extract_markdown_images, extract_markdown_links, extract_link_definitions
 
 
 class TestExtractMarkdown(unittest.TestCase):
@@ -163,6 +163,26 @@ class TestExtractMarkdown(unittest.TestCase):
         self.assertListEqual([], image_matches)
         self.assertListEqual([], link_matches)
 
+    
+    def test_extract_link_definitions(self):
+        """Test that definitions are collected and their lines removed"""
+        md = 'See [Tom][tom].\n\n[Tom]: /blog/tom "Tom"\n  [  the  Docs ]: <https://example.com/docs>\n[tom]: /ignored'
+        text, definitions = extract_link_definitions(md)
+        self.assertEqual(text, "See [Tom][tom].\n")
+        self.assertEqual(definitions, {"tom": "/blog/tom", "the docs": "https://example.com/docs"})
+    
+    def test_link_definitions_line_map(self):
+        """Test that the line map gives the source line of every kept line"""
+        line_map = []
+        text, _ = extract_link_definitions("- one [x]\n[x]: /u\n- two", line_map)
+        self.assertEqual(text, "- one [x]\n- two")
+        self.assertEqual(line_map, [0, 2])
+    
+    def test_link_definitions_in_code_block(self):
+        """Test that definition-like lines in fenced code are kept"""
+        md = "```\n[id]: /not-a-definition\n```"
+        self.assertEqual(extract_link_definitions(md), (md, {}))
+
 
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
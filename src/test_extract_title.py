@@ -1,5 +1,7 @@
+import os
+import tempfile
 import unittest
-from extract_title import extract_title
+from extract_title import extract_title, read_title
 
 
 class TestExtractTitle(unittest.TestCase):
@@ -97,5 +99,35 @@ class TestExtractTitle(unittest.TestCase):
         self.assertEqual(result, "Title with `code` in it")
 
 
+
+class TestReadTitle(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "page.md")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self, text):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return read_title(self.path)
+
+    def test_h1_line(self):
+        """Test that the first h1 line is read, as extract_title finds it"""
+        for text in ("# Hello", "Intro\n# Real Title\n# Later", "  #  Hello World  "):
+            self.assertEqual(self.read(text), extract_title(text))
+
+    def test_front_matter_title(self):
+        """Test that a front-matter title wins over the h1"""
+        self.assertEqual(self.read("---\nTitle: Front\n---\n# Body"), "Front")
+        self.assertEqual(self.read("---\nauthor: me\n---\n# Body"), "Body")
+
+    def test_no_title(self):
+        """Test that a page without a title (or with unclosed front matter) has none"""
+        self.assertIsNone(self.read("Just text"))
+        self.assertIsNone(self.read("---\ntitle: x\n# Body"))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,109 @@
+import json
+import os
+import tempfile
+import unittest
+from fingerprint_assets import (
+    fingerprint_name,
+    build_asset_manifest,
+    asset_url_map,
+    copy_fingerprinted_assets,
+    MANIFEST_NAME,
+    rewrite_asset_urls,
+    rewrite_template_urls,
+    template_urls,
+)
+from markdown_to_html_node import markdown_to_html_node
+
+
+class TestFingerprintAssets(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static = os.path.join(self.tmp.name, "static")
+        self.dest = os.path.join(self.tmp.name, "public")
+        os.makedirs(os.path.join(self.static, "images"))
+        with open(os.path.join(self.static, "index.css"), 'w') as f:
+            f.write("body {}")
+        with open(os.path.join(self.static, "images", "tom.png"), 'w') as f:
+            f.write("png")
+        self.records = {}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fingerprint_name(self):
+        """Test that the hash goes between name and extension"""
+        self.assertEqual(
+            fingerprint_name("images/tom.png", "0123456789abcdef"),
+            "images/tom.0123456789.png",
+        )
+
+    def test_manifest_covers_all_files(self):
+        """Test that every static file gets a fingerprinted name"""
+        manifest = build_asset_manifest(self.static, self.records)
+        self.assertEqual(sorted(manifest), ["images/tom.png", "index.css"])
+        self.assertRegex(manifest["index.css"], r"^index\.[0-9a-f]{10}\.css$")
+
+    def test_manifest_reuses_cached_hashes(self):
+        """Test that files with unchanged mtime and size are not re-hashed"""
+        build_asset_manifest(self.static, self.records)
+        self.records["index.css"][0] = "f" * 64
+        manifest = build_asset_manifest(self.static, self.records)
+        self.assertEqual(manifest["index.css"], "index.ffffffffff.css")
+
+    def test_changed_file_gets_new_name(self):
+        """Test that editing an asset changes its fingerprint"""
+        before = build_asset_manifest(self.static, self.records)
+        with open(os.path.join(self.static, "index.css"), 'w') as f:
+            f.write("body { color: red; }")
+        after = build_asset_manifest(self.static, self.records)
+        self.assertNotEqual(before["index.css"], after["index.css"])
+        self.assertEqual(before["images/tom.png"], after["images/tom.png"])
+
+    def test_copy_skips_existing(self):
+        """Test that already-present fingerprinted files are not copied again"""
+        manifest = build_asset_manifest(self.static, self.records)
+        self.assertEqual(copy_fingerprinted_assets(self.static, self.dest, manifest), 2)
+        self.assertTrue(os.path.exists(os.path.join(self.dest, manifest["images/tom.png"])))
+        self.assertEqual(copy_fingerprinted_assets(self.static, self.dest, manifest), 0)
+
+    def test_copy_removes_stale_assets(self):
+        """Test that fingerprinted files dropped from the manifest are deleted"""
+        before = build_asset_manifest(self.static, self.records)
+        copy_fingerprinted_assets(self.static, self.dest, before)
+        with open(os.path.join(self.dest, MANIFEST_NAME), 'w') as f:
+            json.dump(before, f)
+        stale = os.path.join(self.dest, before["index.css"])
+        with open(stale + ".gz", 'wb') as f:
+            f.write(b"gz")
+        with open(os.path.join(self.static, "index.css"), 'w') as f:
+            f.write("body { color: red; }")
+        after = build_asset_manifest(self.static, self.records)
+        copy_fingerprinted_assets(self.static, self.dest, after)
+        self.assertFalse(os.path.exists(stale))
+        self.assertFalse(os.path.exists(stale + ".gz"))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, after["index.css"])))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, after["images/tom.png"])))
+
+    def test_rewrite_tree_urls(self):
+        """Test that markdown image and link URLs are rewritten"""
+        url_map = asset_url_map({"images/tom.png": "images/tom.abc.png"})
+        node = markdown_to_html_node("![Tom](/images/tom.png) [home](/)")
+        rewrite_asset_urls(node, url_map)
+        self.assertEqual(
+            node.to_html(),
+            '<div><p><img src="/images/tom.abc.png" alt="Tom"></img> <a href="/">home</a></p></div>',
+        )
+
+    def test_rewrite_template_urls(self):
+        """Test that template href/src attributes are rewritten"""
+        url_map = asset_url_map({"index.css": "index.abc.css"})
+        template = '<link href="/index.css" rel="stylesheet" /><a href="/">Home</a>'
+        self.assertEqual(template_urls(template), ["/index.css", "/"])
+        self.assertEqual(
+            rewrite_template_urls(template, url_map),
+            '<link href="/index.abc.css" rel="stylesheet" /><a href="/">Home</a>',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+from front_matter import split_front_matter
+
+
+class TestFrontMatter(unittest.TestCase):
+    def test_no_front_matter(self):
+        """Test that documents without a header are returned unchanged"""
+        md = "# Title\n\nBody"
+        self.assertEqual(split_front_matter(md), ({}, md))
+
+    def test_parses_key_values(self):
+        """Test that key: value lines are parsed and removed from the body"""
+        md = "---\ntitle: Why Tom Bombadil Was a Mistake\nDate: 2024-01-02\ntags: tolkien, essays\n---\n# Tom\n"
+        metadata, body = split_front_matter(md)
+        self.assertEqual(metadata, {
+            "title": "Why Tom Bombadil Was a Mistake",
+            "date": "2024-01-02",
+            "tags": "tolkien, essays",
+        })
+        self.assertEqual(body, "# Tom\n")
+
+    def test_value_with_colon(self):
+        """Test that only the first colon separates key and value"""
+        metadata, _ = split_front_matter("---\nlink: https://example.com\n---\n")
+        self.assertEqual(metadata, {"link": "https://example.com"})
+
+    def test_blank_lines_ignored(self):
+        """Test that blank lines inside the header are skipped"""
+        metadata, _ = split_front_matter("---\n\ntitle: A\n\n---\nbody")
+        self.assertEqual(metadata, {"title": "A"})
+
+    def test_unclosed_header(self):
+        """Test that a header without a closing --- raises"""
+        with self.assertRaises(ValueError):
+            split_front_matter("---\ntitle: A\n# Body")
+
+    def test_invalid_line(self):
+        """Test that a line without a colon raises"""
+        with self.assertRaises(ValueError):
+            split_front_matter("---\njust text\n---\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
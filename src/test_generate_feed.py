@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from build_context import BuildContext
+from generate_feed import generate_feed, entry_updated
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+class TestEntryUpdated(unittest.TestCase):
+    def test_front_matter_date(self):
+        """Test that a front-matter date becomes an RFC 3339 timestamp"""
+        self.assertEqual(entry_updated({"date": "2024-05-01"}), "2024-05-01T00:00:00Z")
+
+    def test_missing_source(self):
+        """Test that an undated entry without a source falls back to the epoch"""
+        self.assertEqual(entry_updated({}), "1970-01-01T00:00:00Z")
+
+
+class TestGenerateFeed(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.public = os.path.join(self.tmp.name, "public")
+        self.state = os.path.join(self.tmp.name, "feeds.json")
+        self.context = BuildContext(
+            self.content, os.path.join(self.tmp.name, "static"),
+            feed_sections=["blog"], content_cache_dir=os.path.join(self.tmp.name, "rendered"),
+        )
+        for number in range(3):
+            self.add_post(number, f"<p>Post {number} & more</p>")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def add_post(self, number, html):
+        page = os.path.join(self.content, "blog", f"post{number}", "index.md")
+        record = self.context.record_metadata(
+            page, "", f"Post {number}", {"date": f"2024-01-0{number + 1}"}
+        )
+        self.context.store_content(page, record, html)
+
+    def generate(self, **kwargs):
+        return generate_feed(
+            "blog", self.public, "/", self.context,
+            site_url="https://example.com", state_path=self.state, **kwargs
+        )
+
+    def read_feed(self):
+        return ET.parse(os.path.join(self.public, "blog", "feed.xml")).getroot()
+
+    def test_entries(self):
+        """Test that entries are newest first and carry the stored body, escaped"""
+        self.assertTrue(self.generate())
+        entries = self.read_feed().findall(f"{ATOM}entry")
+        self.assertEqual([e.find(f"{ATOM}title").text for e in entries], ["Post 2", "Post 1", "Post 0"])
+        self.assertEqual(entries[0].find(f"{ATOM}id").text, "https://example.com/blog/post2")
+        self.assertEqual(entries[0].find(f"{ATOM}content").text, "<p>Post 2 & more</p>")
+
+    def test_entry_cap(self):
+        """Test that only the newest entries are kept"""
+        self.generate(max_entries=2)
+        self.assertEqual(len(self.read_feed().findall(f"{ATOM}entry")), 2)
+
+    def test_unchanged_feed_not_rewritten(self):
+        """Test that the feed is only rewritten when an entry changed"""
+        self.generate()
+        self.assertFalse(self.generate())
+        self.add_post(1, "<p>Edited</p>")
+        self.assertTrue(self.generate())
+
+    def test_only_feed_sections_stored(self):
+        """Test that bodies of pages outside feed sections are not kept"""
+        page = os.path.join(self.content, "about.md")
+        record = self.context.record_metadata(page, "", "About", {})
+        self.context.store_content(page, record, "<p>About</p>")
+        self.assertNotIn("content_sha", record)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+from build_context import BuildContext
+from generate_listings import listing_items, listing_url, listing_to_html_node, generate_listings
+
+
+def write_file(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+class TestListingHelpers(unittest.TestCase):
+    def test_items_newest_first(self):
+        """Test that dated posts come first, newest first, and the section page is skipped"""
+        records = [
+            {"title": "Blog", "url": "/blog"},
+            {"title": "Undated", "url": "/blog/undated"},
+            {"title": "Old", "url": "/blog/old", "date": "2020-01-01"},
+            {"title": "New", "url": "/blog/new", "date": "2024-05-01"},
+        ]
+        titles = [item["title"] for item in listing_items(records, "/blog")]
+        self.assertEqual(titles, ["New", "Old", "Undated"])
+
+    def test_listing_url(self):
+        """Test the URLs of the first and later listing pages"""
+        self.assertEqual(listing_url("/blog", 1, False), "/blog")
+        self.assertEqual(listing_url("/blog", 1, True), "/blog/page/1")
+        self.assertEqual(listing_url("/blog", 3, False), "/blog/page/3")
+
+    def test_html(self):
+        """Test the markup of a listing page"""
+        items = [{"title": "Tom", "url": "/blog/tom", "date": "2024-05-01", "description": ""}]
+        self.assertEqual(
+            listing_to_html_node(items, next_url="/blog/page/2").to_html(),
+            '<div><ul><li><a href="/blog/tom">Tom</a> <time>2024-05-01</time></li></ul>'
+            '<nav><a href="/blog/page/2" rel="next">Older posts</a></nav></div>',
+        )
+
+
+class TestGenerateListings(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.public = os.path.join(self.tmp.name, "public")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        self.state = os.path.join(self.tmp.name, "listings.json")
+        write_file(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        self.context = BuildContext(self.content, os.path.join(self.tmp.name, "static"))
+        for number in range(5):
+            page = os.path.join(self.content, "blog", f"post{number}", "index.md")
+            self.context.record_metadata(
+                page, "", f"Post {number}", {"date": f"2024-01-0{number + 1}"}
+            )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def generate(self):
+        return generate_listings(
+            "blog", self.template, self.public, "/", self.context, per_page=2, state_path=self.state
+        )
+
+    def test_pagination(self):
+        """Test that posts are split across linked listing pages"""
+        self.assertEqual(self.generate(), (3, 0))
+        with open(os.path.join(self.public, "blog", "index.html"), encoding='utf-8') as f:
+            first = f.read()
+        self.assertIn("<title>Blog</title>", first)
+        self.assertIn("Post 4", first)
+        self.assertIn('href="/blog/page/2"', first)
+        self.assertTrue(os.path.exists(os.path.join(self.public, "blog", "page", "3", "index.html")))
+        # Listing pages have their own counter, so "Pages written" counts content pages only
+        self.assertEqual(self.context.summary.written, 0)
+
+    def test_only_changed_pages_render(self):
+        """Test that a new post re-renders only the listing pages whose contents shift"""
+        self.generate()
+        self.context.record_metadata(
+            os.path.join(self.content, "blog", "post9", "index.md"), "", "Post 9", {"date": "2023-01-01"}
+        )
+        # The oldest post lands on page 3; pages 1 and 2 keep their posts but
+        # page 2's next link is unchanged, so only page 3 renders
+        self.assertEqual(self.generate(), (1, 2))
+
+    def test_stale_pages_removed(self):
+        """Test that listing pages past the new page count are deleted"""
+        self.generate()
+        for number in range(3, 5):
+            self.context.metadata.remove(os.path.join(self.content, "blog", f"post{number}", "index.md"))
+        self.generate()
+        self.assertFalse(os.path.exists(os.path.join(self.public, "blog", "page", "3", "index.html")))
+        self.assertTrue(os.path.exists(os.path.join(self.public, "blog", "index.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from generate_sitemap import generate_sitemap
+
+SITEMAP = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+
+
+class TestGenerateSitemap(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dest = self.tmp.name
+        self.source = os.path.join(self.tmp.name, "index.md")
+        with open(self.source, 'w', encoding='utf-8') as f:
+            f.write("# Home")
+        os.utime(self.source, (0, 86400))
+        self.records = [{"url": "/", "source": self.source}] + [
+            {"url": f"/blog/post{number}", "source": None} for number in range(5)
+        ]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def parse(self, name):
+        return ET.parse(os.path.join(self.dest, name)).getroot()
+
+    def test_single_file(self):
+        """Test that a small site gets one urlset with lastmod from the source mtime"""
+        self.assertEqual(generate_sitemap(self.dest, self.records, "https://example.com"), 1)
+        root = self.parse("sitemap.xml")
+        self.assertEqual(root.tag, f"{SITEMAP}urlset")
+        urls = root.findall(f"{SITEMAP}url")
+        self.assertEqual(len(urls), 6)
+        self.assertEqual(urls[0].find(f"{SITEMAP}loc").text, "https://example.com/")
+        self.assertEqual(urls[0].find(f"{SITEMAP}lastmod").text, "1970-01-02T00:00:00Z")
+        self.assertIsNone(urls[1].find(f"{SITEMAP}lastmod"))
+
+    def test_split_by_url_count(self):
+        """Test that passing the URL limit writes parts behind a sitemap index"""
+        self.assertEqual(generate_sitemap(self.dest, self.records, "https://example.com", max_urls=4), 2)
+        root = self.parse("sitemap.xml")
+        self.assertEqual(root.tag, f"{SITEMAP}sitemapindex")
+        locs = [loc.text for loc in root.iter(f"{SITEMAP}loc")]
+        self.assertEqual(locs, ["https://example.com/sitemap-1.xml", "https://example.com/sitemap-2.xml"])
+        self.assertEqual(len(self.parse("sitemap-2.xml").findall(f"{SITEMAP}url")), 2)
+
+    def test_split_by_size(self):
+        """Test that passing the byte limit starts a new part"""
+        parts = generate_sitemap(self.dest, self.records, "https://example.com", max_bytes=300)
+        self.assertGreater(parts, 1)
+        for number in range(1, parts + 1):
+            self.assertLessEqual(os.path.getsize(os.path.join(self.dest, f"sitemap-{number}.xml")), 300)
+
+    def test_stale_parts_removed(self):
+        """Test that parts from a larger previous build are deleted"""
+        generate_sitemap(self.dest, self.records, "https://example.com", max_urls=2)
+        generate_sitemap(self.dest, self.records[:1], "https://example.com", max_urls=2)
+        self.assertEqual(self.parse("sitemap.xml").tag, f"{SITEMAP}urlset")
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "sitemap-1.xml")))
+
+
+if __name__ == "__main__":
+    unittest.main()
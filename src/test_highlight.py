@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from highlight import highlight, highlight_spans, Highlighter
+import highlight as highlight_module
+
+
+class TestHighlight(unittest.TestCase):
+    def test_python_tokens(self):
+        """Test that Python is tokenized with tokenize and escaped"""
+        html = highlight('def f(x):  # hi\n    return len(x) + 1, "a<b"\n', "python")
+        self.assertIn('<span class="k">def</span> f', html)
+        self.assertIn('<span class="c"># hi</span>', html)
+        self.assertIn('<span class="nb">len</span>', html)
+        self.assertIn('<span class="m">1</span>', html)
+        self.assertIn('<span class="s">"a&lt;b"</span>', html)
+
+    def test_incomplete_python(self):
+        """Test that an unclosed bracket leaves the rest plain instead of failing"""
+        code = "print((1,\n"
+        self.assertEqual("".join(text for _, text in highlight_spans(code, "py")), code)
+
+    def test_spans_join_back_to_code(self):
+        """Test that every lexer keeps all of the code"""
+        samples = {
+            "bash": 'if [ -n "$HOME" ]; then echo hi # c\nfi',
+            "json": '{"a": [1, -2.5e3, true, null, "x"]}',
+            "html": '<!-- c --><a href="/x" class=\'y\'>T &amp; t</a>',
+            "css": "@media (max-width: 600px) { a:hover { color: #fff; } }",
+        }
+        for language, code in samples.items():
+            spans = highlight_spans(code, language)
+            self.assertEqual("".join(text for _, text in spans), code, language)
+
+    def test_languages(self):
+        """Test a characteristic token of each regex lexer"""
+        self.assertIn('<span class="nv">$HOME</span>', highlight('echo $HOME', "sh"))
+        self.assertIn('<span class="na">"a"</span>', highlight('{"a": 1}', "json"))
+        self.assertIn('<span class="na">href</span>', highlight('<a href="/">x</a>', "html"))
+        self.assertIn('<span class="na">color</span>', highlight("a { color: red; }", "css"))
+
+    def test_unknown_language(self):
+        """Test that unknown languages are not highlighted"""
+        self.assertIsNone(highlight("x", "brainfuck"))
+
+    def test_disk_cache(self):
+        """Test that a second build reads the cached result instead of tokenizing"""
+        with tempfile.TemporaryDirectory() as tmp:
+            first = Highlighter(tmp).highlight("x = 1", "python")
+            self.assertEqual(len(os.listdir(tmp)), 1)
+            with mock.patch.object(highlight_module, "highlight", side_effect=AssertionError):
+                self.assertEqual(Highlighter(tmp).highlight("x = 1", "python"), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
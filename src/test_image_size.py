@@ -0,0 +1,110 @@
+import os
+import struct
+import tempfile
+import unittest
+from unittest import mock
+import image_size
+from image_size import read_image_size, cached_image_size, add_image_attributes
+from leafnode import LeafNode
+from parentnode import ParentNode
+
+
+def png(width, height):
+    return b'\x89PNG\r\n\x1a\n' + struct.pack('>I4sII', 13, b'IHDR', width, height) + b'\x08\x06\x00\x00\x00'
+
+
+def jpeg(width, height):
+    app0 = b'\xff\xe0' + struct.pack('>H', 16) + b'JFIF\x00' + b'\x00' * 9
+    sof0 = b'\xff\xc0' + struct.pack('>HBHH', 17, 8, height, width) + b'\x00' * 10
+    return b'\xff\xd8' + app0 + sof0 + b'\xff\xd9'
+
+
+class TestReadImageSize(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def size_of(self, data):
+        path = os.path.join(self.tmp.name, "image")
+        with open(path, 'wb') as f:
+            f.write(data)
+        return read_image_size(path)
+
+    def test_png(self):
+        """Test PNG size from the IHDR chunk"""
+        self.assertEqual(self.size_of(png(640, 480)), (640, 480))
+
+    def test_gif(self):
+        """Test GIF size from the logical screen descriptor"""
+        self.assertEqual(self.size_of(b'GIF89a' + struct.pack('<HH', 32, 16) + b'\x00' * 20), (32, 16))
+
+    def test_jpeg(self):
+        """Test JPEG size from the first start-of-frame segment"""
+        self.assertEqual(self.size_of(jpeg(1024, 768)), (1024, 768))
+
+    def test_webp_lossy(self):
+        """Test lossy WebP size from the VP8 frame header"""
+        data = b'RIFF\x00\x00\x00\x00WEBPVP8 ' + b'\x00' * 10 + struct.pack('<HH', 300, 200)
+        self.assertEqual(self.size_of(data), (300, 200))
+
+    def test_webp_lossless(self):
+        """Test lossless WebP size from the VP8L bit fields"""
+        bits = (300 - 1) | ((200 - 1) << 14)
+        data = b'RIFF\x00\x00\x00\x00WEBPVP8L' + b'\x00' * 5 + struct.pack('<I', bits) + b'\x00' * 5
+        self.assertEqual(self.size_of(data), (300, 200))
+
+    def test_webp_extended(self):
+        """Test extended WebP size from the VP8X canvas"""
+        data = b'RIFF\x00\x00\x00\x00WEBPVP8X' + b'\x00' * 8 + (299).to_bytes(3, 'little') + (199).to_bytes(3, 'little')
+        self.assertEqual(self.size_of(data), (300, 200))
+
+    def test_unknown(self):
+        """Test that a file that is not a supported image has no size"""
+        self.assertIsNone(self.size_of(b'placeholder text'))
+
+
+    def test_truncated(self):
+        """Test that images cut off inside their header have no size"""
+        self.assertIsNone(self.size_of(b'GIF89a\x01\x00'))
+        self.assertIsNone(self.size_of(png(640, 480)[:16]))
+        self.assertIsNone(self.size_of(png(640, 480)[:20]))
+        self.assertIsNone(self.size_of(jpeg(1024, 768)[:25]))
+
+
+class TestImageAttributes(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "tom.png")
+        with open(self.path, 'wb') as f:
+            f.write(png(640, 480))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_cache_avoids_reopening(self):
+        """Test that an unchanged image is not read again"""
+        records = {}
+        self.assertEqual(cached_image_size(self.path, records), (640, 480))
+        with mock.patch.object(image_size, "read_image_size") as read:
+            self.assertEqual(cached_image_size(self.path, records), (640, 480))
+            read.assert_not_called()
+
+    def test_attributes(self):
+        """Test that images get dimensions when found, and lazy loading either way"""
+        node = ParentNode("p", [
+            LeafNode("img", "", {"src": "/images/tom.png", "alt": "Tom"}),
+            LeafNode("img", "", {"src": "https://example.com/x.png", "alt": "X"}),
+        ])
+        paths = {"/images/tom.png": self.path}
+        add_image_attributes(node, paths.get, {})
+        self.assertEqual(
+            node.to_html(),
+            '<p><img src="/images/tom.png" alt="Tom" width="640" height="480" loading="lazy" decoding="async"></img>'
+            '<img src="https://example.com/x.png" alt="X" loading="lazy" decoding="async"></img></p>',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
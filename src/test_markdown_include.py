@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+from markdown_include import FragmentCache
+from markdown_to_html_node import parse_markdown
+from markdown_to_blocks import markdown_to_blocks
+
+
+class TestMarkdownInclude(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.write("snippets/_warning.md", "> **Warning:** see [the docs](/docs)\n\n{% include \"_note.md\" %}")
+        self.write("snippets/_note.md", "A short note")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, rel_path, text):
+        path = os.path.join(self.dir, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def parse(self, rel_path, text, includes, heading_ids=False):
+        path = self.write(rel_path, text)
+        return parse_markdown(text, heading_ids=heading_ids, includes=includes, path=path)
+
+    def test_include(self):
+        """Test that a fragment (and the fragment it includes) renders in place"""
+        node, info = self.parse("page.md", "# Page\n\n{% include \"snippets/_warning.md\" %}\n\nAfter", FragmentCache())
+        self.assertEqual(
+            node.to_html(),
+            '<div><h1>Page</h1><blockquote><b>Warning:</b> see <a href="/docs">the docs</a></blockquote>'
+            '<p>A short note</p><p>After</p></div>',
+        )
+        self.assertEqual(info.links, ["/docs"])
+        self.assertEqual(info.word_count, 1 + 4 + 3 + 1)
+        self.assertEqual(info.includes, [
+            os.path.join(self.dir, "snippets", "_warning.md"),
+            os.path.join(self.dir, "snippets", "_note.md"),
+        ])
+
+    def test_fragment_parsed_once(self):
+        """Test that every page shares the nodes of a fragment parsed once"""
+        includes = FragmentCache()
+        first, _ = self.parse("a.md", "{% include 'snippets/_note.md' %}", includes)
+        second, _ = self.parse("b.md", "{% include 'snippets/_note.md' %}", includes)
+        self.assertIs(first.children[0], second.children[0])
+        self.assertEqual(len(includes.fragments), 1)
+
+    def test_fragment_heading_ids_unique(self):
+        """Test that a fragment heading whose id the page already uses gets a new one on that page only"""
+        self.write("_intro.md", "## Intro\n\nShared")
+        includes = FragmentCache(heading_ids=True)
+        node, info = self.parse("page.md", "## Intro\n\n{% include \"_intro.md\" %}", includes, True)
+        self.assertEqual(node.to_html(), '<div><h2 id="intro">Intro</h2><h2 id="intro-1">Intro</h2><p>Shared</p></div>')
+        self.assertEqual([anchor for _, _, anchor in info.anchors], ["intro", "intro-1"])
+        node, _ = self.parse("other.md", "{% include \"_intro.md\" %}", includes, True)
+        self.assertEqual(node.to_html(), '<div><h2 id="intro">Intro</h2><p>Shared</p></div>')
+
+    def test_cycle(self):
+        """Test that an include cycle is reported instead of recursing forever"""
+        self.write("_a.md", "{% include \"_b.md\" %}")
+        self.write("_b.md", "{% include \"_a.md\" %}")
+        with self.assertRaisesRegex(ValueError, "include cycle"):
+            self.parse("page.md", "{% include \"_a.md\" %}", FragmentCache())
+
+    def test_directive_without_resolver(self):
+        """Test that the directive is an ordinary block when includes are not resolved"""
+        self.assertEqual(markdown_to_blocks("{% include \"x.md\" %}"), ["{% include \"x.md\" %}"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
-from markdown_to_html_node import markdown_to_html_node
+from markdown_to_html_node import markdown_to_html_node, parse_markdown
+from highlight import Highlighter
 
 
 class TestMarkdownToHTMLNode(unittest.TestCase):
@@ -213,6 +214,21 @@ Final paragraph."""
         self.assertNotIn("<i>italic</i>", html)
         self.assertNotIn("<code>code</code>", html)
 
+    
+    def test_code_block_info_string(self):
+        """Test that the info string becomes a language class instead of code text"""
+        md = "```python\nx = 1\n```"
+        html = markdown_to_html_node(md).to_html()
+        self.assertEqual(html, '<div><pre><code class="language-python">x = 1\n</code></pre></div>')
+    
+    def test_code_block_highlighting(self):
+        """Test that a highlighter highlights code blocks that name a language"""
+        md = "```python\nx = 1\n```\n\n```\nplain <b>\n```"
+        node, _ = parse_markdown(md, highlighter=Highlighter())
+        html = node.to_html()
+        self.assertIn('<code class="language-python">x <span class="o">=</span> <span class="m">1</span>', html)
+        self.assertIn("<code>plain <b>\n</code>", html)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+from metadata_index import MetadataIndex, page_url
+
+
+class TestPageUrl(unittest.TestCase):
+    def test_urls(self):
+        """Test URL derivation for index and named pages"""
+        self.assertEqual(page_url("index.md"), "/")
+        self.assertEqual(page_url("blog/tom/index.md"), "/blog/tom")
+        self.assertEqual(page_url("notes.md"), "/notes.html")
+
+
+class TestMetadataIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = MetadataIndex()
+        self.index.update("content/index.md", {"title": "Home", "url": "/"})
+        self.index.update("content/blog/tom/index.md", {"title": "Tom", "url": "/blog/tom"})
+        self.index.update("content/blog/majesty/index.md", {"title": "Majesty", "url": "/blog/majesty"})
+
+    def test_section(self):
+        """Test listing the pages of one section"""
+        titles = [record["title"] for record in self.index.pages("/blog")]
+        self.assertEqual(titles, ["Majesty", "Tom"])
+
+    def test_remove(self):
+        """Test that removed pages disappear from listings"""
+        self.index.remove("content/blog/tom/index.md")
+        self.assertEqual(len(self.index.pages()), 2)
+
+    def test_round_trip(self):
+        """Test that a saved index loads back"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metadata.json")
+            self.index.save(path)
+            self.assertEqual(MetadataIndex.load(path).records, self.index.records)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import minify_css
+from minify_css import minify_css as minify, split_rules, critical_css, cached_minify_css
+
+
+class TestMinifyCss(unittest.TestCase):
+    def test_whitespace_and_comments(self):
+        """Test that comments, indentation and the last semicolon of a block go"""
+        css = "/* base */\nbody {\n  color: #fff;\n  margin: 0;\n}\n\nh1,\nh2 > a {\n  color: red;\n}\n"
+        self.assertEqual(minify(css), "body{color:#fff;margin:0}h1,h2>a{color:red}")
+
+    def test_strings_preserved(self):
+        """Test that strings keep their spacing and comment-like contents"""
+        css = 'a::before { content: "  /* x */  "; }'
+        self.assertEqual(minify(css), 'a::before{content:"  /* x */  "}')
+
+    def test_significant_spaces_kept(self):
+        """Test that spaces calc() and descendant selectors need survive"""
+        self.assertEqual(minify("div p { width: calc(100% - 2px); }"), "div p{width:calc(100% - 2px)}")
+
+
+class TestCriticalCss(unittest.TestCase):
+    def test_split_rules(self):
+        """Test that @media blocks and statements are single rules"""
+        css = '@import "x.css";a{color:red}@media (max-width:600px){a{color:blue}b{margin:0}}'
+        self.assertEqual(split_rules(css), [
+            '@import "x.css";', "a{color:red}", "@media (max-width:600px){a{color:blue}b{margin:0}}",
+        ])
+
+    def test_small_stylesheet_is_complete(self):
+        """Test that a stylesheet under the cap is inlined whole"""
+        self.assertEqual(critical_css("a{color:red}", 100), ("a{color:red}", True))
+
+    def test_capped_portion(self):
+        """Test that only whole leading rules within the cap are kept"""
+        self.assertEqual(critical_css("a{color:red}b{color:blue}", 15), ("a{color:red}", False))
+
+    def test_cache_by_content_hash(self):
+        """Test that a stylesheet seen before is not minified again"""
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertEqual(cached_minify_css("a { color: red; }", tmp), "a{color:red}")
+            with mock.patch.object(minify_css, "minify_css") as minifier:
+                self.assertEqual(cached_minify_css("a { color: red; }", tmp), "a{color:red}")
+                minifier.assert_not_called()
+            self.assertEqual(len(os.listdir(tmp)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
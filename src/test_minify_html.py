@@ -0,0 +1,59 @@
+import unittest
+from minify_html import Minifier, minify_template
+from markdown_to_html_node import markdown_to_html_node
+
+
+class TestMinifier(unittest.TestCase):
+    def test_collapses_whitespace_in_text(self):
+        """Test that whitespace runs in text leaves collapse to one space"""
+        minifier = Minifier()
+        self.assertEqual(minifier.text("a  \n  b"), "a b")
+        self.assertEqual(minifier.saved, 4)
+
+    def test_keeps_no_break_space(self):
+        """Test that non-ASCII spaces are left alone"""
+        minifier = Minifier()
+        self.assertEqual(minifier.text("a  b"), "a  b")
+        self.assertEqual(minifier.saved, 0)
+
+    def test_preserves_code_blocks(self):
+        """Test that <pre><code> and inline code keep their whitespace"""
+        md = "> quoted\n> text   here\n\n```\ndef f():\n    return  1\n```\n\nsome `a  b` code"
+        node = markdown_to_html_node(md)
+        minifier = Minifier()
+        html = node.to_html(minifier)
+        self.assertIn("<blockquote>quoted text here</blockquote>", html)
+        self.assertIn("<pre><code>def f():\n    return  1\n</code></pre>", html)
+        self.assertIn("<code>a  b</code>", html)
+        self.assertEqual(minifier.saved, 2)
+
+    def test_without_minifier_output_is_unchanged(self):
+        """Test that the default serializer output is not affected"""
+        node = markdown_to_html_node("> quoted\n> text")
+        self.assertEqual(node.to_html(), "<div><blockquote>quoted\ntext</blockquote></div>")
+
+
+class TestMinifyTemplate(unittest.TestCase):
+    def test_removes_indentation_and_comments(self):
+        """Test that indentation between tags and comments are removed"""
+        template = "<html>\n  <head>\n    <!-- note -->\n    <title>{{ Title }}</title>\n  </head>\n</html>\n"
+        self.assertEqual(
+            minify_template(template),
+            "<html><head><title>{{ Title }}</title></head></html>",
+        )
+
+    def test_keeps_inline_spaces(self):
+        """Test that a single space between inline tags is kept"""
+        self.assertEqual(minify_template("<b>a</b> <i>b</i>"), "<b>a</b> <i>b</i>")
+
+    def test_preserves_pre_blocks(self):
+        """Test that <pre> blocks in templates are not touched"""
+        template = "<div>\n  <pre>\n  keep   this\n  </pre>\n</div>"
+        self.assertEqual(
+            minify_template(template),
+            "<div><pre>\n  keep   this\n  </pre></div>",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
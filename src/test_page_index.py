@@ -0,0 +1,39 @@
+import unittest
+from page_index import PageIndex
+
+
+class TestPageIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = PageIndex.build(
+            ["index.md", "blog/tom/index.md", "blog/majesty/index.md", "notes/tom.md", "about.md"],
+            {"blog/majesty/index.md": "Why Glorfindel Is More Impressive"},
+        )
+
+    def test_path(self):
+        """Test that pages resolve by path, ignoring case and slashes"""
+        self.assertEqual(self.index.resolve("blog/majesty"), ("/blog/majesty", "blog/majesty/index.md"))
+        self.assertEqual(self.index.resolve("/Blog/Tom/"), ("/blog/tom", "blog/tom/index.md"))
+        self.assertEqual(self.index.resolve("notes/tom"), ("/notes/tom.html", "notes/tom.md"))
+        self.assertEqual(self.index.resolve("index"), ("/", "index.md"))
+
+    def test_short_names(self):
+        """Test that a unique last segment or title names its page"""
+        self.assertEqual(self.index.resolve("about")[0], "/about.html")
+        self.assertEqual(self.index.resolve("majesty")[0], "/blog/majesty")
+        self.assertEqual(self.index.resolve("Why Glorfindel is more impressive")[0], "/blog/majesty")
+
+    def test_ambiguous_name(self):
+        """Test that a name shared by two pages resolves to neither"""
+        self.assertIsNone(self.index.resolve("tom"))
+
+    def test_fragment(self):
+        """Test that a #fragment is slugged like heading ids"""
+        self.assertEqual(self.index.resolve("majesty#A Gripping Tale")[0], "/blog/majesty#a-gripping-tale")
+
+    def test_unknown(self):
+        """Test that an unknown name does not resolve"""
+        self.assertIsNone(self.index.resolve("gandalf"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import json
+import os
+import tempfile
+import unittest
+from search_index import SearchIndex, tokenize, encode_postings, decode_postings
+
+
+class TestPostings(unittest.TestCase):
+    def test_round_trip(self):
+        """Test that delta/varint postings decode to the original ids"""
+        ids = [0, 1, 5, 127, 128, 300, 100000]
+        self.assertEqual(decode_postings(encode_postings(ids)), ids)
+
+    def test_dense_postings_are_one_byte_each(self):
+        """Test that consecutive ids cost one byte per page"""
+        self.assertEqual(encode_postings([0, 1, 2]), "AAEB")
+
+    def test_tokenize(self):
+        """Test that terms are lowercase words"""
+        self.assertEqual(tokenize("Tom Bombadil's house!"), ["tom", "bombadil", "s", "house"])
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dest = self.tmp.name
+        self.index = SearchIndex()
+        self.index.update("tom.md", "/blog/tom", "Tom", ["tom", "bombadil", "river"])
+        self.index.update("rivendell.md", "/blog/rivendell", "Rivendell", ["rivendell", "river"])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_shard(self, key):
+        with open(os.path.join(self.dest, "search", key + ".json"), encoding='utf-8') as f:
+            return {term: decode_postings(data) for term, data in json.load(f).items()}
+
+    def test_shards(self):
+        """Test that terms land in their prefix shard with every page that has them"""
+        self.index.write(self.dest)
+        self.assertEqual(self.read_shard("ri"), {"river": [0, 1], "rivendell": [1]})
+        with open(os.path.join(self.dest, "search", "pages.json"), encoding='utf-8') as f:
+            self.assertEqual(json.load(f)["0"], ["/blog/tom", "Tom"])
+
+    def test_update_rewrites_only_touched_shards(self):
+        """Test that re-indexing a page only dirties shards of terms it gained or lost"""
+        self.index.write(self.dest)
+        self.index.update("tom.md", "/blog/tom", "Tom", ["tom", "bombadil", "goldberry"])
+        self.assertEqual(self.index.write(self.dest), 2)
+        self.assertEqual(self.read_shard("ri"), {"river": [1], "rivendell": [1]})
+        self.assertEqual(self.read_shard("go"), {"goldberry": [0]})
+
+    def test_remove_deletes_empty_shards(self):
+        """Test that a shard file disappears when its last term goes"""
+        self.index.write(self.dest)
+        self.index.remove("tom.md")
+        self.index.write(self.dest)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "search", "to.json")))
+
+    def test_persisted_round_trip(self):
+        """Test that a loaded index keeps page ids and postings"""
+        self.index.write(self.dest, "/site/")
+        path = os.path.join(self.tmp.name, "search_index.json")
+        self.index.save(path)
+        loaded = SearchIndex.load(path)
+        self.assertEqual(loaded.shards, self.index.shards)
+        loaded.update("new.md", "/new.html", "New", ["river"])
+        self.assertEqual(loaded.shards["ri"]["river"], [0, 1, 2])
+        self.assertEqual(loaded.write(self.dest, "/site/"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import json
+import os
+import tempfile
+import unittest
+from service_worker import precache_entries, write_service_worker
+
+
+def write_file(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("x" * size)
+
+
+class TestPrecache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dest = self.tmp.name
+        self.page = os.path.join(self.dest, "blog", "tom", "index.html")
+        write_file(self.page, 100)
+        write_file(os.path.join(self.dest, "index.css"), 50)
+        write_file(os.path.join(self.dest, "images", "big.png"), 400)
+        write_file(os.path.join(self.dest, "images", "small.png"), 200)
+        write_file(os.path.join(self.dest, "index.css.gz"), 10)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def urls(self, entries):
+        return [entry["url"] for entry in entries]
+
+    def test_known_revision_used(self):
+        """Test that a matching hash record is used instead of reading the file"""
+        st = os.stat(self.page)
+        revisions = {os.path.normpath(self.page): ["ab" * 32, st.st_mtime_ns, st.st_size]}
+        entries = precache_entries(self.dest, revisions, "/site/")
+        page = next(entry for entry in entries if entry["url"] == "/site/blog/tom/index.html")
+        self.assertEqual(page["revision"], "ab" * 8)
+
+    def test_stale_revision_ignored(self):
+        """Test that a record whose stat no longer matches is not trusted"""
+        revisions = {os.path.normpath(self.page): ["ab" * 32, 0, 0]}
+        page = next(entry for entry in precache_entries(self.dest, revisions) if "tom" in entry["url"])
+        self.assertNotEqual(page["revision"], "ab" * 8)
+
+    def test_budgets(self):
+        """Test the per-file cap and that pages and CSS win the total budget"""
+        entries = precache_entries(self.dest, {}, max_file_bytes=300, budget=400)
+        self.assertEqual(self.urls(entries), ["/blog/tom/index.html", "/images/small.png", "/index.css"])
+        entries = precache_entries(self.dest, {}, budget=200)
+        self.assertEqual(self.urls(entries), ["/blog/tom/index.html", "/index.css"])
+
+    def test_pages_and_assets_only(self):
+        """Test that build metadata and precompressed files are not precached"""
+        write_file(os.path.join(self.dest, "search", "a.json"), 10)
+        write_file(os.path.join(self.dest, "sitemap.xml"), 10)
+        write_file(os.path.join(self.dest, "feed.xml"), 10)
+        write_file(os.path.join(self.dest, "backlinks.json"), 10)
+        write_file(os.path.join(self.dest, "sw.js"), 10)
+        self.assertEqual(self.urls(precache_entries(self.dest, {})), [
+            "/blog/tom/index.html", "/images/big.png", "/images/small.png", "/index.css",
+        ])
+
+    def test_rewritten_file_keeps_revision(self):
+        """Test that a file rewritten with the same bytes keeps its revision and worker"""
+        records = {}
+        entries = precache_entries(self.dest, {}, records=records)
+        self.assertIn(os.path.normpath(self.page), records)
+        write_service_worker(self.dest, entries)
+        st = os.stat(self.page)
+        write_file(self.page, 100)
+        os.utime(self.page, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        again = precache_entries(self.dest, {}, records=records)
+        self.assertEqual(again, entries)
+        self.assertFalse(write_service_worker(self.dest, again))
+        self.assertEqual(records[os.path.normpath(self.page)][1], st.st_mtime_ns + 10 ** 9)
+
+    def test_write_if_changed(self):
+        """Test that the worker is versioned by the manifest and only rewritten when it changes"""
+        entries = precache_entries(self.dest, {})
+        self.assertTrue(write_service_worker(self.dest, entries))
+        self.assertFalse(write_service_worker(self.dest, entries))
+        with open(os.path.join(self.dest, "sw.js"), encoding='utf-8') as f:
+            self.assertIn('"/index.css"', f.read())
+        with open(os.path.join(self.dest, "precache-manifest.json"), encoding='utf-8') as f:
+            self.assertEqual(json.load(f), entries)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,24 @@
+import unittest
+from slugify import slugify
+
+
+class TestSlugify(unittest.TestCase):
+    def test_words(self):
+        """Test that words are lowercased and joined by hyphens"""
+        self.assertEqual(slugify("Why Tom Bombadil Was a Mistake"), "why-tom-bombadil-was-a-mistake")
+
+    def test_punctuation(self):
+        """Test that punctuation runs collapse and trailing hyphens are dropped"""
+        self.assertEqual(slugify("  Q&A: what's next?  "), "q-a-what-s-next")
+
+    def test_unicode(self):
+        """Test that non-ASCII letters are kept"""
+        self.assertEqual(slugify("Éowyn and Théoden"), "éowyn-and-théoden")
+
+    def test_empty(self):
+        """Test that text without word characters gets a fallback slug"""
+        self.assertEqual(slugify("?!"), "section")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -232,5 +232,27 @@ class TestSplitNodesDelimiter(unittest.TestCase):
         self.assertEqual(new_nodes[0].text_type, TextType.BOLD)
 
 
+    def test_tolerant_unmatched_delimiter(self):
+        """Test that a tolerant split keeps an unmatched delimiter as text and reports it"""
+        problems = []
+        node = TextNode("a **b** and snake_case **c", TextType.TEXT)
+        new_nodes = split_nodes_delimiter([node], "**", TextType.BOLD, problems)
+        self.assertListEqual([
+            TextNode("a ", TextType.TEXT),
+            TextNode("b", TextType.BOLD),
+            TextNode(" and snake_case **c", TextType.TEXT),
+        ], new_nodes)
+        self.assertEqual(problems, [(node.text, 23, "Unmatched delimiter '**'")])
+
+    def test_tolerant_empty_delimiters(self):
+        """Test that a tolerant split keeps an empty pair as text and reports it"""
+        problems = []
+        node = TextNode("x `` y", TextType.TEXT)
+        new_nodes = split_nodes_delimiter([node], "`", TextType.CODE, problems)
+        self.assertEqual("".join(n.text for n in new_nodes), "x `` y")
+        self.assertTrue(all(n.text_type == TextType.TEXT for n in new_nodes))
+        self.assertEqual(problems, [(node.text, 2, "Empty content between '`' delimiters")])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 from textnode import TextNode, TextType
-from split_nodes_image_link import split_nodes_image, split_nodes_link
+from split_nodes_image_link import split_nodes_image, split_nodes_link, split_nodes_reference, split_nodes_wiki
 
 
 class TestSplitNodesImage(unittest.TestCase):
@@ -419,6 +419,40 @@ class TestSplitNodesLink(unittest.TestCase):
         ]
         self.assertListEqual(expected, link_nodes)
 
+    
+    def test_split_reference_links(self):
+        """Test full, collapsed and shortcut references, and an image reference"""
+        definitions = {"tom": "/blog/tom", "glorfindel": "/blog/glorfindel", "pic": "/images/tom.png"}
+        node = TextNode("[Tom][tom], [Glorfindel][], [glorfindel], ![A pic][pic] and [unknown]", TextType.TEXT)
+        self.assertListEqual([
+            TextNode("Tom", TextType.LINK, "/blog/tom"),
+            TextNode(", ", TextType.TEXT),
+            TextNode("Glorfindel", TextType.LINK, "/blog/glorfindel"),
+            TextNode(", ", TextType.TEXT),
+            TextNode("glorfindel", TextType.LINK, "/blog/glorfindel"),
+            TextNode(", ", TextType.TEXT),
+            TextNode("A pic", TextType.IMAGE, "/images/tom.png"),
+            TextNode(" and [unknown]", TextType.TEXT),
+        ], split_nodes_reference([node], definitions))
+    
+    def test_split_reference_without_definitions(self):
+        """Test that nodes pass through untouched when nothing is defined"""
+        nodes = [TextNode("[Tom][tom]", TextType.TEXT)]
+        self.assertIs(split_nodes_reference(nodes, {}), nodes)
+
+    
+    def test_split_wiki_links(self):
+        """Test wiki links with and without labels, and an unresolved one"""
+        pages = {"tom": "/blog/tom", "blog/majesty": "/blog/majesty"}
+        node = TextNode("[[tom]], [[blog/majesty|Glorfindel]] and [[gandalf|Gandalf]]!", TextType.TEXT)
+        self.assertListEqual([
+            TextNode("tom", TextType.LINK, "/blog/tom"),
+            TextNode(", ", TextType.TEXT),
+            TextNode("Glorfindel", TextType.LINK, "/blog/majesty"),
+            TextNode(" and Gandalf", TextType.TEXT),
+            TextNode("!", TextType.TEXT),
+        ], split_nodes_wiki([node], pages.get))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,117 @@
+import os
+import tempfile
+import unittest
+from template_engine import compile_template
+
+
+class TestTemplateEngine(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.cache_dir = os.path.join(self.root, "cache")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def test_title_and_content_placeholders(self):
+        """Test that the original {{ Title }} / {{ Content }} slots still work"""
+        path = self.write("template.html", "<title>{{ Title }}</title><article>{{ Content }}</article>")
+        html = compile_template(path).render({"Title": "Tom", "Content": "<p>hi</p>"})
+        self.assertEqual(html, "<title>Tom</title><article><p>hi</p></article>")
+
+    def test_missing_variable_renders_empty(self):
+        """Test that unknown variables render as nothing"""
+        path = self.write("template.html", "[{{ missing }}]")
+        self.assertEqual(compile_template(path).render({}), "[]")
+
+    def test_loop_with_attributes(self):
+        """Test loops over lists of dicts with dotted lookups"""
+        path = self.write(
+            "template.html",
+            "<ul>{% for post in posts %}<li>{{ post.title }} ({{ site.name }})</li>{% endfor %}</ul>",
+        )
+        html = compile_template(path).render({
+            "posts": [{"title": "Tom"}, {"title": "Majesty"}],
+            "site": {"name": "Fans"},
+        })
+        self.assertEqual(html, "<ul><li>Tom (Fans)</li><li>Majesty (Fans)</li></ul>")
+
+    def test_if_else(self):
+        """Test conditional blocks"""
+        path = self.write("template.html", "{% if toc %}{{ toc }}{% else %}none{% endif %}")
+        template = compile_template(path)
+        self.assertEqual(template.render({"toc": "<ol></ol>"}), "<ol></ol>")
+        self.assertEqual(template.render({}), "none")
+
+    def test_partials(self):
+        """Test that partials are inlined relative to the including file"""
+        self.write("partials/nav.html", "<nav>{{ Title }}</nav>")
+        self.write("partials/header.html", "<header>{% include \"nav.html\" %}</header>")
+        path = self.write("template.html", "{% include \"partials/header.html\" %}<main></main>")
+        template = compile_template(path)
+        self.assertEqual(template.render({"Title": "Home"}), "<header><nav>Home</nav></header><main></main>")
+        self.assertEqual(len(template.sources), 3)
+
+    def test_include_cycle(self):
+        """Test that an include cycle is reported"""
+        self.write("a.html", "{% include \"b.html\" %}")
+        self.write("b.html", "{% include \"a.html\" %}")
+        with self.assertRaises(ValueError) as context:
+            compile_template(os.path.join(self.root, "a.html"))
+        self.assertIn("cycle", str(context.exception))
+
+    def test_syntax_errors(self):
+        """Test that malformed tags raise ValueError"""
+        for text in ("{% for x in xs %}", "{% endif %}", "{% bogus %}", "{{ a b }}"):
+            path = self.write("bad.html", text)
+            with self.assertRaises(ValueError):
+                compile_template(path)
+
+    def test_disk_cache_reused(self):
+        """Test that a compiled template is loaded from the disk cache"""
+        path = self.write("template.html", "<p>{{ Content }}</p>")
+        compile_template(path, cache_dir=self.cache_dir)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        template = compile_template(path, cache_dir=self.cache_dir)
+        self.assertEqual(template.render({"Content": "x"}), "<p>x</p>")
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+    def test_disk_cache_invalidated_by_partial(self):
+        """Test that editing a partial invalidates the cached template"""
+        self.write("footer.html", "old")
+        path = self.write("template.html", "{% include \"footer.html\" %}")
+        compile_template(path, cache_dir=self.cache_dir)
+        self.write("footer.html", "new")
+        self.assertEqual(compile_template(path, cache_dir=self.cache_dir).render({}), "new")
+
+    def test_minify_and_rewrite(self):
+        """Test compile-time minification and asset URL rewriting"""
+        path = self.write("template.html", "<head>\n  <link href=\"/index.css\" />\n</head>")
+        template = compile_template(path, minify=True, url_map={"/index.css": "/index.abc.css"})
+        self.assertEqual(template.render({}), '<head><link href="/index.abc.css" /></head>')
+        self.assertEqual(template.urls, ["/index.css"])
+        self.assertGreater(template.bytes_saved, 0)
+
+    def test_inline_css(self):
+        """Test that stylesheet links are inlined, preloading the full file when capped"""
+        css_path = self.write("static/index.css", "b { color: red; }")
+        path = self.write("template.html", '<link href="/index.css" rel="stylesheet" />')
+        template = compile_template(path, inline_css={"/index.css": (css_path, "b{color:red}", True)})
+        self.assertEqual(template.render({}), "<style>b{color:red}</style>")
+        self.assertIn(css_path, template.sources)
+
+        template = compile_template(path, inline_css={"/index.css": (css_path, "b{color:red}", False)})
+        html = template.render({})
+        self.assertTrue(html.startswith('<style>b{color:red}</style><link rel="preload" href="/index.css"'))
+        self.assertIn('<noscript><link rel="stylesheet" href="/index.css" /></noscript>', html)
+
+
+if __name__ == "__main__":
+    unittest.main()
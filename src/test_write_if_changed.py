@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+from write_if_changed import write_if_changed
+
+
+class TestWriteIfChanged(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "index.html")
+        self.hashes = {}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def test_writes_new_file(self):
+        """Test that a missing file is written and its hash recorded"""
+        self.assertTrue(write_if_changed(self.path, "<p>hi</p>", self.hashes))
+        self.assertEqual(self.read(), "<p>hi</p>")
+        self.assertIn(self.path, self.hashes)
+
+    def test_identical_output_is_skipped(self):
+        """Test that identical output leaves the file and its mtime alone"""
+        write_if_changed(self.path, "<p>hi</p>", self.hashes)
+        os.utime(self.path, ns=(1_000_000_000, 1_000_000_000))
+        self.hashes[self.path][1] = 1_000_000_000
+
+        self.assertFalse(write_if_changed(self.path, "<p>hi</p>", self.hashes))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 1_000_000_000)
+
+    def test_changed_output_is_written(self):
+        """Test that different output replaces the file"""
+        write_if_changed(self.path, "<p>hi</p>", self.hashes)
+        self.assertTrue(write_if_changed(self.path, "<p>bye</p>", self.hashes))
+        self.assertEqual(self.read(), "<p>bye</p>")
+
+    def test_existing_file_without_record_is_compared(self):
+        """Test that an unrecorded file is hashed from disk before writing"""
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("<p>hi</p>")
+        self.assertFalse(write_if_changed(self.path, "<p>hi</p>", self.hashes))
+
+    def test_stale_record_is_not_trusted(self):
+        """Test that a file modified outside the build is rewritten"""
+        write_if_changed(self.path, "<p>hi</p>", self.hashes)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("<p>ho</p>")
+        os.utime(self.path, ns=(1, 1))
+        self.assertTrue(write_if_changed(self.path, "<p>hi</p>", self.hashes))
+        self.assertEqual(self.read(), "<p>hi</p>")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,17 @@
 from textnode import TextNode, TextType
 from split_nodes_delimiter import split_nodes_delimiter
-from split_nodes_image_link import split_nodes_image, split_nodes_link
+from split_nodes_image_link import split_nodes_image, split_nodes_link, split_nodes_reference, split_nodes_wiki
 
 
-def text_to_textnodes(text):
+def text_to_textnodes(text, definitions=None, resolve_wiki=None, problems=None):
     """
     Convert raw markdown text into a list of TextNode objects.
     
     Args:
         text (str): Raw markdown text
+        definitions (dict): Reference link definitions of the document, if any
+        resolve_wiki (callable): Target -> URL for [[wiki links]] (None leaves them as text)
+        problems (list): Collects unmatched delimiters instead of raising (tolerant mode)
         
     Returns:
         list: List of TextNode objects representing the parsed markdown
@@ -22,13 +25,21 @@ def text_to_textnodes(text):
     # Split by links
     nodes = split_nodes_link(nodes)
     
+    # Resolve [[wiki links]] through the site's page index
+    if resolve_wiki is not None:
+        nodes = split_nodes_wiki(nodes, resolve_wiki)
+    
+    # Resolve reference links and images against the document's definitions
+    if definitions:
+        nodes = split_nodes_reference(nodes, definitions)
+    
     # Split by bold text (double asterisks)
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD, problems)
     
     # Split by italic text (single underscores)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC, problems)
     
     # Split by code blocks (backticks)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE, problems)
     
     return nodes
@@ -0,0 +1,46 @@
+import hashlib
+import os
+
+
+def write_if_changed(dest_path, content, hashes):
+    """
+    Write a file only if its contents differ from what is already on disk.
+
+    The new contents are hashed and compared against the hash recorded when the file
+    was last written. The record is trusted only if the file's size and mtime still
+    match it; otherwise the existing file is read and hashed instead.
+
+    Args:
+        dest_path (str): Path of the output file
+        content (str): Rendered output
+        hashes (dict): dest_path -> [sha256, mtime_ns, size], updated in place
+
+    Returns:
+        bool: True if the file was written, False if it was already up to date
+    """
+    data = content.encode('utf-8')
+    digest = hashlib.sha256(data).hexdigest()
+
+    try:
+        st = os.stat(dest_path)
+    except OSError:
+        st = None
+
+    if st is not None and st.st_size == len(data):
+        record = hashes.get(dest_path)
+        if record is not None and record[1] == st.st_mtime_ns and record[2] == st.st_size:
+            existing_digest = record[0]
+        else:
+            with open(dest_path, 'rb') as f:
+                existing_digest = hashlib.sha256(f.read()).hexdigest()
+
+        if existing_digest == digest:
+            hashes[dest_path] = [digest, st.st_mtime_ns, st.st_size]
+            return False
+
+    with open(dest_path, 'wb') as f:
+        f.write(data)
+
+    st = os.stat(dest_path)
+    hashes[dest_path] = [digest, st.st_mtime_ns, st.st_size]
+    return True